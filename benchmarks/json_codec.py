@@ -0,0 +1,55 @@
+"""
+Benchmark the JSON backends on realistic Leantime payloads.
+
+Measures parsing an upstream list body and rendering the matching MCP
+response for tasks and timesheets with every installed backend.
+
+Usage:
+    python -m benchmarks.json_codec [--items 10000] [--rounds 20]
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from benchmarks.stub_server import make_tasks, make_timesheets
+from src.app.services import json_codec
+
+
+def measure(fn: Callable[[], Any], rounds: int) -> float:
+    """Return the mean time per call in milliseconds."""
+    fn()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main(count: int, rounds: int) -> None:
+    payloads = {"tasks": make_tasks(count), "timesheets": make_timesheets(count)}
+    stdlib = json_codec.BACKENDS["stdlib"]
+
+    for name, items in payloads.items():
+        body = stdlib.dumps(items, None)
+        response = {"output": {name: items}}
+        print(f"{name}: {count} items, {len(body) / 1e6:.1f} MB")
+
+        baseline = None
+        for backend in json_codec.BACKENDS.values():
+            parse = measure(lambda: backend.loads(body), rounds)
+            render = measure(lambda: backend.dumps(response, None), rounds)
+            baseline = baseline or parse + render
+            print(
+                f"  {backend.name:<7} parse {parse:>8.2f} ms  render {render:>8.2f} ms"
+                f"  ({baseline / (parse + render):.1f}x)"
+            )
+
+    if "orjson" not in json_codec.BACKENDS:
+        print("orjson is not installed; install it with `pip install orjson` to compare")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000, help="Items per payload")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed rounds per backend")
+    args = parser.parse_args()
+    main(args.items, args.rounds)
@@ -0,0 +1,294 @@
+"""
+Load generator for the MCP server backed by the in-process Leantime stub.
+
+Drives every tool in ``AVAILABLE_TOOLS`` and ``/batch`` through the FastAPI
+app and reports throughput, latency percentiles and peak memory allocated
+per scenario, plus the peak RSS of the whole run.
+Results can be written as JSON and compared against a previous run to catch
+regressions between releases.
+
+Usage:
+    python -m benchmarks.load [--requests 200] [--concurrency 10] [--latency 0.005]
+                              [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.stub_server import LeantimeStub
+from src.app.main import app, get_leantime_client
+from src.app.services import json_codec
+from src.app.services.cache import LeantimeCache
+from src.app.services.leantime_client import LeantimeClient
+from src.app.tools import AVAILABLE_TOOLS
+
+# Representative input for every tool; new tools must be added here
+TOOL_INPUTS: Dict[str, Dict[str, Any]] = {
+    "list_projects": {},
+    "get_project": {"project_id": 1},
+    "create_project": {"name": "Benchmark project", "clientId": 1},
+    "list_tasks": {"project_id": 1},
+    "get_task": {"task_id": 1},
+    "create_task": {"title": "Benchmark task", "projectId": 1, "status": "new"},
+    "update_task": {"task_id": 1, "status": "done"},
+    "bulk_create_tasks": {"tasks": [{"title": f"Bulk task {i}", "projectId": 1} for i in range(10)]},
+    "list_users": {},
+    "get_user": {"user_id": 1},
+    "list_timesheets": {"project_id": 1},
+    "create_timesheet": {"userId": 1, "projectId": 1, "hours": 1.5, "date": "2024-03-01"},
+    "get_timesheet_status": {"provisional_ids": ["pending-0"]},
+    "bulk_create_timesheets": {
+        "timesheets": [{"userId": 1, "projectId": 1, "hours": 0.5, "date": "2024-03-01"} for _ in range(10)]
+    },
+    "summarize_timesheets": {"group_by": "user"},
+}
+
+# Tools combined into the /batch scenario
+BATCH_TOOLS = ("list_projects", "get_project", "list_tasks", "get_task", "list_users", "get_user")
+
+# Metrics compared by --compare: name -> True if higher is better
+COMPARED_METRICS = {"throughput_rps": True, "p95_ms": False, "p99_ms": False}
+
+
+def process_peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of this process in MB.
+
+    This is a high-water mark over the whole process lifetime, so it cannot
+    be attributed to a single scenario.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def scenarios() -> Dict[str, Dict[str, Any]]:
+    """Return the request (path and JSON body) of every scenario."""
+    missing = sorted(set(AVAILABLE_TOOLS) - set(TOOL_INPUTS))
+    if missing:
+        raise SystemExit(f"No benchmark input for tools: {', '.join(missing)}. Add them to TOOL_INPUTS.")
+
+    result = {
+        name: {"path": f"/tools/{name}", "body": {"name": name, "input": TOOL_INPUTS[name]}}
+        for name in AVAILABLE_TOOLS
+    }
+    result["batch"] = {
+        "path": "/batch",
+        "body": [{"name": name, "input": TOOL_INPUTS[name]} for name in BATCH_TOOLS],
+    }
+    return result
+
+
+def has_error(status_code: int, payload: Any) -> bool:
+    """Return whether a response (or any item of a batch response) failed."""
+    if status_code != 200:
+        return True
+    if isinstance(payload, dict) and "results" in payload:
+        return any("error" in item for item in payload["results"])
+    return False
+
+
+async def run_scenario(http: httpx.AsyncClient,
+                       path: str,
+                       body: Any,
+                       requests: int,
+                       concurrency: int,
+                       warmup: int) -> Dict[str, Any]:
+    """
+    Send ``requests`` identical requests with at most ``concurrency`` in flight.
+
+    After the warmup, one untimed round of ``concurrency`` concurrent requests
+    runs under ``tracemalloc`` to measure the scenario's peak allocation;
+    tracing is off again for the timed requests so it does not skew latency.
+
+    Returns:
+        Throughput, latency percentiles, error count and peak allocation
+    """
+    content = json_codec.dumps(body)
+    headers = {"content-type": "application/json"}
+
+    for _ in range(warmup):
+        await http.post(path, content=content, headers=headers)
+
+    workers = max(1, min(concurrency, requests))
+    tracemalloc.start()
+    try:
+        await asyncio.gather(*(http.post(path, content=content, headers=headers) for _ in range(workers)))
+        peak_alloc = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await http.post(path, content=content, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if has_error(response.status_code, json_codec.loads(response.content)):
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "peak_alloc_mb": round(peak_alloc / (1024 * 1024), 2),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every selected scenario and return the results document."""
+    stub = LeantimeStub(
+        projects=args.projects,
+        tasks=args.tasks,
+        users=args.users,
+        timesheets=args.timesheets,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    client = LeantimeClient(
+        base_url="http://leantime.stub",
+        api_key="benchmark",
+        transport=httpx.ASGITransport(app=stub),
+        cache=LeantimeCache() if args.cache else None,
+        rpc_batch_size=args.rpc_batch_size,
+    )
+
+    selected = scenarios()
+    if args.only:
+        selected = {name: selected[name] for name in args.only}
+
+    results = {}
+    async with client:
+        app.dependency_overrides[get_leantime_client] = lambda: client
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://mcp") as http:
+                for name, scenario in selected.items():
+                    results[name] = await run_scenario(
+                        http, scenario["path"], scenario["body"], args.requests, args.concurrency, args.warmup
+                    )
+                    if not args.quiet:
+                        print(format_row(name, results[name]), flush=True)
+        finally:
+            app.dependency_overrides.pop(get_leantime_client, None)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_codec.get_backend().name,
+            "options": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+            "upstream_requests": stub.requests,
+            "upstream_errors": stub.errors,
+            "process_peak_rss_mb": round(process_peak_rss_mb(), 1),
+        },
+        "scenarios": results,
+    }
+
+
+def format_row(name: str, metrics: Dict[str, Any]) -> str:
+    """Format the metrics of one scenario as a table row."""
+    return (
+        f"{name:<24} {metrics['throughput_rps']:>10.1f} rps  p50 {metrics['p50_ms']:>8.2f} ms  "
+        f"p95 {metrics['p95_ms']:>8.2f} ms  p99 {metrics['p99_ms']:>8.2f} ms  "
+        f"errors {metrics['errors']:>4}  alloc {metrics['peak_alloc_mb']:>7.2f} MB"
+    )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare results against a baseline run.
+
+    Args:
+        results: Results document of the current run
+        baseline: Results document of the baseline run
+        tolerance: Allowed relative regression (e.g. 0.2 for 20%)
+
+    Returns:
+        A description of every metric that regressed beyond the tolerance
+    """
+    regressions = []
+    for name, metrics in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at the same time")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per scenario")
+    parser.add_argument("--projects", type=int, default=20, help="Projects in the stub dataset")
+    parser.add_argument("--tasks", type=int, default=2000, help="Tickets in the stub dataset")
+    parser.add_argument("--users", type=int, default=50, help="Users in the stub dataset")
+    parser.add_argument("--timesheets", type=int, default=5000, help="Timesheet entries in the stub dataset")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra stub latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests answered with 503")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for stub latency and errors")
+    parser.add_argument("--cache", action="store_true", help="Enable the client lookup cache")
+    parser.add_argument("--rpc-batch-size", type=int, default=0,
+                        help="Batch entity lookups into JSON-RPC requests of up to this size (0 disables)")
+    parser.add_argument("--only", nargs="+", choices=sorted(scenarios()), help="Only run these scenarios")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression for --compare")
+    parser.add_argument("--quiet", action="store_true", help="Do not print per-scenario results")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
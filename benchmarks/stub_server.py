@@ -0,0 +1,243 @@
+"""
+In-process ASGI stand-in for the Leantime API.
+
+Serves a generated dataset of projects, tickets, users and timesheets with
+configurable latency and error rate, and supports the offset/limit paging,
+filters and JSON-RPC batch lookups used by ``LeantimeClient``. Mount it with
+``httpx.ASGITransport`` to exercise the client without a network or a real
+Leantime instance.
+"""
+import asyncio
+import json
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from src.app.services import json_codec
+
+
+def make_projects(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` realistic project dicts."""
+    return [
+        {
+            "id": i,
+            "name": f"Project {i}",
+            "description": "Internal project",
+            "clientId": i % 5 + 1,
+            "state": "closed" if i % 4 == 0 else "open",
+            "startDate": "2024-01-01",
+            "endDate": "2024-12-31",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_users(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` realistic user dicts."""
+    return [
+        {
+            "id": i,
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "firstname": "Test",
+            "lastname": f"User {i}",
+            "role": "admin" if i == 1 else "editor",
+            "status": "a",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_tasks(count: int, projects: int = 10, users: int = 7) -> List[Dict[str, Any]]:
+    """Build ``count`` realistic task dicts spread over the given projects and users."""
+    return [
+        {
+            "id": i,
+            "title": f"Task {i}",
+            "description": "Lorem ipsum dolor sit amet " * 4,
+            "projectId": i % projects + 1,
+            "status": "open" if i % 3 else "done",
+            "priority": "high" if i % 5 == 0 else "normal",
+            "assignedTo": i % users + 1,
+            "startDate": "2024-01-01",
+            "dueDate": f"2024-{i % 12 + 1:02d}-15",
+            "storyPoints": i % 8,
+            "tags": ["backend", "perf"],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def make_timesheets(count: int, projects: int = 10, users: int = 25, tasks: int = 400) -> List[Dict[str, Any]]:
+    """Build ``count`` realistic timesheet dicts spread over the given projects, users and tasks."""
+    return [
+        {
+            "id": i,
+            "userId": i % users + 1,
+            "projectId": i % projects + 1,
+            "ticketId": i % tasks + 1,
+            "hours": round(0.25 + (i % 32) * 0.25, 2),
+            "description": "Worked on ticket",
+            "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+# Query parameter -> item field filters supported per collection
+_FILTERS = {
+    "tickets": {"projectId": "projectId"},
+    "milestones": {"projectId": "projectId"},
+    "timesheets": {"userId": "userId", "projectId": "projectId", "ticketId": "ticketId"},
+}
+
+# JSON-RPC lookup methods served at /api/jsonrpc -> collection
+_RPC_LOOKUPS = {
+    "leantime.rpc.Projects.getProject": "projects",
+    "leantime.rpc.Tickets.getTicket": "tickets",
+    "leantime.rpc.Users.getUser": "users",
+}
+
+
+class LeantimeStub:
+    """ASGI application emulating the subset of the Leantime API used by the client."""
+
+    def __init__(self,
+                 projects: int = 20,
+                 tasks: int = 2000,
+                 users: int = 50,
+                 timesheets: int = 5000,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 seed: Optional[int] = 0,
+                 sleep: Callable[[float], Any] = asyncio.sleep):
+        """
+        Initialize the stub and generate its dataset.
+
+        Args:
+            projects: Number of projects
+            tasks: Number of tickets
+            users: Number of users
+            timesheets: Number of timesheet entries
+            latency: Base latency added to every response in seconds
+            jitter: Maximum random latency added on top of ``latency`` in seconds
+            error_rate: Fraction of requests answered with a 503
+            seed: Seed for latency and error sampling (None for nondeterministic runs)
+            sleep: Coroutine function used to apply latency
+        """
+        self.data: Dict[str, List[Dict[str, Any]]] = {
+            "projects": make_projects(projects),
+            "tickets": make_tasks(tasks, projects=max(1, projects), users=max(1, users)),
+            "users": make_users(users),
+            "timesheets": make_timesheets(
+                timesheets, projects=max(1, projects), users=max(1, users), tasks=max(1, tasks)
+            ),
+            "milestones": [],
+        }
+        self.index = {name: {item["id"]: item for item in items} for name, items in self.data.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.sleep = sleep
+        self.requests = 0
+        self.errors = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            return
+
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        self.requests += 1
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await self.sleep(delay)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            status, payload = 503, {"error": "Service unavailable"}
+        else:
+            query = dict(parse_qsl(scope.get("query_string", b"").decode()))
+            status, payload = self.handle(scope["method"], scope["path"], query, body)
+
+        content = json_codec.dumps(payload)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(content)).encode())],
+        })
+        await send({"type": "http.response.body", "body": content})
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """
+        Answer a single API request.
+
+        Returns:
+            The status code and JSON payload of the response
+        """
+        if path == "/api/jsonrpc" and method == "POST":
+            return 200, self.rpc(json.loads(body or b"null"))
+
+        parts = path.strip("/").split("/")
+        if len(parts) < 2 or parts[0] != "api" or parts[1] not in self.data:
+            return 404, {"error": f"Unknown endpoint {path}"}
+
+        collection = parts[1]
+        item_id = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else None
+
+        if method == "GET" and item_id is None:
+            return 200, self.list(collection, query)
+        if method == "GET":
+            item = self.index[collection].get(item_id)
+            return (200, item) if item is not None else (404, {"error": "Not found"})
+        if method == "POST" and item_id is None:
+            return 200, self.create(collection, json.loads(body or b"{}"))
+        if method == "PUT" and item_id is not None:
+            item = self.index[collection].get(item_id)
+            if item is None:
+                return 404, {"error": "Not found"}
+            # Updates are echoed back without mutating the shared dataset; unset
+            # (null) fields keep their current value
+            changes = {key: value for key, value in json.loads(body or b"{}").items() if value is not None}
+            return 200, {**item, **changes}
+        if method == "DELETE" and item_id is not None:
+            return 200, {"deleted": item_id}
+        return 405, {"error": f"Method {method} not allowed"}
+
+    def rpc(self, request: Any) -> Any:
+        """Answer a JSON-RPC request or batch of entity lookups (missing entities yield a null result)."""
+        if isinstance(request, list):
+            return [self.rpc(item) for item in request]
+        collection = _RPC_LOOKUPS.get(request.get("method")) if isinstance(request, dict) else None
+        request_id = request.get("id") if isinstance(request, dict) else None
+        if collection is None:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32601, "message": "Method not found"}}
+        item = self.index[collection].get(int((request.get("params") or {}).get("id", 0)))
+        return {"jsonrpc": "2.0", "id": request_id, "result": item}
+
+    def list(self, collection: str, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Return the filtered (and, if requested, paged) items of a collection."""
+        items = self.data[collection]
+        for param, field in _FILTERS.get(collection, {}).items():
+            if query.get(param):
+                value = int(query[param])
+                items = [item for item in items if item.get(field) == value]
+
+        if "limit" in query:
+            offset = int(query.get("offset", 0))
+            items = items[offset:offset + int(query["limit"])]
+        return items
+
+    def create(self, collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a created item with a fresh ID (the dataset itself is not modified)."""
+        created = {**data, "id": len(self.data[collection]) + self.requests}
+        if collection == "projects":
+            created.setdefault("state", "open")
+        return created
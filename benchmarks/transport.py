@@ -0,0 +1,138 @@
+"""
+Transport overhead benchmark: REST vs MCP streamable HTTP vs a pipelined MCP stdio session.
+
+Every transport runs the same tool calls against the in-process Leantime stub,
+so the difference between them is the per-call cost of the transport itself
+(HTTP parsing, dependency resolution and JSON envelopes).
+
+Usage:
+    python -m benchmarks.transport [--calls 500] [--concurrency 10] [--tool get_project]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.load import TOOL_INPUTS
+from benchmarks.stub_server import LeantimeStub
+from src.app import mcp
+from src.app.main import app, get_leantime_client, mcp_server
+from src.app.services import json_codec
+from src.app.services.leantime_client import LeantimeClient
+
+
+async def run_concurrently(calls: int, concurrency: int, call) -> None:
+    """Await ``call()`` ``calls`` times with at most ``concurrency`` in flight."""
+    remaining = calls
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, calls)))))
+
+
+async def bench_rest(http: httpx.AsyncClient, tool: str, calls: int, concurrency: int) -> None:
+    content = json_codec.dumps({"name": tool, "input": TOOL_INPUTS[tool]})
+    headers = {"content-type": "application/json"}
+
+    async def call() -> None:
+        response = await http.post(f"/tools/{tool}", content=content, headers=headers)
+        response.raise_for_status()
+
+    await run_concurrently(calls, concurrency, call)
+
+
+async def bench_mcp_http(http: httpx.AsyncClient, tool: str, calls: int, concurrency: int) -> None:
+    content = json_codec.dumps({
+        "jsonrpc": "2.0", "id": 1, "method": "tools/call",
+        "params": {"name": tool, "arguments": TOOL_INPUTS[tool]},
+    })
+    headers = {"content-type": "application/json", "accept": "application/json, text/event-stream"}
+
+    async def call() -> None:
+        response = await http.post("/mcp", content=content, headers=headers)
+        if json_codec.loads(response.content)["result"]["isError"]:
+            raise RuntimeError(response.text)
+
+    await run_concurrently(calls, concurrency, call)
+
+
+async def bench_mcp_stdio(client: LeantimeClient, tool: str, calls: int, concurrency: int) -> None:
+    reader = asyncio.StreamReader()
+    for request_id in range(calls):
+        reader.feed_data(json_codec.dumps({
+            "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": tool, "arguments": TOOL_INPUTS[tool]},
+        }) + b"\n")
+    reader.feed_eof()
+
+    lines: List[bytes] = []
+    await mcp.serve_stdio(mcp_server, client, reader, lines.append, concurrency=concurrency)
+    errors = sum(json_codec.loads(line)["result"]["isError"] for line in lines)
+    if len(lines) != calls or errors:
+        raise RuntimeError(f"{len(lines)} responses for {calls} calls, {errors} errors")
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    """Run every transport and return calls per second and mean time per call."""
+    stub = LeantimeStub(projects=20, tasks=200, users=20, timesheets=200, latency=args.latency)
+    client = LeantimeClient(
+        base_url="http://leantime.stub",
+        api_key="benchmark",
+        transport=httpx.ASGITransport(app=stub),
+    )
+    results = {}
+    async with client:
+        app.dependency_overrides[get_leantime_client] = lambda: client
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://mcp") as http:
+                benches = {
+                    "rest": lambda: bench_rest(http, args.tool, args.calls, args.concurrency),
+                    "mcp_http": lambda: bench_mcp_http(http, args.tool, args.calls, args.concurrency),
+                    "mcp_stdio": lambda: bench_mcp_stdio(client, args.tool, args.calls, args.concurrency),
+                }
+                for name, bench in benches.items():
+                    await bench()  # warm up
+                    started = time.perf_counter()
+                    await bench()
+                    elapsed = time.perf_counter() - started
+                    results[name] = {
+                        "calls_per_s": round(args.calls / elapsed, 1),
+                        "ms_per_call": round(elapsed * 1000 / args.calls, 3),
+                    }
+        finally:
+            app.dependency_overrides.pop(get_leantime_client, None)
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line options."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500, help="Timed tool calls per transport")
+    parser.add_argument("--concurrency", type=int, default=10, help="Calls in flight at the same time")
+    parser.add_argument("--tool", default="get_project", choices=sorted(TOOL_INPUTS), help="Tool to call")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request in seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    baseline = results["rest"]["ms_per_call"]
+    for name, metrics in results.items():
+        print(
+            f"{name:<10} {metrics['calls_per_s']:>9.1f} calls/s  {metrics['ms_per_call']:>7.3f} ms/call  "
+            f"{baseline / metrics['ms_per_call']:>5.2f}x vs rest"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
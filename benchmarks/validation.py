@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for the per-call validation overhead of ``BaseTool.run``.
+
+Runs ``list_tasks`` against an in-memory client and compares the original
+construct-and-dump path with each output validation mode.
+
+Usage:
+    python -m benchmarks.validation [--tasks 500] [--calls 200]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.stub_server import make_tasks
+from src.app.tools.tasks import ListTasksTool
+
+
+class StaticClient:
+    """Stand-in Leantime client returning a fixed task list."""
+
+    task_mirror = None
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        self.tasks = tasks
+
+    async def get_tasks(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.tasks
+
+
+class LegacyListTasksTool(ListTasksTool):
+    """``list_tasks`` with the original validate-construct-dump pipeline."""
+
+    _validate_output = False
+
+    async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        validated_input = self.input_model(**input_data)
+        output_model = self.get_output_model(validated_input)
+        result = await self.execute(self.input_model(**validated_input.model_dump()))
+        return output_model(**result).model_dump()
+
+
+async def measure(tool, calls: int) -> float:
+    """Return the mean time per call in microseconds."""
+    await tool.run({})
+    started = time.perf_counter()
+    for _ in range(calls):
+        await tool.run({})
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def main(task_count: int, calls: int) -> None:
+    client = StaticClient(make_tasks(task_count))
+    results = {"legacy": await measure(LegacyListTasksTool(client), calls)}
+
+    for mode in ("full", "sampled", "off"):
+        tool = ListTasksTool(client)
+        tool.output_validation = mode
+        results[mode] = await measure(tool, calls)
+
+    print(f"list_tasks with {task_count} tasks, {calls} calls")
+    for name, micros in results.items():
+        print(f"  {name:<8} {micros:>10.1f} us/call  ({results['legacy'] / micros:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500, help="Tasks returned per call")
+    parser.add_argument("--calls", type=int, default=200, help="Timed calls per mode")
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.calls))
@@ -12,8 +12,102 @@ DEBUG = os.getenv("MCP_DEBUG", "False").lower() == "true"
 # API configuration
 API_PREFIX = os.getenv("MCP_API_PREFIX", "/api/v1")
 
+# Maximum number of batch items executed concurrently
+MCP_BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "10"))
+
+# Maximum number of pipelined MCP requests handled concurrently per stdio session
+MCP_SESSION_CONCURRENCY = int(os.getenv("MCP_SESSION_CONCURRENCY", "10"))
+
+# Re-validation of tool results: "full", "sampled" or "off" (trust upstream data)
+MCP_OUTPUT_VALIDATION = os.getenv("MCP_OUTPUT_VALIDATION", "full").lower()
+MCP_OUTPUT_VALIDATION_SAMPLE_RATE = float(os.getenv("MCP_OUTPUT_VALIDATION_SAMPLE_RATE", "0.1"))
+
+# JSON implementation for upstream parsing and responses: "auto", "orjson" or "stdlib"
+MCP_JSON_BACKEND = os.getenv("MCP_JSON_BACKEND", "auto").lower()
+
+# Token that enables per-request cProfile captures via the X-MCP-Profile header (empty disables)
+MCP_PROFILE_TOKEN = os.getenv("MCP_PROFILE_TOKEN", "")
+MCP_PROFILE_MAX_ENTRIES = int(os.getenv("MCP_PROFILE_MAX_ENTRIES", "20"))
+
 # Leantime configuration
 LEANTIME_URL = os.getenv("LEANTIME_URL", "")
 LEANTIME_API_KEY = os.getenv("LEANTIME_API_KEY", "")
 LEANTIME_USERNAME = os.getenv("LEANTIME_USERNAME", "")
-LEANTIME_PASSWORD = os.getenv("LEANTIME_PASSWORD", "")
\ No newline at end of file
+LEANTIME_PASSWORD = os.getenv("LEANTIME_PASSWORD", "")
+
+# Additional Leantime instances selected per request: a JSON object (or the
+# path of a JSON file) mapping tenant names to url/api_key/username/password,
+# and optionally token and max_connections
+LEANTIME_TENANTS = os.getenv("LEANTIME_TENANTS", "")
+# Maximum number of tenant clients kept open before idle ones are closed
+LEANTIME_TENANT_POOL_SIZE = int(os.getenv("LEANTIME_TENANT_POOL_SIZE", "32"))
+
+# Leantime connection pool configuration
+LEANTIME_MAX_CONNECTIONS = int(os.getenv("LEANTIME_MAX_CONNECTIONS", "100"))
+LEANTIME_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LEANTIME_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LEANTIME_KEEPALIVE_EXPIRY = float(os.getenv("LEANTIME_KEEPALIVE_EXPIRY", "5.0"))
+LEANTIME_HTTP2 = os.getenv("LEANTIME_HTTP2", "False").lower() == "true"
+
+# Leantime timeouts (seconds)
+LEANTIME_CONNECT_TIMEOUT = float(os.getenv("LEANTIME_CONNECT_TIMEOUT", "5.0"))
+LEANTIME_READ_TIMEOUT = float(os.getenv("LEANTIME_READ_TIMEOUT", "30.0"))
+LEANTIME_WRITE_TIMEOUT = float(os.getenv("LEANTIME_WRITE_TIMEOUT", "30.0"))
+LEANTIME_POOL_TIMEOUT = float(os.getenv("LEANTIME_POOL_TIMEOUT", "5.0"))
+LEANTIME_SHUTDOWN_TIMEOUT = float(os.getenv("LEANTIME_SHUTDOWN_TIMEOUT", "10.0"))
+
+# Retries with jittered exponential backoff (0 disables retries)
+LEANTIME_RETRY_ATTEMPTS = int(os.getenv("LEANTIME_RETRY_ATTEMPTS", "3"))
+LEANTIME_RETRY_BASE_DELAY = float(os.getenv("LEANTIME_RETRY_BASE_DELAY", "0.2"))
+LEANTIME_RETRY_MAX_DELAY = float(os.getenv("LEANTIME_RETRY_MAX_DELAY", "5.0"))
+LEANTIME_RETRY_MAX_RETRY_AFTER = float(os.getenv("LEANTIME_RETRY_MAX_RETRY_AFTER", "30.0"))
+
+# Circuit breaker (0 failures disables it)
+LEANTIME_BREAKER_FAILURES = int(os.getenv("LEANTIME_BREAKER_FAILURES", "5"))
+LEANTIME_BREAKER_RECOVERY = float(os.getenv("LEANTIME_BREAKER_RECOVERY", "30.0"))
+
+# Client-side rate limits in requests per second (0 disables the limiter)
+LEANTIME_RATE_LIMIT_READ = float(os.getenv("LEANTIME_RATE_LIMIT_READ", "0"))
+LEANTIME_RATE_LIMIT_WRITE = float(os.getenv("LEANTIME_RATE_LIMIT_WRITE", "0"))
+LEANTIME_RATE_LIMIT_BURST = float(os.getenv("LEANTIME_RATE_LIMIT_BURST", "0"))
+
+# Default page size for paginated list requests
+LEANTIME_PAGE_SIZE = int(os.getenv("LEANTIME_PAGE_SIZE", "100"))
+
+# Share one upstream request between identical concurrent GETs
+LEANTIME_SINGLE_FLIGHT = os.getenv("LEANTIME_SINGLE_FLIGHT", "True").lower() == "true"
+
+# Conditional GETs: remember ETag/Last-Modified validators and reuse the body on 304
+LEANTIME_CONDITIONAL_REQUESTS = os.getenv("LEANTIME_CONDITIONAL_REQUESTS", "False").lower() == "true"
+LEANTIME_CONDITIONAL_MAX_ENTRIES = int(os.getenv("LEANTIME_CONDITIONAL_MAX_ENTRIES", "256"))
+
+# Batch project/task/user lookups into JSON-RPC requests (0 disables batching)
+LEANTIME_RPC_BATCH_SIZE = int(os.getenv("LEANTIME_RPC_BATCH_SIZE", "0"))
+LEANTIME_RPC_FLUSH_DELAY = float(os.getenv("LEANTIME_RPC_FLUSH_DELAY", "0.002"))
+
+# Hedge GETs slower than a latency percentile with a second attempt,
+# duplicating at most LEANTIME_HEDGE_BUDGET of requests
+LEANTIME_HEDGING = os.getenv("LEANTIME_HEDGING", "False").lower() == "true"
+LEANTIME_HEDGE_PERCENTILE = float(os.getenv("LEANTIME_HEDGE_PERCENTILE", "95"))
+LEANTIME_HEDGE_BUDGET = float(os.getenv("LEANTIME_HEDGE_BUDGET", "0.05"))
+LEANTIME_HEDGE_MIN_DELAY = float(os.getenv("LEANTIME_HEDGE_MIN_DELAY", "0.005"))
+LEANTIME_HEDGE_MAX_DELAY = float(os.getenv("LEANTIME_HEDGE_MAX_DELAY", "1.0"))
+
+# Read-through cache for project, user and task lookups
+LEANTIME_CACHE_ENABLED = os.getenv("LEANTIME_CACHE_ENABLED", "True").lower() == "true"
+LEANTIME_CACHE_MAX_ENTRIES = int(os.getenv("LEANTIME_CACHE_MAX_ENTRIES", "1024"))
+LEANTIME_CACHE_PROJECT_TTL = float(os.getenv("LEANTIME_CACHE_PROJECT_TTL", "300"))
+LEANTIME_CACHE_USER_TTL = float(os.getenv("LEANTIME_CACHE_USER_TTL", "300"))
+LEANTIME_CACHE_TASK_TTL = float(os.getenv("LEANTIME_CACHE_TASK_TTL", "30"))
+LEANTIME_CACHE_NEGATIVE_TTL = float(os.getenv("LEANTIME_CACHE_NEGATIVE_TTL", "30"))
+
+# Local SQLite mirror of tickets for filtered list_tasks queries
+# (empty path disables the mirror, ":memory:" keeps it in process memory)
+LEANTIME_TASK_MIRROR_PATH = os.getenv("LEANTIME_TASK_MIRROR_PATH", "")
+LEANTIME_TASK_MIRROR_MAX_AGE = float(os.getenv("LEANTIME_TASK_MIRROR_MAX_AGE", "60"))
+
+# Durable write-behind journal for create_timesheet (empty path disables it
+# and timesheet entries are created synchronously)
+LEANTIME_TIMESHEET_QUEUE_PATH = os.getenv("LEANTIME_TIMESHEET_QUEUE_PATH", "")
+LEANTIME_TIMESHEET_QUEUE_BATCH_SIZE = int(os.getenv("LEANTIME_TIMESHEET_QUEUE_BATCH_SIZE", "20"))
+LEANTIME_TIMESHEET_QUEUE_FLUSH_INTERVAL = float(os.getenv("LEANTIME_TIMESHEET_QUEUE_FLUSH_INTERVAL", "1.0"))
+LEANTIME_TIMESHEET_QUEUE_MAX_ATTEMPTS = int(os.getenv("LEANTIME_TIMESHEET_QUEUE_MAX_ATTEMPTS", "8"))
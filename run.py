@@ -1,5 +1,13 @@
+import asyncio
+import sys
+
 import uvicorn
 from config.config import HOST, PORT, DEBUG
 
 if __name__ == "__main__":
-    uvicorn.run("src.app.main:app", host=HOST, port=PORT, reload=DEBUG)
\ No newline at end of file
+    if "--stdio" in sys.argv[1:]:
+        # MCP over stdin/stdout, as launched by MCP clients
+        from src.app.main import run_stdio
+        asyncio.run(run_stdio())
+    else:
+        uvicorn.run("src.app.main:app", host=HOST, port=PORT, reload=DEBUG)
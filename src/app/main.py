@@ -1,20 +1,234 @@
-from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.background import BackgroundTask
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Optional, List
 import os
-import json
 
-from src.app.services.leantime_client import LeantimeClient
+from config.config import (
+    LEANTIME_URL,
+    LEANTIME_API_KEY,
+    LEANTIME_USERNAME,
+    LEANTIME_PASSWORD,
+    LEANTIME_TENANTS,
+    LEANTIME_TENANT_POOL_SIZE,
+    LEANTIME_MAX_CONNECTIONS,
+    LEANTIME_MAX_KEEPALIVE_CONNECTIONS,
+    LEANTIME_KEEPALIVE_EXPIRY,
+    LEANTIME_HTTP2,
+    LEANTIME_CONNECT_TIMEOUT,
+    LEANTIME_READ_TIMEOUT,
+    LEANTIME_WRITE_TIMEOUT,
+    LEANTIME_POOL_TIMEOUT,
+    LEANTIME_SHUTDOWN_TIMEOUT,
+    LEANTIME_SINGLE_FLIGHT,
+    LEANTIME_CONDITIONAL_REQUESTS,
+    LEANTIME_CONDITIONAL_MAX_ENTRIES,
+    LEANTIME_RPC_BATCH_SIZE,
+    LEANTIME_RPC_FLUSH_DELAY,
+    LEANTIME_HEDGING,
+    LEANTIME_HEDGE_PERCENTILE,
+    LEANTIME_HEDGE_BUDGET,
+    LEANTIME_HEDGE_MIN_DELAY,
+    LEANTIME_HEDGE_MAX_DELAY,
+    LEANTIME_PAGE_SIZE,
+    LEANTIME_RETRY_ATTEMPTS,
+    LEANTIME_RETRY_BASE_DELAY,
+    LEANTIME_RETRY_MAX_DELAY,
+    LEANTIME_RETRY_MAX_RETRY_AFTER,
+    LEANTIME_BREAKER_FAILURES,
+    LEANTIME_BREAKER_RECOVERY,
+    LEANTIME_RATE_LIMIT_READ,
+    LEANTIME_RATE_LIMIT_WRITE,
+    LEANTIME_RATE_LIMIT_BURST,
+    MCP_BATCH_CONCURRENCY,
+    MCP_SESSION_CONCURRENCY,
+    MCP_OUTPUT_VALIDATION,
+    MCP_OUTPUT_VALIDATION_SAMPLE_RATE,
+    MCP_JSON_BACKEND,
+    MCP_PROFILE_TOKEN,
+    MCP_PROFILE_MAX_ENTRIES,
+    LEANTIME_CACHE_ENABLED,
+    LEANTIME_CACHE_MAX_ENTRIES,
+    LEANTIME_CACHE_PROJECT_TTL,
+    LEANTIME_CACHE_USER_TTL,
+    LEANTIME_CACHE_TASK_TTL,
+    LEANTIME_CACHE_NEGATIVE_TTL,
+    LEANTIME_TASK_MIRROR_PATH,
+    LEANTIME_TASK_MIRROR_MAX_AGE,
+    LEANTIME_TIMESHEET_QUEUE_PATH,
+    LEANTIME_TIMESHEET_QUEUE_BATCH_SIZE,
+    LEANTIME_TIMESHEET_QUEUE_FLUSH_INTERVAL,
+    LEANTIME_TIMESHEET_QUEUE_MAX_ATTEMPTS,
+)
+from src.app import mcp
+from src.app.services import json_codec, metrics, profiling
+from src.app.services.cache import ConditionalCache, LeantimeCache
+from src.app.services.leantime_client import InvalidCursorError, LeantimeClient
+from src.app.services.rate_limit import RateLimiter
+from src.app.services.resilience import HedgePolicy, RetryPolicy
+from src.app.services.task_mirror import TaskMirror
+from src.app.services.timesheet_queue import TimesheetQueue
+from src.app.services.tenants import DEFAULT_TENANT, ClientPool, Tenant, load_tenants
 from src.app.tools import AVAILABLE_TOOLS
 from src.app.tools.base import BaseTool
 
-# Configuration
-LEANTIME_URL = os.getenv("LEANTIME_URL", "")
-LEANTIME_API_KEY = os.getenv("LEANTIME_API_KEY", "")
-LEANTIME_USERNAME = os.getenv("LEANTIME_USERNAME", "")
-LEANTIME_PASSWORD = os.getenv("LEANTIME_PASSWORD", "")
+BaseTool.configure_output_validation(MCP_OUTPUT_VALIDATION, MCP_OUTPUT_VALIDATION_SAMPLE_RATE)
+json_codec.set_backend(MCP_JSON_BACKEND)
 
-app = FastAPI(title="Leantime MCP Server")
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the configured JSON backend."""
+    
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
+
+
+# Instance configured by LEANTIME_URL and its credentials
+default_tenant = Tenant(
+    name=DEFAULT_TENANT,
+    url=LEANTIME_URL,
+    api_key=LEANTIME_API_KEY if LEANTIME_API_KEY else None,
+    username=LEANTIME_USERNAME if not LEANTIME_API_KEY and LEANTIME_USERNAME else None,
+    password=LEANTIME_PASSWORD if not LEANTIME_API_KEY and LEANTIME_PASSWORD else None,
+)
+tenants = load_tenants(LEANTIME_TENANTS)
+tenants_by_token = {tenant.token: tenant for tenant in tenants.values() if tenant.token}
+
+# Header selecting a tenant by name
+TENANT_HEADER = "X-Leantime-Tenant"
+
+
+def tenant_path(path: str, tenant: Tenant) -> str:
+    """Return a tenant's copy of a local database path, so tenants never share a file."""
+    if tenant.name == DEFAULT_TENANT or path in ("", ":memory:"):
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{tenant.name}{ext}"
+
+
+def create_leantime_client(tenant: Tenant = default_tenant) -> LeantimeClient:
+    """Create a Leantime client for a tenant (by default the configured instance) from the configured settings."""
+    cache = None
+    if LEANTIME_CACHE_ENABLED:
+        cache = LeantimeCache(
+            max_entries=LEANTIME_CACHE_MAX_ENTRIES,
+            project_ttl=LEANTIME_CACHE_PROJECT_TTL,
+            user_ttl=LEANTIME_CACHE_USER_TTL,
+            task_ttl=LEANTIME_CACHE_TASK_TTL,
+            negative_ttl=LEANTIME_CACHE_NEGATIVE_TTL,
+        )
+    
+    task_mirror = None
+    if LEANTIME_TASK_MIRROR_PATH:
+        task_mirror = TaskMirror(path=tenant_path(LEANTIME_TASK_MIRROR_PATH, tenant), max_age=LEANTIME_TASK_MIRROR_MAX_AGE)
+    
+    timesheet_queue = None
+    if LEANTIME_TIMESHEET_QUEUE_PATH:
+        timesheet_queue = TimesheetQueue(
+            path=tenant_path(LEANTIME_TIMESHEET_QUEUE_PATH, tenant),
+            batch_size=LEANTIME_TIMESHEET_QUEUE_BATCH_SIZE,
+            flush_interval=LEANTIME_TIMESHEET_QUEUE_FLUSH_INTERVAL,
+            max_attempts=LEANTIME_TIMESHEET_QUEUE_MAX_ATTEMPTS,
+        )
+    
+    retry_policy = None
+    if LEANTIME_RETRY_ATTEMPTS > 0:
+        retry_policy = RetryPolicy(
+            max_retries=LEANTIME_RETRY_ATTEMPTS,
+            base_delay=LEANTIME_RETRY_BASE_DELAY,
+            max_delay=LEANTIME_RETRY_MAX_DELAY,
+            max_retry_after=LEANTIME_RETRY_MAX_RETRY_AFTER,
+        )
+    
+    rate_limiter = None
+    if LEANTIME_RATE_LIMIT_READ > 0 and LEANTIME_RATE_LIMIT_WRITE > 0:
+        rate_limiter = RateLimiter(
+            read_rate=LEANTIME_RATE_LIMIT_READ,
+            write_rate=LEANTIME_RATE_LIMIT_WRITE,
+            read_burst=LEANTIME_RATE_LIMIT_BURST or None,
+            write_burst=LEANTIME_RATE_LIMIT_BURST or None,
+            max_block=LEANTIME_RETRY_MAX_RETRY_AFTER,
+        )
+    
+    max_connections = tenant.max_connections or LEANTIME_MAX_CONNECTIONS
+    
+    return LeantimeClient(
+        base_url=tenant.url,
+        api_key=tenant.api_key,
+        username=tenant.username,
+        password=tenant.password,
+        max_connections=max_connections,
+        max_keepalive_connections=min(LEANTIME_MAX_KEEPALIVE_CONNECTIONS, max_connections),
+        keepalive_expiry=LEANTIME_KEEPALIVE_EXPIRY,
+        http2=LEANTIME_HTTP2,
+        connect_timeout=LEANTIME_CONNECT_TIMEOUT,
+        read_timeout=LEANTIME_READ_TIMEOUT,
+        write_timeout=LEANTIME_WRITE_TIMEOUT,
+        pool_timeout=LEANTIME_POOL_TIMEOUT,
+        cache=cache,
+        single_flight=LEANTIME_SINGLE_FLIGHT,
+        page_size=LEANTIME_PAGE_SIZE,
+        task_mirror=task_mirror,
+        retry_policy=retry_policy,
+        breaker_failure_threshold=LEANTIME_BREAKER_FAILURES,
+        breaker_recovery_timeout=LEANTIME_BREAKER_RECOVERY,
+        rate_limiter=rate_limiter,
+        conditional_cache=ConditionalCache(LEANTIME_CONDITIONAL_MAX_ENTRIES) if LEANTIME_CONDITIONAL_REQUESTS else None,
+        rpc_batch_size=LEANTIME_RPC_BATCH_SIZE,
+        rpc_flush_delay=LEANTIME_RPC_FLUSH_DELAY,
+        tenant=tenant.name,
+        timesheet_queue=timesheet_queue,
+        hedge_policy=HedgePolicy(
+            percentile=LEANTIME_HEDGE_PERCENTILE,
+            budget=LEANTIME_HEDGE_BUDGET,
+            min_delay=LEANTIME_HEDGE_MIN_DELAY,
+            max_delay=LEANTIME_HEDGE_MAX_DELAY,
+        ) if LEANTIME_HEDGING else None,
+    )
+
+
+async def close_leantime_client(client: LeantimeClient) -> None:
+    """Drain and close a Leantime client, its task mirror and its timesheet queue."""
+    await client.aclose(drain_timeout=LEANTIME_SHUTDOWN_TIMEOUT)
+    if client.task_mirror is not None:
+        client.task_mirror.close()
+    if client.timesheet_queue is not None:
+        client.timesheet_queue.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open one pooled Leantime client per worker and drain it on shutdown.
+    
+    Clients of other tenants are opened on first use by the tenant pool,
+    which also closes them (and the default client) on shutdown. The tool
+    manifest is rendered in a background thread, so neither startup nor the
+    first ``/tools`` request waits for every tool to be imported.
+    """
+    warm_manifest = asyncio.ensure_future(asyncio.to_thread(AVAILABLE_TOOLS.manifest))
+    client = create_leantime_client()
+    await client.open()
+    pool = ClientPool(create_leantime_client, max_clients=LEANTIME_TENANT_POOL_SIZE, close=close_leantime_client)
+    pool.pin(default_tenant, client)
+    app.state.leantime_client = client
+    app.state.client_pool = pool
+    try:
+        yield
+    finally:
+        await pool.aclose()
+        # A failure surfaces again on the next /tools request
+        await asyncio.gather(warm_manifest, return_exceptions=True)
+
+
+app = FastAPI(title="Leantime MCP Server", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 
 class ToolRequest(BaseModel):
@@ -26,17 +240,76 @@ class ToolResponse(BaseModel):
     output: Dict[str, Any]
 
 
-async def get_leantime_client():
-    """Create and return a Leantime client."""
-    client = LeantimeClient(
-        base_url=LEANTIME_URL,
-        api_key=LEANTIME_API_KEY if LEANTIME_API_KEY else None,
-        username=LEANTIME_USERNAME if not LEANTIME_API_KEY and LEANTIME_USERNAME else None,
-        password=LEANTIME_PASSWORD if not LEANTIME_API_KEY and LEANTIME_PASSWORD else None,
-    )
+def resolve_tenant(request: Request) -> Optional[Tenant]:
+    """
+    Return the tenant selected by a request, or None for the default instance.
     
-    async with client:
+    A tenant is selected by name with the ``X-Leantime-Tenant`` header or by
+    presenting its token as ``Authorization: Bearer <token>``. A tenant that
+    defines a token can only be selected with that token.
+    """
+    name = request.headers.get(TENANT_HEADER)
+    token = None
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        token = credentials.strip()
+    
+    if name is not None:
+        tenant = tenants.get(name)
+        if tenant is None:
+            raise HTTPException(status_code=404, detail=f"Unknown tenant '{name}'")
+        if tenant.token and not (token and hmac.compare_digest(token, tenant.token)):
+            raise HTTPException(status_code=401, detail=f"Missing or invalid token for tenant '{name}'")
+        return tenant
+    
+    if token is not None and tenants_by_token:
+        tenant = tenants_by_token.get(token)
+        if tenant is None:
+            raise HTTPException(status_code=401, detail="Invalid tenant token")
+        return tenant
+    return None
+
+
+async def get_leantime_client(request: Request) -> AsyncIterator[LeantimeClient]:
+    """Yield the Leantime client of the request's tenant, leased from the pool opened by the lifespan hook."""
+    tenant = resolve_tenant(request)
+    if tenant is None:
+        client = getattr(request.app.state, "leantime_client", None)
+        if client is None:
+            raise HTTPException(status_code=503, detail="Leantime client is not initialized")
         yield client
+        return
+    
+    pool = getattr(request.app.state, "client_pool", None)
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Leantime client pool is not initialized")
+    client = await pool.acquire(tenant)
+    request.state.tenant = tenant
+    try:
+        yield client
+    finally:
+        pool.release(tenant)
+
+
+async def stream_lease(request: Request) -> Optional[BackgroundTask]:
+    """
+    Keep the request's pooled client leased until a streaming response is sent.
+    
+    The cleanup of ``get_leantime_client`` runs before a ``StreamingResponse``
+    body is sent, so without a second lease the pool could evict (and close)
+    the client while the body still uses it. Must be called while the
+    dependency's lease is held, i.e. from the endpoint.
+    
+    Returns:
+        A background task ending the lease, to pass to the response (None
+        for the default client, which is never evicted)
+    """
+    tenant = getattr(request.state, "tenant", None)
+    pool = getattr(request.app.state, "client_pool", None)
+    if tenant is None or pool is None:
+        return None
+    await pool.acquire(tenant)
+    return BackgroundTask(pool.release, tenant)
 
 
 @app.get("/")
@@ -46,72 +319,391 @@ async def root():
 
 
 @app.get("/tools")
-async def list_tools():
-    """List all available tools."""
-    tools_info = []
+async def list_tools(http_request: Request):
+    """
+    List all available tools with their input and output JSON schemas.
+    
+    The manifest is built once, in the background after startup or on the
+    first request, and served with an ETag, so clients can cache it and
+    revalidate with ``If-None-Match``.
+    """
+    body, etag = AVAILABLE_TOOLS.manifest()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(http_request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/cache/stats")
+async def cache_stats(leantime_client: LeantimeClient = Depends(get_leantime_client)):
+    """Return hit/miss counters for the Leantime lookup cache."""
+    if leantime_client.cache is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **leantime_client.cache.stats()}
+
+
+@app.get("/upstream/stats")
+async def upstream_stats(leantime_client: LeantimeClient = Depends(get_leantime_client)):
+    """Return counters describing upstream Leantime request handling."""
+    return await leantime_client.stats()
+
+
+@app.get("/tenants")
+async def tenant_stats(http_request: Request, tenant: Optional[Tenant] = Depends(resolve_tenant)):
+    """
+    Return the configured tenants and the clients currently open in the pool.
+    
+    Tenant selection and tokens are checked as for the tool endpoints, and
+    only tenants the caller could select are listed: those without a token,
+    plus the caller's own tenant.
+    """
+    visible = {name for name, other in tenants.items() if not other.token or other is tenant}
+    pool = getattr(http_request.app.state, "client_pool", None)
+    stats = {"clients": 0}
+    if pool is not None:
+        stats = pool.stats()
+        stats["tenants"] = [
+            entry for entry in stats["tenants"] if entry["tenant"] in visible or entry["tenant"] == DEFAULT_TENANT
+        ]
+        stats["clients"] = len(stats["tenants"])
+    return {
+        "tenants": sorted(visible),
+        **stats,
+    }
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Return tool and upstream metrics in the Prometheus text format."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+async def run_tool(tool_name: str, input_data: Dict[str, Any], leantime_client: LeantimeClient) -> Dict[str, Any]:
+    """Run a registered tool, recording its outcome and latency."""
+    tenant = getattr(leantime_client, "tenant", DEFAULT_TENANT)
+    metrics.TOOL_IN_FLIGHT.inc(tenant, tool_name)
+    started = time.perf_counter()
+    status = "error"
+    try:
+        # Initialize the tool with the Leantime client
+        tool_instance = AVAILABLE_TOOLS[tool_name](leantime_client)
+        
+        # Run the tool
+        result = await tool_instance.run(input_data)
+        status = "ok"
+        return result
+    except Exception as e:
+        metrics.TOOL_ERRORS.inc(tenant, tool_name, type(e).__name__)
+        raise
+    finally:
+        metrics.TOOL_IN_FLIGHT.dec(tenant, tool_name)
+        metrics.TOOL_DURATION.observe(time.perf_counter() - started, tenant, tool_name)
+        metrics.TOOL_REQUESTS.inc(tenant, tool_name, status)
+
+
+# Header carrying MCP_PROFILE_TOKEN to request a cProfile capture of a single call
+PROFILE_HEADER = "X-MCP-Profile"
+PROFILE_ID_HEADER = "X-MCP-Profile-Id"
+# Number of other requests whose work on the event loop thread ended up in the capture
+PROFILE_CONCURRENT_HEADER = "X-MCP-Profile-Concurrent"
+
+profile_store = profiling.ProfileStore(max_entries=MCP_PROFILE_MAX_ENTRIES)
+# cProfile hooks the whole thread, so only one request is profiled at a time
+_profile_lock = asyncio.Lock()
+# Timed requests currently running, and how many were started so far
+_timed_in_flight = 0
+_timed_started = 0
+
+
+def response_etag(body: bytes) -> str:
+    """Return a strong ETag for a rendered response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(http_request: Request, etag: str) -> bool:
+    """Return whether the request's ``If-None-Match`` header matches ``etag``."""
+    header = http_request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+def profiling_authorized(http_request: Request) -> bool:
+    """Return whether the request carries the configured profiling token."""
+    token = http_request.headers.get(PROFILE_HEADER)
+    return bool(MCP_PROFILE_TOKEN) and token is not None and hmac.compare_digest(token, MCP_PROFILE_TOKEN)
+
+
+async def timed_response(http_request: Request,
+                         label: str,
+                         produce: Callable[[], Awaitable[Any]],
+                         etag: bool = False) -> Response:
+    """
+    Produce and render a response with a ``Server-Timing`` header.
+    
+    If the request carries a valid profiling token, the call is also captured
+    with cProfile and the capture's ID is returned in ``X-MCP-Profile-Id``.
+    cProfile sees every coroutine on the event loop thread, so the number of
+    other requests that ran during the capture is returned in
+    ``X-MCP-Profile-Concurrent``.
     
-    for tool_name, tool_class in AVAILABLE_TOOLS.items():
-        tools_info.append({
-            "name": tool_name,
-            "description": tool_class.description
-        })
+    Args:
+        http_request: Incoming request
+        label: Label stored with a profile capture
+        produce: Coroutine function returning the response content
+        etag: Add an ETag over the rendered body and answer a matching
+            ``If-None-Match`` with an empty 304
+        
+    Returns:
+        The rendered response
+    """
+    timings = profiling.start_timings()
+    
+    async def render() -> FastJSONResponse:
+        content = await produce()
+        with profiling.phase("serialize"):
+            return FastJSONResponse(content)
+    
+    global _timed_in_flight, _timed_started
+    _timed_in_flight += 1
+    _timed_started += 1
+    try:
+        if not profiling_authorized(http_request):
+            response = await render()
+        else:
+            async with _profile_lock:
+                profiler = cProfile.Profile()
+                running, started_before = _timed_in_flight - 1, _timed_started
+                started = time.perf_counter()
+                profiler.enable()
+                try:
+                    response = await render()
+                finally:
+                    profiler.disable()
+                concurrent = running + _timed_started - started_before
+                profile_id = profile_store.add(label, profiler, time.perf_counter() - started, concurrent)
+            response.headers[PROFILE_ID_HEADER] = profile_id
+            response.headers[PROFILE_CONCURRENT_HEADER] = str(concurrent)
+    finally:
+        _timed_in_flight -= 1
+    
+    if etag:
+        tag = response_etag(response.body)
+        if etag_matches(http_request, tag):
+            not_modified = Response(status_code=304)
+            for header in (PROFILE_ID_HEADER, PROFILE_CONCURRENT_HEADER):
+                if header in response.headers:
+                    not_modified.headers[header] = response.headers[header]
+            response = not_modified
+        response.headers["ETag"] = tag
     
-    return {"tools": tools_info}
+    response.headers["Server-Timing"] = timings.server_timing()
+    return response
 
 
 @app.post("/tools/{tool_name}", response_model=ToolResponse)
 async def execute_tool(
     tool_name: str, 
     request: ToolRequest,
+    http_request: Request,
     leantime_client: LeantimeClient = Depends(get_leantime_client)
 ):
-    """Execute a specific tool."""
+    """
+    Execute a specific tool.
+    
+    Responses of read-only tools carry an ETag; a request whose
+    ``If-None-Match`` matches the new result gets an empty 304 instead.
+    """
     if tool_name not in AVAILABLE_TOOLS:
         raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
     
-    try:
-        # Initialize the tool with the Leantime client
-        tool_class = AVAILABLE_TOOLS[tool_name]
-        tool_instance = tool_class(leantime_client)
-        
-        # Run the tool
-        result = await tool_instance.run(request.input)
-        
-        return ToolResponse(output=result)
+    async def produce() -> Dict[str, Any]:
+        try:
+            result = await run_tool(tool_name, request.input, leantime_client)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ValidationError as e:
+            # Invalid input is the caller's fault; invalid output stays a server error
+            if e.title == AVAILABLE_TOOLS[tool_name].input_model.__name__:
+                raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+            raise HTTPException(status_code=500, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        # The output is already validated by the tool, so render it directly
+        # instead of re-encoding it through the response model
+        return {"output": result}
+    
+    return await timed_response(http_request, tool_name, produce, etag=AVAILABLE_TOOLS[tool_name].read_only)
 
 
-@app.post("/batch")
-async def execute_batch(
-    requests: List[ToolRequest],
+@app.post("/tools/{tool_name}/stream")
+async def stream_tool(
+    tool_name: str,
+    request: ToolRequest,
+    http_request: Request,
     leantime_client: LeantimeClient = Depends(get_leantime_client)
 ):
-    """Execute multiple tools in a batch."""
-    results = []
+    """
+    Execute a list tool and stream its items as NDJSON.
+    
+    Each line of the response is one validated item. If an error occurs after
+    streaming has started, a final ``{"error": ...}`` line is emitted.
+    """
+    if tool_name not in AVAILABLE_TOOLS:
+        raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
+    
+    tool_class = AVAILABLE_TOOLS[tool_name]
+    if not tool_class.supports_streaming():
+        raise HTTPException(status_code=400, detail=f"Tool '{tool_name}' does not support streaming")
+    
+    try:
+        items = tool_class(leantime_client).stream(request.input)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def ndjson():
+        try:
+            async for item in items:
+                yield json_codec.dumps(item) + b"\n"
+        except Exception as e:
+            yield json_codec.dumps({"error": str(e)}) + b"\n"
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson", background=await stream_lease(http_request))
+
+
+mcp_server = mcp.MCPServer(
+    run_tool, AVAILABLE_TOOLS, {"name": "leantime-mcp", "version": app.version}, batch_concurrency=MCP_BATCH_CONCURRENCY
+)
+
+
+@app.post("/mcp")
+async def mcp_endpoint(http_request: Request, leantime_client: LeantimeClient = Depends(get_leantime_client)):
+    """
+    MCP streamable HTTP transport.
     
-    for request in requests:
-        if request.name not in AVAILABLE_TOOLS:
-            raise HTTPException(status_code=404, detail=f"Tool '{request.name}' not found")
+    Accepts a JSON-RPC request, notification or batch. A batch sent with
+    ``Accept: text/event-stream`` is answered as an SSE stream, one event per
+    response as soon as it completes; everything else is answered with JSON.
+    Messages containing only notifications are acknowledged with 202. Batch
+    messages run up to ``MCP_BATCH_CONCURRENCY`` at a time.
+    """
+    message, error = mcp.parse_message(await http_request.body())
+    if error is not None:
+        return FastJSONResponse(error, status_code=400)
+    
+    if isinstance(message, list) and message and "text/event-stream" in http_request.headers.get("accept", ""):
+        async def events():
+            async for response in mcp_server.handle_as_completed(message, leantime_client):
+                yield b"event: message\ndata: " + json_codec.dumps(response) + b"\n\n"
         
+        return StreamingResponse(events(), media_type="text/event-stream", background=await stream_lease(http_request))
+    
+    response = await mcp_server.handle(message, leantime_client)
+    if response is None:
+        return Response(status_code=202)
+    return FastJSONResponse(response)
+
+
+async def run_stdio() -> None:
+    """Serve MCP over stdin/stdout, keeping one Leantime client open for the session."""
+    client = create_leantime_client()
+    await client.open()
+    try:
+        reader, write = await mcp.open_stdio()
+        await mcp.serve_stdio(mcp_server, client, reader, write, concurrency=MCP_SESSION_CONCURRENCY)
+    finally:
+        await close_leantime_client(client)
+
+
+async def run_batch_item(request: ToolRequest, leantime_client: LeantimeClient) -> Dict[str, Any]:
+    """Run a single batch item, capturing its timing and any error."""
+    started = time.perf_counter()
+    
+    if request.name not in AVAILABLE_TOOLS:
+        item = {
+            "tool": request.name,
+            "error": f"Tool '{request.name}' not found"
+        }
+    else:
         try:
-            # Initialize the tool with the Leantime client
-            tool_class = AVAILABLE_TOOLS[request.name]
-            tool_instance = tool_class(leantime_client)
+            result = await run_tool(request.name, request.input, leantime_client)
             
-            # Run the tool
-            result = await tool_instance.run(request.input)
-            
-            results.append({
+            item = {
                 "tool": request.name,
                 "output": result
-            })
+            }
             
         except Exception as e:
-            results.append({
+            item = {
                 "tool": request.name,
                 "error": str(e)
-            })
+            }
     
-    return {"results": results}
\ No newline at end of file
+    item["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return item
+
+
+@app.post("/batch")
+async def execute_batch(
+    requests: List[ToolRequest],
+    http_request: Request,
+    sequential: bool = False,
+    leantime_client: LeantimeClient = Depends(get_leantime_client)
+):
+    """
+    Execute multiple tools in a batch.
+    
+    Items run concurrently (up to ``MCP_BATCH_CONCURRENCY`` at a time) unless
+    ``sequential=true`` is passed, in which case they run one after another in
+    request order. Results are always returned in request order.
+    """
+    metrics.BATCH_SIZE.observe(len(requests))
+    
+    async def produce() -> Dict[str, Any]:
+        if sequential:
+            results = []
+            for request in requests:
+                results.append(await run_batch_item(request, leantime_client))
+            return {"results": results}
+        
+        semaphore = asyncio.Semaphore(max(1, MCP_BATCH_CONCURRENCY))
+        
+        async def run_limited(request: ToolRequest) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_batch_item(request, leantime_client)
+        
+        results = await asyncio.gather(*(run_limited(request) for request in requests))
+        return {"results": list(results)}
+    
+    return await timed_response(http_request, "batch", produce)
+
+
+def require_profiling(http_request: Request) -> None:
+    """Reject the request unless profiling is enabled and the token matches."""
+    if not MCP_PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiling_authorized(http_request):
+        raise HTTPException(status_code=403, detail=f"Missing or invalid {PROFILE_HEADER} header")
+
+
+@app.get("/debug/profiles")
+async def list_profiles(http_request: Request):
+    """List stored profile captures, newest first (requires the profiling token)."""
+    require_profiling(http_request)
+    return {"profiles": profile_store.list()}
+
+
+@app.get("/debug/profiles/{profile_id}")
+async def get_profile(http_request: Request, profile_id: str, sort: str = "cumulative", limit: int = 50):
+    """Return a stored profile capture as a pstats text report (requires the profiling token)."""
+    require_profiling(http_request)
+    try:
+        report = profile_store.report(profile_id, sort=sort, limit=limit)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key '{sort}'")
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Profile '{profile_id}' not found")
+    return Response(report, media_type="text/plain")
+
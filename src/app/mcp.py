@@ -0,0 +1,313 @@
+import asyncio
+import logging
+import sys
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple, Type, Union
+
+from src.app.services import json_codec
+from src.app.services.leantime_client import LeantimeClient
+from src.app.tools.base import BaseTool
+
+logger = logging.getLogger(__name__)
+
+# MCP protocol revisions this server speaks, newest first
+PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+Message = Dict[str, Any]
+ToolRunner = Callable[[str, Dict[str, Any], LeantimeClient], Awaitable[Dict[str, Any]]]
+
+
+class MCPError(Exception):
+    """A JSON-RPC error returned to the caller instead of a result."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def valid_id(request_id: Any) -> bool:
+    """Return whether ``request_id`` is a request ID MCP allows (a string or an integer)."""
+    return isinstance(request_id, str) or (isinstance(request_id, int) and not isinstance(request_id, bool))
+
+
+def error_response(request_id: Any, code: int, message: str) -> Message:
+    """Build a JSON-RPC error response."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class MCPServer:
+    """
+    MCP JSON-RPC dispatcher over the tool registry.
+
+    The server holds no per-connection state, so one instance is shared by the
+    stdio transport and every streamable HTTP request. Tools run through the
+    same ``run_tool`` as the REST endpoints, including its metrics.
+    """
+
+    def __init__(self,
+                 run_tool: ToolRunner,
+                 tools: Mapping[str, Type[BaseTool]],
+                 server_info: Optional[Dict[str, str]] = None,
+                 batch_concurrency: int = 10):
+        """
+        Initialize the server.
+
+        Args:
+            run_tool: Coroutine function executing a tool by name with the given input and client
+            tools: Registry of available tools
+            server_info: Name and version reported by ``initialize``
+            batch_concurrency: Maximum number of messages of one batch handled at the same time
+        """
+        self.run_tool = run_tool
+        self.tools = tools
+        self.server_info = server_info or {"name": "leantime-mcp", "version": "0.1.0"}
+        self.batch_concurrency = max(1, batch_concurrency)
+        self._tool_list: Optional[List[Dict[str, Any]]] = None
+
+    def tool_list(self) -> List[Dict[str, Any]]:
+        """Return the ``tools/list`` entries, built once from the registry."""
+        if self._tool_list is None:
+            self._tool_list = [self._tool_entry(name, self.tools[name]) for name in self.tools]
+        return self._tool_list
+
+    @staticmethod
+    def _tool_entry(name: str, tool: Type[BaseTool]) -> Dict[str, Any]:
+        """
+        Describe one tool for ``tools/list``.
+
+        ``outputSchema`` is only advertised for tools whose output always has
+        the shape of their output model. Projected or columnar results of list
+        tools would not conform to it, so those tools do not advertise one.
+        """
+        entry = {
+            "name": name,
+            "description": tool.description,
+            "inputSchema": tool.input_model.model_json_schema(),
+            "annotations": {"readOnlyHint": tool.read_only},
+        }
+        if tool.has_fixed_output():
+            entry["outputSchema"] = tool.output_model.model_json_schema()
+        return entry
+
+    async def handle(self,
+                     message: Union[Message, List[Any], Any],
+                     leantime_client: LeantimeClient) -> Union[Message, List[Message], None]:
+        """
+        Handle a parsed JSON-RPC message or batch.
+
+        Args:
+            message: Decoded request, notification or batch (list of them)
+            leantime_client: Client the tools run against
+
+        Returns:
+            The response (a list for batches), or None if nothing is to be sent back
+        """
+        if isinstance(message, list):
+            if not message:
+                return error_response(None, INVALID_REQUEST, "Empty batch")
+            semaphore = asyncio.Semaphore(self.batch_concurrency)
+            responses = await asyncio.gather(*(self._handle_limited(item, leantime_client, semaphore) for item in message))
+            return [response for response in responses if response is not None] or None
+        return await self.handle_one(message, leantime_client)
+
+    async def handle_as_completed(self,
+                                  messages: List[Any],
+                                  leantime_client: LeantimeClient) -> AsyncIterator[Message]:
+        """
+        Handle a batch, yielding each response as soon as it is ready.
+
+        Messages still running when the consumer stops iterating (e.g. because
+        the HTTP client disconnected) are cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+        tasks = [asyncio.ensure_future(self._handle_limited(item, leantime_client, semaphore)) for item in messages]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                response = await completed
+                if response is not None:
+                    yield response
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _handle_limited(self,
+                              message: Any,
+                              leantime_client: LeantimeClient,
+                              semaphore: asyncio.Semaphore) -> Optional[Message]:
+        async with semaphore:
+            return await self.handle_one(message, leantime_client)
+
+    async def handle_one(self, message: Any, leantime_client: LeantimeClient) -> Optional[Message]:
+        """Handle a single JSON-RPC request or notification."""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            request_id = message.get("id") if isinstance(message, dict) else None
+            return error_response(request_id if valid_id(request_id) else None, INVALID_REQUEST, "Invalid JSON-RPC request")
+        if "id" in message and not valid_id(message["id"]):
+            return error_response(None, INVALID_REQUEST, "Request id must be a string or an integer")
+
+        is_notification = "id" not in message
+        request_id = message.get("id")
+        params = message.get("params") or {}
+
+        try:
+            if not isinstance(params, dict):
+                raise MCPError(INVALID_PARAMS, "params must be an object")
+            result = await self.dispatch(message["method"], params, leantime_client)
+        except MCPError as e:
+            return None if is_notification else error_response(request_id, e.code, e.message)
+        except Exception as e:
+            logger.exception("MCP method '%s' failed", message["method"])
+            return None if is_notification else error_response(request_id, INTERNAL_ERROR, str(e))
+
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    async def dispatch(self, method: str, params: Dict[str, Any], leantime_client: LeantimeClient) -> Any:
+        """Run an MCP method and return its result."""
+        if method == "initialize":
+            requested = params.get("protocolVersion")
+            return {
+                "protocolVersion": requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[0],
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": self.server_info,
+            }
+        if method == "ping" or method.startswith("notifications/"):
+            return {}
+        if method == "tools/list":
+            return {"tools": self.tool_list()}
+        if method == "tools/call":
+            return await self.call_tool(params, leantime_client)
+        raise MCPError(METHOD_NOT_FOUND, f"Method '{method}' not found")
+
+    async def call_tool(self, params: Dict[str, Any], leantime_client: LeantimeClient) -> Dict[str, Any]:
+        """
+        Run a ``tools/call`` request.
+
+        An unknown tool is a protocol error; a failing tool is reported as a
+        result with ``isError`` so the model can see and react to the error.
+        """
+        name = params.get("name")
+        arguments = params.get("arguments") or {}
+        if name not in self.tools:
+            raise MCPError(INVALID_PARAMS, f"Tool '{name}' not found")
+        if not isinstance(arguments, dict):
+            raise MCPError(INVALID_PARAMS, "arguments must be an object")
+
+        try:
+            output = await self.run_tool(name, arguments, leantime_client)
+        except Exception as e:
+            return {"content": [{"type": "text", "text": str(e)}], "isError": True}
+
+        return {
+            "content": [{"type": "text", "text": json_codec.dumps(output).decode()}],
+            "structuredContent": output,
+            "isError": False,
+        }
+
+
+def parse_message(data: bytes) -> Tuple[Any, Optional[Message]]:
+    """
+    Decode a JSON-RPC payload.
+
+    Returns:
+        The decoded message and None, or None and a parse error response
+    """
+    try:
+        return json_codec.loads(data), None
+    except (json_codec.JSONDecodeError, UnicodeDecodeError):
+        return None, error_response(None, PARSE_ERROR, "Parse error")
+
+
+async def serve_stdio(server: MCPServer,
+                      leantime_client: LeantimeClient,
+                      reader: asyncio.StreamReader,
+                      write: Callable[[bytes], None],
+                      concurrency: int = 10) -> None:
+    """
+    Serve newline-delimited JSON-RPC messages until ``reader`` reaches EOF.
+
+    Requests are pipelined: each one runs as soon as it is read (up to
+    ``concurrency`` at a time) and its response is written when it completes,
+    so responses may arrive out of order. ``notifications/cancelled`` cancels
+    a request that is still running.
+
+    Args:
+        server: Dispatcher handling each message
+        leantime_client: Client kept open for the whole session
+        reader: Stream the messages are read from
+        write: Callable writing one encoded response line
+        concurrency: Maximum number of messages handled at the same time
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    in_flight: Dict[Any, asyncio.Task] = {}
+    pending = set()
+
+    def send(response: Union[Message, List[Message], None]) -> None:
+        if response is not None:
+            write(json_codec.dumps(response) + b"\n")
+
+    def forget(request_id: Any, task: asyncio.Task) -> None:
+        # A newer request may reuse the ID of one that finished
+        if in_flight.get(request_id) is task:
+            del in_flight[request_id]
+
+    async def handle(message: Any) -> None:
+        async with semaphore:
+            try:
+                response = await server.handle(message, leantime_client)
+            except asyncio.CancelledError:
+                return
+        send(response)
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+
+        message, error = parse_message(line)
+        if error is not None:
+            send(error)
+            continue
+
+        if isinstance(message, dict) and message.get("method") == "notifications/cancelled":
+            params = message.get("params")
+            request_id = params.get("requestId") if isinstance(params, dict) else None
+            task = in_flight.get(request_id) if valid_id(request_id) else None
+            if task is not None:
+                task.cancel()
+            continue
+
+        task = asyncio.create_task(handle(message))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        if isinstance(message, dict) and valid_id(message.get("id")):
+            request_id = message["id"]
+            in_flight[request_id] = task
+            task.add_done_callback(lambda done, request_id=request_id: forget(request_id, done))
+
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def open_stdio() -> Tuple[asyncio.StreamReader, Callable[[bytes], None]]:
+    """Return a reader over stdin and a writer for stdout, for use with ``serve_stdio``."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=16 * 1024 * 1024)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    stdout = sys.stdout.buffer
+
+    def write(data: bytes) -> None:
+        stdout.write(data)
+        stdout.flush()
+
+    return reader, write
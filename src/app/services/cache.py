@@ -0,0 +1,231 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Missing:
+    """Sentinel type for cache misses."""
+    pass
+
+
+MISSING = _Missing()
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry expiry and LRU eviction.
+
+    Values are stored as-is and shared between callers, so cached objects
+    must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries before the least recently used is evicted
+            clock: Monotonic clock used to compute expiry (overridable for tests)
+        """
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key`` or ``MISSING``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (self.clock() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Remove the given keys from the cache."""
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LeantimeCache:
+    """Read-through cache for Leantime entity lookups with per-entity TTLs."""
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 project_ttl: float = 300.0,
+                 user_ttl: float = 300.0,
+                 task_ttl: float = 30.0,
+                 negative_ttl: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached entries across all entities
+            project_ttl: Seconds to cache projects and the project list
+            user_ttl: Seconds to cache users and the user list
+            task_ttl: Seconds to cache individual tasks
+            negative_ttl: Seconds to remember that an entity was not found (404)
+            clock: Monotonic clock used to compute expiry (overridable for tests)
+        """
+        self.store = TTLCache(max_entries=max_entries, clock=clock)
+        self.ttls = {
+            "projects": project_ttl,
+            "project": project_ttl,
+            "users": user_ttl,
+            "user": user_ttl,
+            "task": task_ttl,
+        }
+        self.negative_ttl = negative_ttl
+        # Bumped on every invalidation so that lookups which started before a
+        # write do not repopulate the cache with stale data
+        self.version = 0
+
+    def get(self, key: Tuple) -> Any:
+        """Return the cached value for ``key`` or ``MISSING``."""
+        return self.store.get(key)
+
+    def set(self, key: Tuple, value: Any) -> None:
+        """Cache ``value`` using the TTL of the key's entity type."""
+        self.store.set(key, value, self.ttls.get(key[0], 0))
+
+    def set_negative(self, key: Tuple, error: Exception) -> None:
+        """Remember that ``key`` does not exist upstream."""
+        self.store.set(key, NegativeEntry(error), self.negative_ttl)
+
+    def invalidate(self, *keys: Tuple) -> None:
+        """Remove the given keys from the cache."""
+        self.version += 1
+        self.store.invalidate(*keys)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        self.version += 1
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for the cache."""
+        return self.store.stats()
+
+
+class NegativeEntry:
+    """Cached marker for an entity that was not found upstream."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class ConditionalEntry:
+    """Validators and parsed body of a previously fetched response."""
+
+    __slots__ = ("etag", "last_modified", "body")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], body: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+    
+    def request_headers(self) -> Dict[str, str]:
+        """Return the ``If-None-Match``/``If-Modified-Since`` headers revalidating this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ConditionalCache:
+    """
+    Bounded LRU store of ``ETag``/``Last-Modified`` validators for conditional GETs.
+
+    The parsed body is kept alongside its validators so that a ``304 Not
+    Modified`` can be answered locally. Bodies are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum number of remembered responses before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, ConditionalEntry]" = OrderedDict()
+        self.not_modified = 0
+        self.modified = 0
+
+    def get(self, key: Hashable) -> Optional[ConditionalEntry]:
+        """Return the remembered response for ``key``, if any."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, etag: Optional[str], last_modified: Optional[str], body: Any) -> None:
+        """Remember a response that carried at least one validator."""
+        if self.max_entries <= 0 or not (etag or last_modified):
+            return
+        self._entries[key] = ConditionalEntry(etag, last_modified, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all remembered responses."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return revalidation counters."""
+        revalidated = self.not_modified + self.modified
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "not_modified": self.not_modified,
+            "modified": self.modified,
+            "not_modified_ratio": round(self.not_modified / revalidated, 4) if revalidated else 0.0,
+        }
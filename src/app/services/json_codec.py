@@ -0,0 +1,84 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Raised by every backend's ``loads`` (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """A JSON implementation used for upstream parsing and response rendering."""
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any, Optional[Callable[[Any], Any]]], bytes]
+
+
+def _stdlib_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    # NaN and Infinity are not valid JSON, so refuse them rather than emit them
+    return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+
+def _orjson_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    try:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # e.g. integers beyond 64 bits, which the stdlib encoder handles
+        return _stdlib_dumps(obj, default)
+
+
+KNOWN_BACKENDS = ("orjson", "stdlib")
+
+BACKENDS: Dict[str, JSONBackend] = {
+    "stdlib": JSONBackend("stdlib", json.loads, _stdlib_dumps),
+}
+if orjson is not None:
+    BACKENDS["orjson"] = JSONBackend("orjson", orjson.loads, _orjson_dumps)
+
+_backend = BACKENDS.get("orjson", BACKENDS["stdlib"])
+
+
+def set_backend(name: str = "auto") -> JSONBackend:
+    """
+    Select the JSON backend.
+
+    Args:
+        name: ``auto`` (fastest installed), ``orjson`` or ``stdlib``. A
+            backend that is not installed falls back to ``stdlib``
+
+    Returns:
+        The selected backend
+    """
+    global _backend
+    if name == "auto":
+        name = "orjson" if "orjson" in BACKENDS else "stdlib"
+    elif name not in KNOWN_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}'. Available backends: auto, {', '.join(KNOWN_BACKENDS)}")
+    elif name not in BACKENDS:
+        logger.warning("JSON backend '%s' is not available; falling back to the standard library", name)
+        name = "stdlib"
+    _backend = BACKENDS[name]
+    return _backend
+
+
+def get_backend() -> JSONBackend:
+    """Return the active JSON backend."""
+    return _backend
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document with the active backend."""
+    return _backend.loads(data)
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON with the active backend."""
+    return _backend.dumps(obj, default)
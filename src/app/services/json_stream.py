@@ -0,0 +1,150 @@
+import json
+import re
+from typing import Any, AsyncIterator, List
+
+from src.app.services import json_codec
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that matter while scanning a value: inside strings, and outside them
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURE_SPECIAL = re.compile(r'["\[\]{}]')
+# A number or literal ends at the next separator, closing bracket or whitespace
+_SCALAR_END = re.compile(r"[,\]\s]")
+
+
+class _ValueScanner:
+    """
+    Finds where a JSON value ends without decoding it.
+
+    The scanner only tracks string and nesting state, so every character of
+    the value is looked at once however many chunks it arrives in; the value
+    is decoded a single time, once complete.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start scanning a new value."""
+        self.started = False
+        self.scalar = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def scan(self, text: str, position: int) -> int:
+        """
+        Continue scanning the current value in ``text`` from ``position``.
+
+        Returns:
+            The index just past the end of the value, or -1 if it continues
+            beyond ``text``
+        """
+        if not self.started:
+            self.started = True
+            self.scalar = text[position] not in '[{"'
+        if self.scalar:
+            match = _SCALAR_END.search(text, position)
+            return match.start() if match else -1
+
+        if self.escaped:
+            # The previous chunk ended with a backslash inside a string
+            self.escaped = False
+            position += 1
+        while position < len(text):
+            if self.in_string:
+                match = _STRING_SPECIAL.search(text, position)
+                if match is None:
+                    return -1
+                position = match.end()
+                if match.group() == "\\":
+                    if position == len(text):
+                        self.escaped = True
+                        return -1
+                    position += 1
+                    continue
+                self.in_string = False
+            else:
+                match = _STRUCTURE_SPECIAL.search(text, position)
+                if match is None:
+                    return -1
+                position = match.end()
+                char = match.group()
+                if char == '"':
+                    self.in_string = True
+                    continue
+                self.depth += 1 if char in "[{" else -1
+            if self.depth == 0:
+                return position
+        return -1
+
+
+async def iter_json_array(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """
+    Incrementally parse a JSON array from a stream of text chunks.
+
+    Items are yielded as soon as they have been fully received, so only the
+    item currently being parsed is held in memory rather than the whole body.
+    If the body is not a JSON array it is parsed in full, and a list is
+    yielded item by item.
+
+    Args:
+        chunks: Async iterator of decoded text chunks
+
+    Yields:
+        Each element of the top-level JSON array
+    """
+    scanner = _ValueScanner()
+    # Text of the item currently being received, across chunks
+    pending: List[str] = []
+    started = False
+    in_item = False
+    iterator = chunks.__aiter__()
+
+    async for text in iterator:
+        position = 0
+        while position < len(text):
+            if in_item:
+                end = scanner.scan(text, position)
+                if end < 0:
+                    pending.append(text[position:])
+                    break
+                pending.append(text[position:end])
+                yield json_codec.loads("".join(pending))
+                pending.clear()
+                in_item = False
+                position = end
+                continue
+
+            # Skip whitespace and separators before the next item
+            char = text[position]
+            if char in _WHITESPACE:
+                position += 1
+            elif not started:
+                if char != "[":
+                    # Not an array: fall back to parsing the whole body
+                    rest = [text[position:]]
+                    async for chunk in iterator:
+                        rest.append(chunk)
+                    value = json_codec.loads("".join(rest))
+                    if not isinstance(value, list):
+                        raise ValueError("Expected a JSON array in the response body")
+                    for item in value:
+                        yield item
+                    return
+                started = True
+                position += 1
+            elif char == ",":
+                position += 1
+            elif char == "]":
+                return
+            else:
+                scanner.reset()
+                in_item = True
+
+    if in_item and scanner.scalar:
+        # A number or literal may run up to the very end of a truncated body
+        yield json_codec.loads("".join(pending))
+    if started:
+        raise json.JSONDecodeError("Unterminated JSON array", "".join(pending), 0)
@@ -1,14 +1,127 @@
+import asyncio
+import importlib.util
+import logging
+import time
 import httpx
-from typing import Dict, Any, Optional, List, Union
-import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Tuple, Union, AsyncIterator
 import os
 from pydantic import BaseModel
 
+from src.app.services import json_codec, profiling
+from src.app.services.cache import ConditionalCache, LeantimeCache, MISSING, NegativeEntry
+from src.app.services.json_stream import iter_json_array
+from src.app.services.metrics import (
+    UPSTREAM_DURATION,
+    UPSTREAM_HEDGES,
+    UPSTREAM_HEDGES_SKIPPED,
+    UPSTREAM_IN_FLIGHT,
+    endpoint_label,
+)
+from src.app.services.rate_limit import RateLimiter
+from src.app.services.resilience import CircuitBreaker, HedgePolicy, RetryPolicy, RETRYABLE_STATUS_CODES
+from src.app.services.rpc_batch import RPCBatcher
+
+if TYPE_CHECKING:
+    from src.app.services.task_mirror import TaskMirror
+    from src.app.services.timesheet_queue import TimesheetQueue
+
+logger = logging.getLogger(__name__)
+
+
+class LeantimeAPIError(Exception):
+    """Error returned by the Leantime API."""
+    
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"Leantime API error: {status_code} - {detail}")
+
+
+@dataclass
+class Page:
+    """A single page of results from a paginated list endpoint."""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+OFFSET_CURSOR_PREFIX = "offset:"
+
+
+class InvalidCursorError(ValueError):
+    """A paging cursor that was not issued by this server."""
+
+
+def parse_offset_cursor(cursor: str) -> Tuple[int, Optional[str]]:
+    """
+    Parse an ``offset:<n>[:<first id>]`` cursor.
+    
+    The optional suffix is the ID of the first item of the list, which lets a
+    later page tell an endpoint that ignores the offset from one that honors it.
+    
+    Returns:
+        The offset and the first item's ID, if recorded
+        
+    Raises:
+        InvalidCursorError: If the cursor is not a valid offset cursor
+    """
+    offset, _, first_id = cursor[len(OFFSET_CURSOR_PREFIX):].partition(":")
+    if not cursor.startswith(OFFSET_CURSOR_PREFIX) or not offset.isdigit():
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'")
+    return int(offset), first_id or None
+
+
+def offset_cursor(offset: int, first_id: Optional[str] = None) -> str:
+    """Build an offset cursor, optionally recording the ID of the list's first item."""
+    if first_id is None:
+        return f"{OFFSET_CURSOR_PREFIX}{offset}"
+    return f"{OFFSET_CURSOR_PREFIX}{offset}:{first_id}"
+
+# JSON-RPC endpoint accepting batch arrays
+RPC_ENDPOINT = "/api/jsonrpc"
+
+# JSON-RPC methods used for single-entity lookups when batching is enabled, by cache key prefix
+RPC_LOOKUP_METHODS = {
+    "project": "leantime.rpc.Projects.getProject",
+    "task": "leantime.rpc.Tickets.getTicket",
+    "user": "leantime.rpc.Users.getUser",
+}
+
+# HTTP status reported for JSON-RPC error codes (anything else maps to 500)
+RPC_ERROR_STATUS = {-32600: 400, -32601: 400, -32602: 400}
+
 
 class LeantimeClient:
     """Client for interacting with the Leantime API."""
     
-    def __init__(self, base_url: str, api_key: str = None, username: str = None, password: str = None):
+    def __init__(self,
+                 base_url: str,
+                 api_key: str = None,
+                 username: str = None,
+                 password: str = None,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 5.0,
+                 http2: bool = False,
+                 connect_timeout: float = 5.0,
+                 read_timeout: float = 30.0,
+                 write_timeout: float = 30.0,
+                 pool_timeout: float = 5.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 cache: Optional[LeantimeCache] = None,
+                 single_flight: bool = True,
+                 page_size: int = 100,
+                 task_mirror: Optional["TaskMirror"] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breaker_failure_threshold: int = 0,
+                 breaker_recovery_timeout: float = 30.0,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 conditional_cache: Optional[ConditionalCache] = None,
+                 rpc_batch_size: int = 0,
+                 rpc_flush_delay: float = 0.002,
+                 tenant: str = "default",
+                 timesheet_queue: Optional["TimesheetQueue"] = None,
+                 hedge_policy: Optional[HedgePolicy] = None):
         """
         Initialize the Leantime API client.
         
@@ -17,8 +130,37 @@ class LeantimeClient:
             api_key: API key for authentication
             username: Username for basic authentication (used if API key not provided)
             password: Password for basic authentication (used if API key not provided)
+            max_connections: Maximum number of concurrent connections in the pool
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle keep-alive connection is kept before closing
+            http2: Enable HTTP/2 multiplexing (requires the ``h2`` package)
+            connect_timeout: Seconds to wait for a connection to be established
+            read_timeout: Seconds to wait for a chunk of the response body
+            write_timeout: Seconds to wait for a chunk of the request body to be sent
+            pool_timeout: Seconds to wait for a free connection from the pool
+            transport: Optional custom httpx transport (e.g. for tests or an in-process stub)
+            cache: Optional read-through cache for project, user and task lookups
+            single_flight: Share one upstream request between identical concurrent GETs
+            page_size: Default number of items requested per page by the paginated iterators
+            task_mirror: Optional local SQLite mirror used to answer filtered task queries
+            retry_policy: Optional backoff policy for transient failures (None disables retries)
+            breaker_failure_threshold: Consecutive failures that open the host's circuit
+                breaker (0 disables it)
+            breaker_recovery_timeout: Seconds the circuit breaker stays open before a trial request
+            rate_limiter: Optional token-bucket limiter shared by every request of this client
+            conditional_cache: Optional store of ETag/Last-Modified validators; GETs are then
+                sent as conditional requests and a 304 is answered with the remembered body
+            rpc_batch_size: Maximum number of project/task/user lookups sent in one JSON-RPC
+                batch (0 disables batching and uses the REST endpoints)
+            rpc_flush_delay: Seconds a JSON-RPC batch waits for more lookups before it is sent
+            tenant: Tenant name used to label this client's upstream metrics
+            timesheet_queue: Optional durable write-behind journal for ``create_timesheet``;
+                its delivery worker runs while the client is open
+            hedge_policy: Optional policy for hedging GETs that have not answered within
+                an adaptive latency percentile (None disables hedging)
         """
         self.base_url = base_url.rstrip('/')
+        self.tenant = tenant
         self.api_key = api_key
         self.username = username
         self.password = password
@@ -27,21 +169,247 @@ class LeantimeClient:
         
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
+        
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout,
+        )
+        self.transport = transport
+        self.cache = cache
+        self.single_flight = single_flight
+        self.page_size = page_size
+        self.task_mirror = task_mirror
+        self.timesheet_queue = timesheet_queue
+        self.hedge_policy = hedge_policy
+        self.retry_policy = retry_policy
+        self.circuit_breaker = CircuitBreaker(
+            host=httpx.URL(self.base_url).host or self.base_url,
+            failure_threshold=breaker_failure_threshold,
+            recovery_timeout=breaker_recovery_timeout,
+        )
+        self.retry_stats = {"retries": 0, "gave_up": 0}
+        self.rate_limiter = rate_limiter
+        self.conditional_cache = conditional_cache
+        self.rpc_batcher = None
+        if rpc_batch_size > 0:
+            self.rpc_batcher = RPCBatcher(self._send_rpc_batch, rpc_batch_size, rpc_flush_delay)
+        self._pending_gets: Dict[tuple, asyncio.Task] = {}
+        self.single_flight_stats = {"upstream": 0, "collapsed": 0}
+        self.http2 = http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1")
+            self.http2 = False
+        
+        # In-flight request tracking, used to drain the pool on shutdown
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
     
     async def __aenter__(self):
         """Set up async context manager."""
-        self.session = httpx.AsyncClient(base_url=self.base_url, headers=self.headers)
+        await self.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up async context manager."""
-        if self.session:
-            await self.session.aclose()
+        await self.aclose()
+    
+    async def open(self):
+        """Open the underlying connection pool if it is not already open."""
+        if self.session is None:
+            self.session = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self.transport,
+            )
+        if self.timesheet_queue is not None:
+            self.timesheet_queue.start(self)
+        return self
+    
+    async def aclose(self, drain_timeout: Optional[float] = None):
+        """
+        Close the connection pool.
+        
+        The timesheet queue's current flush and in-flight requests share the
+        ``drain_timeout`` budget.
+        
+        Args:
+            drain_timeout: Seconds to wait for in-flight requests to finish before
+                closing. ``None`` lets the queue finish its current flush and
+                closes without waiting for other requests.
+        """
+        if self.session is None:
+            return
+        
+        if self.timesheet_queue is not None:
+            started = time.monotonic()
+            await self.timesheet_queue.stop(timeout=drain_timeout)
+            if drain_timeout:
+                drain_timeout = max(0.0, drain_timeout - (time.monotonic() - started))
+        
+        if drain_timeout and self._in_flight:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Closing Leantime client with %d request(s) still in flight", self._in_flight)
+        
+        session, self.session = self.session, None
+        await session.aclose()
+    
+    @staticmethod
+    def _single_flight_key(method: str, endpoint: str, kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """Return the coalescing key for a request, or None if it must not be shared."""
+        if method.upper() != "GET" or set(kwargs) - {"params"}:
+            return None
+        
+        params = kwargs.get("params") or {}
+        try:
+            return ("GET", endpoint, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+        except AttributeError:
+            return None
     
     async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
         Make a request to the Leantime API.
         
+        Identical concurrent GETs (same endpoint and params) share a single
+        upstream request when single-flight is enabled; every caller receives
+        the same result or error. With a ``hedge_policy``, such GETs are
+        hedged against slow upstream workers.
+        
+        Args:
+            method: HTTP method (get, post, put, delete)
+            endpoint: API endpoint (without base URL)
+            **kwargs: Additional parameters to pass to httpx
+            
+        Returns:
+            API response data
+        """
+        key = self._single_flight_key(method, endpoint, kwargs)
+        send = self._send if self.hedge_policy is None or key is None else self._hedged_send
+        if key is None or not self.single_flight:
+            return await send(method, endpoint, **kwargs)
+        
+        task = self._pending_gets.get(key)
+        if task is None:
+            task = asyncio.ensure_future(send(method, endpoint, **kwargs))
+            self._pending_gets[key] = task
+            self.single_flight_stats["upstream"] += 1
+            task.add_done_callback(lambda t, key=key: self._finish_single_flight(key, t))
+        else:
+            self.single_flight_stats["collapsed"] += 1
+        
+        # Shield the shared request so one cancelled caller does not fail the others
+        return await asyncio.shield(task)
+    
+    async def _hedged_send(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send an idempotent GET, duplicating it if it is slower than the hedge delay.
+        
+        The first attempt to succeed wins and the other is cancelled. If both
+        fail, the error of the first one to fail is raised. Hedges are only
+        sent while the policy's budget allows.
+        """
+        policy = self.hedge_policy
+        delay = policy.delay()
+        primary = asyncio.ensure_future(self._timed_send(method, endpoint, **kwargs))
+        if delay is None:
+            return await primary
+        
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                if policy.try_hedge():
+                    attempts.append(asyncio.ensure_future(self._timed_send(method, endpoint, **kwargs)))
+                else:
+                    UPSTREAM_HEDGES_SKIPPED.inc(self.tenant)
+            
+            first_error = None
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for index, attempt in enumerate(attempts):
+                    if attempt not in done:
+                        continue
+                    if attempt.exception() is None:
+                        if len(attempts) > 1:
+                            policy.record_win(hedge=index == 1)
+                            UPSTREAM_HEDGES.inc(self.tenant, "hedge" if index == 1 else "primary")
+                        return attempt.result()
+                    first_error = first_error or attempt.exception()
+            
+            if len(attempts) > 1:
+                UPSTREAM_HEDGES.inc(self.tenant, "none")
+            raise first_error
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+    
+    async def _timed_send(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send a request and feed its latency to the hedge policy.
+        
+        Successful attempts record their latency. An attempt cancelled because
+        the other one won records the time it had taken so far, a lower bound
+        that keeps slow primaries in the window; failures are not recorded.
+        """
+        started = time.perf_counter()
+        try:
+            result = await self._send(method, endpoint, **kwargs)
+        except asyncio.CancelledError:
+            self.hedge_policy.observe(time.perf_counter() - started)
+            raise
+        self.hedge_policy.observe(time.perf_counter() - started)
+        return result
+    
+    def _finish_single_flight(self, key: tuple, task: asyncio.Task) -> None:
+        """Forget a finished shared request."""
+        if self._pending_gets.get(key) is task:
+            del self._pending_gets[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller was cancelled
+            task.exception()
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of upstream requests currently in flight."""
+        return self._in_flight
+    
+    async def stats(self) -> Dict[str, Any]:
+        """Return counters describing upstream request handling."""
+        return {
+            "in_flight": self._in_flight,
+            "single_flight": dict(self.single_flight_stats),
+            "retries": dict(self.retry_stats),
+            "circuit_breaker": {"host": self.circuit_breaker.host, **self.circuit_breaker.stats()},
+            "rate_limit": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+            "conditional": self.conditional_cache.stats() if self.conditional_cache is not None else None,
+            "rpc_batch": self.rpc_batcher.stats() if self.rpc_batcher is not None else None,
+            "timesheet_queue": await self.timesheet_queue.stats() if self.timesheet_queue is not None else None,
+            "hedging": self.hedge_policy.stats() if self.hedge_policy is not None else None,
+        }
+    
+    async def _send(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """
+        Send a request to the Leantime API, retrying transient failures.
+        
+        Every attempt passes through the host's circuit breaker. Retries follow
+        ``retry_policy``, honoring ``Retry-After`` on 429/503 responses. With a
+        ``conditional_cache``, GETs carry the validators of the last response
+        for the same endpoint and params, and a 304 returns its body.
+        
         Args:
             method: HTTP method (get, post, put, delete)
             endpoint: API endpoint (without base URL)
@@ -53,46 +421,400 @@ class LeantimeClient:
         if not self.session:
             raise RuntimeError("Client not initialized. Use with 'async with' context manager.")
             
-        # Add basic auth if using username/password
-        auth = None
-        if not self.api_key and self.username and self.password:
-            auth = (self.username, self.password)
-            
         url = f"{endpoint}"
-        response = await self.session.request(method, url, auth=auth, **kwargs)
+        conditional_key = conditional_entry = None
+        if self.conditional_cache is not None:
+            conditional_key = self._single_flight_key(method, endpoint, kwargs)
+            if conditional_key is not None:
+                conditional_entry = self.conditional_cache.get(conditional_key)
+                if conditional_entry is not None:
+                    kwargs["headers"] = conditional_entry.request_headers()
         
-        try:
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            # Handle API errors
-            error_detail = ""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(method)
+            trial = self.circuit_breaker.before_request()
+            self._request_started()
+            started = time.perf_counter()
             try:
-                error_detail = response.json()
-            except:
-                error_detail = response.text
+                response = await self.session.request(method, url, auth=self._auth(), **kwargs)
+            except httpx.TransportError as e:
+                self._observe(method, endpoint, "error", started)
+                self.circuit_breaker.record_failure()
+                if self.retry_policy is None or not self.retry_policy.should_retry(method, attempt, error=e):
+                    self._give_up(attempt)
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+            except BaseException:
+                # Cancelled, or failed without telling anything about upstream health
+                # (e.g. too many redirects): let the next request be the trial
+                if trial:
+                    self.circuit_breaker.release_trial()
+                raise
+            else:
+                self._observe(method, endpoint, response.status_code, started)
+                self._record_health(response)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.observe(method, response)
+                delay = None
+                if (response.status_code in RETRYABLE_STATUS_CODES and self.retry_policy is not None
+                        and self.retry_policy.should_retry(method, attempt, status_code=response.status_code)):
+                    delay = self.retry_policy.delay(attempt, response)
+                if delay is None:
+                    if response.status_code in RETRYABLE_STATUS_CODES:
+                        self._give_up(attempt)
+                    break
+            finally:
+                self._request_finished()
             
-            raise Exception(f"Leantime API error: {e.response.status_code} - {error_detail}")
-        except json.JSONDecodeError:
+            self.retry_stats["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+        
+        if conditional_entry is not None:
+            if response.status_code == 304:
+                self.conditional_cache.not_modified += 1
+                return conditional_entry.body
+            self.conditional_cache.modified += 1
+        
+        try:
+            response.raise_for_status()
+            data = json_codec.loads(response.content)
+        except httpx.HTTPStatusError:
+            raise self._api_error(response)
+        except json_codec.JSONDecodeError:
             # Handle non-JSON responses
             return {"text": response.text}
+        
+        if conditional_key is not None:
+            self.conditional_cache.set(
+                conditional_key, response.headers.get("ETag"), response.headers.get("Last-Modified"), data
+            )
+        return data
+    
+    async def _stream_list(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the items of a list endpoint as they arrive.
+        
+        The response body is parsed incrementally, so memory use stays flat
+        regardless of how many items the endpoint returns.
+        
+        Args:
+            endpoint: API endpoint (without base URL)
+            params: Optional query parameters
+            
+        Yields:
+            Each item of the JSON array returned by the endpoint
+        """
+        if not self.session:
+            raise RuntimeError("Client not initialized. Use with 'async with' context manager.")
+        
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire("GET")
+        trial = self.circuit_breaker.before_request()
+        self._request_started()
+        started = time.perf_counter()
+        observed = recorded = False
+        try:
+            async with self.session.stream("GET", endpoint, params=params, auth=self._auth()) as response:
+                # Streamed requests are timed until the response headers arrive
+                self._observe("GET", endpoint, response.status_code, started)
+                observed = True
+                self._record_health(response)
+                recorded = True
+                if self.rate_limiter is not None:
+                    self.rate_limiter.observe("GET", response)
+                if response.is_error:
+                    await response.aread()
+                    raise self._api_error(response)
+                
+                async for item in iter_json_array(response.aiter_text()):
+                    yield item
+        except httpx.TransportError:
+            if not observed:
+                self._observe("GET", endpoint, "error", started)
+            self.circuit_breaker.record_failure()
+            recorded = True
+            raise
+        finally:
+            if trial and not recorded:
+                # The stream was cancelled (or failed otherwise) before an outcome was known
+                self.circuit_breaker.release_trial()
+            self._request_finished()
+    
+    def _observe(self, method: str, endpoint: str, status: Union[int, str], started: float) -> None:
+        """Record the latency of one upstream attempt in the request histogram and Server-Timing."""
+        elapsed = time.perf_counter() - started
+        UPSTREAM_DURATION.observe(elapsed, self.tenant, method.upper(), endpoint_label(endpoint), str(status))
+        profiling.record("upstream", elapsed)
+    
+    def _record_health(self, response: httpx.Response) -> None:
+        """Feed a response into the circuit breaker; only 5xx counts as a failure."""
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+    
+    def _give_up(self, attempt: int) -> None:
+        """Count a request that failed after exhausting its retries."""
+        if attempt:
+            self.retry_stats["gave_up"] += 1
+    
+    async def _get_page(self,
+                        endpoint: str,
+                        params: Dict[str, Any],
+                        limit: int,
+                        cursor: Optional[str] = None,
+                        window: bool = True) -> Page:
+        """
+        Fetch a single page from a list endpoint.
+        
+        Offset/limit pagination is used by default. If Leantime answers with an
+        object carrying ``items``/``data`` and ``nextCursor``/``next_cursor``,
+        its cursor is passed back verbatim on the next call instead.
+        
+        Offset cursors record the ID of the list's first item. A later page
+        that starts with that item again comes from an endpoint that ignores
+        the page parameters and returned the whole list, as does a first page
+        with more than ``limit`` items. With ``window`` the requested slice of
+        such a list is returned (with a cursor if more items remain), so a page
+        never exceeds ``limit`` and never repeats earlier items; without it the
+        rest of the list is one final page.
+        
+        Args:
+            endpoint: API endpoint (without base URL)
+            params: Query parameters identifying the list
+            limit: Maximum number of items to request
+            cursor: Cursor returned by the previous page, or None for the first page
+            window: Slice lists returned in full by endpoints that ignore paging
+            
+        Returns:
+            The page of items and the cursor for the next page, if any
+            
+        Raises:
+            InvalidCursorError: If an offset cursor is malformed
+        """
+        page_params = dict(params)
+        page_params["limit"] = limit
+        first_id = None
+        if cursor is None or cursor.startswith(OFFSET_CURSOR_PREFIX):
+            offset, first_id = parse_offset_cursor(cursor) if cursor else (0, None)
+            page_params["offset"] = offset
+        else:
+            offset = None
+            page_params["cursor"] = cursor
+        
+        data = await self._request("GET", endpoint, params=page_params)
+        
+        if isinstance(data, dict):
+            items = data.get("items", data.get("data")) or []
+            next_cursor = data.get("nextCursor", data.get("next_cursor"))
+            return Page(items=items, next_cursor=str(next_cursor) if next_cursor else None)
+        
+        items = data or []
+        if offset is None:
+            return Page(items=items)
+        
+        head_id = items[0].get("id") if items and isinstance(items[0], dict) else None
+        if offset == 0:
+            first_id = str(head_id) if head_id is not None else None
+            unpaged = len(items) > limit
+        elif first_id is not None:
+            unpaged = head_id is not None and str(head_id) == first_id
+        else:
+            unpaged = len(items) > limit
+        
+        if unpaged:
+            if not window:
+                return Page(items=items[offset:])
+            items, more = items[offset:offset + limit], offset + limit < len(items)
+        else:
+            items, more = items[:limit], len(items) >= limit
+        return Page(items=items, next_cursor=offset_cursor(offset + limit, first_id) if more else None)
+    
+    async def _iter_pages(self,
+                          endpoint: str,
+                          params: Dict[str, Any],
+                          page_size: Optional[int] = None,
+                          cursor: Optional[str] = None) -> AsyncIterator[Page]:
+        """
+        Walk every page of a list endpoint, prefetching the next page.
+        
+        The request for page N+1 is issued as soon as page N arrives, so it
+        overlaps with the caller consuming page N. Walking stops at a page that
+        repeats the previous one, which an endpoint ignoring the page
+        parameters returns when its list happens to fill exactly one page.
+        """
+        limit = page_size or self.page_size
+        pending = asyncio.ensure_future(self._get_page(endpoint, params, limit, cursor, window=False))
+        previous = None
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if previous is not None and page.items and page.items == previous.items:
+                    return
+                if page.next_cursor is not None:
+                    pending = asyncio.ensure_future(
+                        self._get_page(endpoint, params, limit, page.next_cursor, window=False)
+                    )
+                previous = page
+                yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    async def _iter_items(self,
+                          endpoint: str,
+                          params: Dict[str, Any],
+                          page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every item of a paginated list endpoint."""
+        async for page in self._iter_pages(endpoint, params, page_size):
+            for item in page.items:
+                yield item
+    
+    @staticmethod
+    def _project_params(project_id: Optional[int]) -> Dict[str, Any]:
+        """Build query parameters for endpoints filtered by project."""
+        params = {}
+        if project_id:
+            params["projectId"] = project_id
+        return params
+    
+    @staticmethod
+    def _timesheet_params(user_id: Optional[int],
+                          project_id: Optional[int],
+                          task_id: Optional[int]) -> Dict[str, Any]:
+        """Build query parameters for timesheet endpoints."""
+        params = {}
+        if user_id:
+            params["userId"] = user_id
+        if project_id:
+            params["projectId"] = project_id
+        if task_id:
+            params["ticketId"] = task_id
+        return params
+    
+    def _auth(self) -> Optional[tuple]:
+        """Return basic auth credentials if using username/password."""
+        if not self.api_key and self.username and self.password:
+            return (self.username, self.password)
+        return None
+    
+    def _request_started(self) -> None:
+        """Mark an upstream request as in flight."""
+        self._in_flight += 1
+        self._idle.clear()
+        UPSTREAM_IN_FLIGHT.inc(self.tenant)
+    
+    def _request_finished(self) -> None:
+        """Mark an upstream request as finished."""
+        self._in_flight -= 1
+        UPSTREAM_IN_FLIGHT.dec(self.tenant)
+        if not self._in_flight:
+            self._idle.set()
+    
+    @staticmethod
+    def _api_error(response: httpx.Response) -> "LeantimeAPIError":
+        """Build an API error from an unsuccessful response."""
+        try:
+            error_detail = json_codec.loads(response.content)
+        except Exception:
+            error_detail = response.text
+        
+        return LeantimeAPIError(response.status_code, error_detail)
+    
+    async def _cached_get(self, key: tuple, endpoint: str, **kwargs) -> Any:
+        """
+        GET an endpoint through the read-through cache.
+        
+        Successful responses are cached with the entity's TTL and 404s are
+        cached negatively, so repeated lookups of a missing entity also skip
+        the upstream call.
+        """
+        if self.cache is None:
+            return await self._lookup(key, endpoint, **kwargs)
+        
+        cached = self.cache.get(key)
+        if isinstance(cached, NegativeEntry):
+            raise cached.error
+        if cached is not MISSING:
+            return cached
+        
+        version = self.cache.version
+        try:
+            result = await self._lookup(key, endpoint, **kwargs)
+        except LeantimeAPIError as e:
+            if e.status_code == 404 and self.cache.version == version:
+                self.cache.set_negative(key, e)
+            raise
+        
+        if self.cache.version == version:
+            self.cache.set(key, result)
+        return result
+    
+    async def _lookup(self, key: tuple, endpoint: str, **kwargs) -> Any:
+        """GET an entity, as a batched JSON-RPC call if batching is enabled and covers it."""
+        method = RPC_LOOKUP_METHODS.get(key[0]) if self.rpc_batcher is not None and len(key) == 2 else None
+        if method is None:
+            return await self._request("GET", endpoint, **kwargs)
+        return await self._rpc_call(method, {"id": key[1]})
+    
+    async def _rpc_call(self, method: str, params: Dict[str, Any]) -> Any:
+        """
+        Make a JSON-RPC call through the batcher.
+        
+        A JSON-RPC error is raised as a ``LeantimeAPIError``; a null or false
+        result (Leantime's answer for a missing entity) is raised as a 404.
+        """
+        response = await self.rpc_batcher.call(method, params)
+        if "error" in response:
+            error = response["error"]
+            code = error.get("code") if isinstance(error, dict) else None
+            raise LeantimeAPIError(RPC_ERROR_STATUS.get(code, 500), error)
+        
+        result = response.get("result")
+        if result is None or result is False:
+            raise LeantimeAPIError(404, {"error": "Not found"})
+        return result
+    
+    async def _send_rpc_batch(self, payload: List[Dict[str, Any]]) -> Any:
+        """POST a JSON-RPC batch and return the decoded response array."""
+        return await self._send("POST", RPC_ENDPOINT, json=payload)
+    
+    def _invalidate(self, *keys: tuple) -> None:
+        """Drop the given keys from the cache, if caching is enabled."""
+        if self.cache is not None:
+            self.cache.invalidate(*keys)
+    
+    def _invalidate_created(self, entity: str, result: Any) -> None:
+        """Drop any negative cache entry for a newly created entity."""
+        if isinstance(result, dict) and "id" in result:
+            self._invalidate((entity, result["id"]))
     
     # Projects
     async def get_projects(self) -> List[Dict[str, Any]]:
         """Get all projects."""
-        return await self._request("GET", "/api/projects")
+        return await self._cached_get(("projects",), "/api/projects")
     
     async def get_project(self, project_id: int) -> Dict[str, Any]:
         """Get a specific project by ID."""
-        return await self._request("GET", f"/api/projects/{project_id}")
+        return await self._cached_get(("project", project_id), f"/api/projects/{project_id}")
     
     async def create_project(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new project."""
-        return await self._request("POST", "/api/projects", json=project_data)
+        result = await self._request("POST", "/api/projects", json=project_data)
+        self._invalidate(("projects",))
+        self._invalidate_created("project", result)
+        return result
     
     async def update_project(self, project_id: int, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing project."""
-        return await self._request("PUT", f"/api/projects/{project_id}", json=project_data)
+        try:
+            return await self._request("PUT", f"/api/projects/{project_id}", json=project_data)
+        finally:
+            self._invalidate(("projects",), ("project", project_id))
     
     # Tasks
     async def get_tasks(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -105,47 +827,109 @@ class LeantimeClient:
         Returns:
             List of task objects
         """
-        endpoint = "/api/tickets"
-        params = {}
-        if project_id:
-            params["projectId"] = project_id
+        return await self._request("GET", "/api/tickets", params=self._project_params(project_id))
+    
+    async def get_tasks_page(self,
+                             project_id: Optional[int] = None,
+                             limit: Optional[int] = None,
+                             cursor: Optional[str] = None) -> Page:
+        """
+        Get a single page of tasks.
+        
+        Args:
+            project_id: Optional project ID to filter tasks
+            limit: Maximum number of tasks to return (defaults to the client page size)
+            cursor: Cursor from a previous page, or None to start at the beginning
             
-        return await self._request("GET", endpoint, params=params)
+        Returns:
+            The page of tasks and the cursor for the next page, if any
+        """
+        return await self._get_page("/api/tickets", self._project_params(project_id),
+                                    limit or self.page_size, cursor)
+    
+    def iter_tasks(self,
+                   project_id: Optional[int] = None,
+                   page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all tasks page by page, prefetching the next page.
+        
+        Args:
+            project_id: Optional project ID to filter tasks
+            page_size: Number of tasks per page (defaults to the client page size)
+            
+        Returns:
+            Async iterator of task objects
+        """
+        return self._iter_items("/api/tickets", self._project_params(project_id), page_size)
+    
+    def stream_tasks(self, project_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream tasks, optionally filtered by project, parsing them as they arrive.
+        
+        Args:
+            project_id: Optional project ID to filter tasks
+            
+        Returns:
+            Async iterator of task objects
+        """
+        return self._stream_list("/api/tickets", params=self._project_params(project_id))
     
     async def get_task(self, task_id: int) -> Dict[str, Any]:
         """Get a specific task by ID."""
-        return await self._request("GET", f"/api/tickets/{task_id}")
+        return await self._cached_get(("task", task_id), f"/api/tickets/{task_id}")
     
     async def create_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new task."""
-        return await self._request("POST", "/api/tickets", json=task_data)
+        result = await self._request("POST", "/api/tickets", json=task_data)
+        self._invalidate_created("task", result)
+        if self.task_mirror is not None:
+            await self.task_mirror.invalidate(project_id=task_data.get("projectId"))
+        return result
     
     async def update_task(self, task_id: int, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing task."""
-        return await self._request("PUT", f"/api/tickets/{task_id}", json=task_data)
+        try:
+            return await self._request("PUT", f"/api/tickets/{task_id}", json=task_data)
+        finally:
+            self._invalidate(("task", task_id))
+            if self.task_mirror is not None:
+                await self.task_mirror.invalidate(task_id=task_id, project_id=task_data.get("projectId"))
     
     async def delete_task(self, task_id: int) -> Dict[str, Any]:
         """Delete a task."""
-        return await self._request("DELETE", f"/api/tickets/{task_id}")
+        try:
+            result = await self._request("DELETE", f"/api/tickets/{task_id}")
+        except BaseException:
+            # The ticket may or may not be gone: re-sync its project rather than guess
+            if self.task_mirror is not None:
+                await self.task_mirror.invalidate(task_id=task_id)
+            raise
+        finally:
+            self._invalidate(("task", task_id))
+        
+        if self.task_mirror is not None:
+            await self.task_mirror.delete(task_id)
+        return result
     
     # Milestones
     async def get_milestones(self, project_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get milestones, optionally filtered by project."""
-        endpoint = "/api/milestones"
-        params = {}
-        if project_id:
-            params["projectId"] = project_id
-            
-        return await self._request("GET", endpoint, params=params)
+        return await self._request("GET", "/api/milestones", params=self._project_params(project_id))
+    
+    def iter_milestones(self,
+                        project_id: Optional[int] = None,
+                        page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all milestones page by page, prefetching the next page."""
+        return self._iter_items("/api/milestones", self._project_params(project_id), page_size)
     
     # Users
     async def get_users(self) -> List[Dict[str, Any]]:
         """Get all users."""
-        return await self._request("GET", "/api/users")
+        return await self._cached_get(("users",), "/api/users")
     
     async def get_user(self, user_id: int) -> Dict[str, Any]:
         """Get a specific user by ID."""
-        return await self._request("GET", f"/api/users/{user_id}")
+        return await self._cached_get(("user", user_id), f"/api/users/{user_id}")
     
     # Timesheets
     async def get_timesheets(self, 
@@ -153,17 +937,35 @@ class LeantimeClient:
                              project_id: Optional[int] = None,
                              task_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get timesheet entries, optionally filtered."""
-        endpoint = "/api/timesheets"
-        params = {}
-        if user_id:
-            params["userId"] = user_id
-        if project_id:
-            params["projectId"] = project_id
-        if task_id:
-            params["ticketId"] = task_id
-            
-        return await self._request("GET", endpoint, params=params)
+        return await self._request("GET", "/api/timesheets",
+                                   params=self._timesheet_params(user_id, project_id, task_id))
+    
+    async def get_timesheets_page(self,
+                                  user_id: Optional[int] = None,
+                                  project_id: Optional[int] = None,
+                                  task_id: Optional[int] = None,
+                                  limit: Optional[int] = None,
+                                  cursor: Optional[str] = None) -> Page:
+        """Get a single page of timesheet entries, optionally filtered."""
+        return await self._get_page("/api/timesheets", self._timesheet_params(user_id, project_id, task_id),
+                                    limit or self.page_size, cursor)
+    
+    def iter_timesheets(self,
+                        user_id: Optional[int] = None,
+                        project_id: Optional[int] = None,
+                        task_id: Optional[int] = None,
+                        page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all timesheet entries page by page, prefetching the next page."""
+        return self._iter_items("/api/timesheets", self._timesheet_params(user_id, project_id, task_id),
+                                page_size)
+    
+    def stream_timesheets(self,
+                          user_id: Optional[int] = None,
+                          project_id: Optional[int] = None,
+                          task_id: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream timesheet entries, optionally filtered, parsing them as they arrive."""
+        return self._stream_list("/api/timesheets", params=self._timesheet_params(user_id, project_id, task_id))
     
     async def create_timesheet(self, timesheet_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new timesheet entry."""
-        return await self._request("POST", "/api/timesheets", json=timesheet_data)
\ No newline at end of file
+        return await self._request("POST", "/api/timesheets", json=timesheet_data)
@@ -0,0 +1,244 @@
+import math
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for a labelled metric family."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text shown in the exposition
+            labelnames: Names of the labels, whose values are passed positionally
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(self.labelnames, values)]
+        if extra is not None:
+            pairs.append(f'{extra[0]}="{extra[1]}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> Iterable[str]:
+        """Yield the exposition lines of every labelled series."""
+        return ()
+
+    def render(self) -> List[str]:
+        """Return the HELP/TYPE header and samples of the metric."""
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the series identified by ``labels`` by ``amount``."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Return the current value of a series."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._values.items():
+            yield f"{self.name}{self._labels(labels)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or is read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], float]] = None):
+        """
+        Initialize the gauge.
+
+        Args:
+            name: Metric name
+            documentation: Help text shown in the exposition
+            labelnames: Names of the labels
+            function: Callback returning the unlabelled value at scrape time
+        """
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.function = function
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the series identified by ``labels``."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Decrease the series identified by ``labels``."""
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the series identified by ``labels``."""
+        self._values[labels] = value
+
+    def value(self, *labels: str) -> float:
+        """Return the current value of a series."""
+        if self.function is not None and not labels:
+            return self.function()
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        if self.function is not None:
+            yield f"{self.name} {_format_value(self.function())}"
+            return
+        for labels, value in self._values.items():
+            yield f"{self.name}{self._labels(labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(self,
+                 name: str,
+                 documentation: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text shown in the exposition
+            labelnames: Names of the labels
+            buckets: Upper bounds of the buckets (``+Inf`` is added automatically)
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket (non-cumulative, last is +Inf), sum]
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record ``value`` in the series identified by ``labels``."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        """Return the number of observations in a series."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{self._labels(labels, ('le', _format_value(bound)))} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labels)} {_format_value(total[0])}"
+            yield f"{self.name}_count{self._labels(labels)} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics rendered together by the /metrics endpoint."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add ``metric`` to the registry and return it."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every registered metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TOOL_REQUESTS = REGISTRY.register(Counter(
+    "mcp_tool_requests_total", "Tool executions by tenant, tool and outcome", ("tenant", "tool", "status")
+))
+TOOL_ERRORS = REGISTRY.register(Counter(
+    "mcp_tool_errors_total", "Failed tool executions by tenant, tool and exception type", ("tenant", "tool", "error")
+))
+TOOL_DURATION = REGISTRY.register(Histogram(
+    "mcp_tool_duration_seconds", "Tool execution time including validation and upstream calls", ("tenant", "tool")
+))
+TOOL_IN_FLIGHT = REGISTRY.register(Gauge(
+    "mcp_tool_in_flight", "Tool executions currently running", ("tenant", "tool")
+))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "mcp_batch_size", "Number of items per /batch request", buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+))
+UPSTREAM_DURATION = REGISTRY.register(Histogram(
+    "leantime_request_duration_seconds",
+    "Leantime API request latency by tenant, method, endpoint and status",
+    ("tenant", "method", "endpoint", "status")
+))
+UPSTREAM_HEDGES = REGISTRY.register(Counter(
+    "leantime_hedged_requests_total",
+    "GETs for which a hedge request was sent, by tenant and the attempt that answered first",
+    ("tenant", "winner")
+))
+UPSTREAM_HEDGES_SKIPPED = REGISTRY.register(Counter(
+    "leantime_hedges_skipped_total", "Hedges not sent because the hedging budget was exhausted", ("tenant",)
+))
+UPSTREAM_IN_FLIGHT = REGISTRY.register(Gauge(
+    "leantime_requests_in_flight", "Leantime API requests currently in flight", ("tenant",)
+))
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@lru_cache(maxsize=1024)
+def endpoint_label(endpoint: str) -> str:
+    """Collapse numeric path segments (``/api/tickets/42`` -> ``/api/tickets/{id}``) to bound label cardinality."""
+    return _ID_SEGMENT.sub("/{id}", endpoint)
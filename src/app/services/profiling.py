@@ -0,0 +1,155 @@
+import cProfile
+import io
+import pstats
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Server-Timing metric names and descriptions, in header order
+PHASES = {
+    "input": "Input validation",
+    "upstream": "Leantime wait",
+    "output": "Output validation",
+    "serialize": "Response serialization",
+}
+
+
+class RequestTimings:
+    """Durations of the phases of one request, summed over all tools it runs."""
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to phase ``name``."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """
+        Format the phases as a ``Server-Timing`` header value (durations in ms).
+
+        Phases that ran concurrently (e.g. upstream calls of a bulk tool or a
+        batch) are summed, so they can exceed the ``total`` wall time.
+        """
+        entries = [
+            f'{name};desc="{PHASES.get(name, name)}";dur={self.phases[name] * 1000:.3f}'
+            for name in [*PHASES, *(name for name in self.phases if name not in PHASES)]
+            if name in self.phases
+        ]
+        entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.3f}')
+        return ", ".join(entries)
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_timings() -> RequestTimings:
+    """Start collecting phase timings for the current request (and tasks it spawns)."""
+    timings = RequestTimings()
+    _timings.set(timings)
+    return timings
+
+
+def record(name: str, seconds: float) -> None:
+    """Add ``seconds`` to a phase of the current request, if timings are being collected."""
+    timings = _timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as phase ``name`` of the current request."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+class ProfileStore:
+    """Bounded in-memory store of cProfile captures, oldest evicted first."""
+
+    def __init__(self, max_entries: int = 20):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum number of captures kept
+        """
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def add(self, label: str, profile: cProfile.Profile, duration: float, concurrent: int = 0) -> str:
+        """
+        Store a finished capture and return its ID.
+
+        Args:
+            label: Label of the profiled call
+            profile: Finished cProfile capture
+            duration: Wall-clock duration of the capture in seconds
+            concurrent: Number of other requests that ran during the capture
+
+        Returns:
+            The ID of the stored capture
+        """
+        profile_id = uuid.uuid4().hex[:12]
+        self._profiles[profile_id] = {
+            "id": profile_id,
+            "label": label,
+            "created_at": time.time(),
+            "duration_ms": round(duration * 1000, 3),
+            "concurrent_requests": concurrent,
+            "stats": pstats.Stats(profile),
+        }
+        while len(self._profiles) > self.max_entries:
+            self._profiles.popitem(last=False)
+        return profile_id
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Return metadata of the stored captures, newest first."""
+        return [
+            {key: value for key, value in entry.items() if key != "stats"}
+            for entry in reversed(self._profiles.values())
+        ]
+
+    def report(self, profile_id: str, sort: str = "cumulative", limit: int = 50) -> Optional[str]:
+        """
+        Render a capture as a pstats text report.
+
+        The report starts with a note on what the capture covers: cProfile
+        observes the whole event loop thread, and upstream calls shared by
+        several requests are only charged to the request that issued them.
+
+        Args:
+            profile_id: ID returned by ``add``
+            sort: pstats sort key (e.g. ``cumulative``, ``tottime``)
+            limit: Maximum number of functions listed
+
+        Returns:
+            The report, or None if the capture does not exist (anymore)
+        """
+        entry = self._profiles.get(profile_id)
+        if entry is None:
+            return None
+        output = io.StringIO()
+        output.write(
+            f"Captured while {entry['concurrent_requests']} other request(s) ran on the event loop; "
+            "their work is included below.\n"
+            "Upstream calls coalesced with or batched alongside other requests are charged to "
+            "the request that sent them.\n\n"
+        )
+        stats = entry["stats"]
+        stats.stream = output
+        stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
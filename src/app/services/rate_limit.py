@@ -0,0 +1,195 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from src.app.services.resilience import parse_retry_after
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket that queues callers until a token is available.
+
+    The refill rate follows an AIMD scheme: it is halved on every 429 and
+    creeps back up by ``increase`` tokens/s on every successful response,
+    never exceeding the configured ``max_rate``.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 burst: float,
+                 min_rate: float = 0.5,
+                 increase: Optional[float] = None,
+                 max_block: float = 30.0,
+                 recheck_interval: float = 0.05,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Maximum sustained rate in requests per second
+            burst: Bucket capacity, i.e. how many requests may be sent back to back
+            min_rate: Lower bound the rate never drops below after 429s
+            increase: Rate added per successful response (defaults to 5% of ``rate``)
+            max_block: Longest pause ``block_for`` applies, however long upstream asks for
+            recheck_interval: Longest a waiting caller sleeps before recomputing its wait
+            clock: Monotonic clock (overridable for tests)
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.min_rate = min(min_rate, rate)
+        self.increase = increase if increase is not None else rate * 0.05
+        self.max_block = max_block
+        self.recheck_interval = recheck_interval
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated_at = clock()
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Wait (in FIFO order) until a token is available, then take it.
+        
+        The wait is slept in slices of at most ``recheck_interval`` and
+        recomputed after each, so a pause or rate change made meanwhile applies
+        to callers that are already waiting. ``waited_seconds`` counts the
+        time actually slept.
+        """
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = self.clock()
+                    self._refill(now)
+                    wait = max(0.0, self.blocked_until - now)
+                    # Tolerate rounding left over from refilling in slices
+                    if not wait and self.tokens >= 1 - 1e-9:
+                        self.tokens -= 1
+                        return
+                    wait = max(wait, (1 - self.tokens) / self.rate)
+                    await asyncio.sleep(min(wait, self.recheck_interval))
+                    self.waited_seconds += self.clock() - now
+        finally:
+            self.waiting -= 1
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429, pausing the bucket for ``retry_after`` seconds if given."""
+        now = self.clock()
+        self._refill(now)
+        self.throttled += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        if retry_after:
+            self.block_for(retry_after)
+
+    def on_success(self) -> None:
+        """Recover rate after a response that was not throttled."""
+        if self.rate < self.max_rate:
+            self._refill(self.clock())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def block_for(self, seconds: float) -> None:
+        """
+        Hold all callers for ``seconds`` (e.g. until a rate-limit window resets).
+        
+        The pause is capped at ``max_block`` so a bogus or very long reset
+        cannot stall every caller of the bucket indefinitely.
+        """
+        seconds = min(seconds, self.max_block)
+        self.blocked_until = max(self.blocked_until, self.clock() + seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the bucket's current rate and counters."""
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "tokens": round(min(self.burst, self.tokens), 3),
+            "waiting": self.waiting,
+            "throttled": self.throttled,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class RateLimiter:
+    """Client-side rate limiter with separate read and write budgets."""
+
+    def __init__(self,
+                 read_rate: float,
+                 write_rate: float,
+                 read_burst: Optional[float] = None,
+                 write_burst: Optional[float] = None,
+                 max_block: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter.
+
+        Args:
+            read_rate: Requests per second for GET/HEAD/OPTIONS
+            write_rate: Requests per second for all other methods
+            read_burst: Read bucket capacity (defaults to one second of ``read_rate``)
+            write_burst: Write bucket capacity (defaults to one second of ``write_rate``)
+            max_block: Longest pause a ``Retry-After`` or reset header may impose
+            clock: Monotonic clock (overridable for tests)
+        """
+        self.read = TokenBucket(read_rate, read_burst or read_rate, max_block=max_block, clock=clock)
+        self.write = TokenBucket(write_rate, write_burst or write_rate, max_block=max_block, clock=clock)
+
+    def bucket(self, method: str) -> TokenBucket:
+        """Return the bucket that budgets ``method``."""
+        return self.read if method.upper() in READ_METHODS else self.write
+
+    async def acquire(self, method: str) -> None:
+        """Wait for a token from the bucket that budgets ``method``."""
+        await self.bucket(method).acquire()
+
+    def observe(self, method: str, response: httpx.Response) -> None:
+        """
+        Adapt the budget of ``method`` from an upstream response.
+
+        429s halve the rate and honor ``Retry-After``. A ``RateLimit-Remaining``
+        / ``X-RateLimit-Remaining`` of zero pauses the bucket until the reset
+        time from the matching ``*-Reset`` header.
+        """
+        bucket = self.bucket(method)
+        headers = response.headers
+
+        if response.status_code == 429:
+            bucket.on_throttled(parse_retry_after(headers.get("Retry-After")))
+            return
+
+        bucket.on_success()
+        remaining = headers.get("RateLimit-Remaining", headers.get("X-RateLimit-Remaining"))
+        if remaining is not None and remaining.strip() == "0":
+            reset = parse_reset(headers.get("RateLimit-Reset", headers.get("X-RateLimit-Reset")))
+            if reset:
+                bucket.block_for(reset)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return stats for both budgets."""
+        return {"read": self.read.stats(), "write": self.write.stats()}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit reset header given as delta seconds or a Unix timestamp."""
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    # Values this large are absolute epoch timestamps rather than deltas
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
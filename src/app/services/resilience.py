@@ -0,0 +1,286 @@
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, Optional
+
+import httpx
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the circuit breaker is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Leantime circuit breaker open for {host}; retry in {retry_in:.1f}s")
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient upstream failures."""
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 base_delay: float = 0.2,
+                 max_delay: float = 5.0,
+                 max_retry_after: float = 30.0):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_retries: Maximum number of retries after the first attempt
+            base_delay: Backoff delay before the first retry, doubled on every retry
+            max_delay: Upper bound for a computed backoff delay
+            max_retry_after: Longest ``Retry-After`` the client will wait; longer
+                values are returned to the caller instead of retried
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def should_retry(self,
+                     method: str,
+                     attempt: int,
+                     status_code: Optional[int] = None,
+                     error: Optional[Exception] = None) -> bool:
+        """
+        Return whether a failed attempt may be retried.
+
+        Idempotent methods are retried on 429/5xx responses and transport
+        errors. Other methods are only retried when the request provably did
+        not reach Leantime: connection failures and 429 responses.
+        """
+        if attempt >= self.max_retries:
+            return False
+
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if error is not None:
+            return idempotent or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+        if status_code == 429:
+            return True
+        return idempotent and status_code in RETRYABLE_STATUS_CODES
+
+    def backoff(self, attempt: int) -> float:
+        """Return a full-jitter backoff delay for the given retry attempt (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """
+        Return how long to wait before the next attempt.
+
+        ``Retry-After`` takes precedence over the computed backoff. Returns
+        None if the server asks for a longer wait than ``max_retry_after``.
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is None:
+            return self.backoff(attempt)
+        if retry_after > self.max_retry_after:
+            return None
+        return retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects requests for ``recovery_timeout`` seconds. It then lets a single
+    trial request through (half-open); success closes it, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self,
+                 host: str,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            host: Upstream host the breaker protects
+            failure_threshold: Consecutive failures that trip the breaker (0 disables it)
+            recovery_timeout: Seconds the breaker stays open before a trial request
+            clock: Monotonic clock (overridable for tests)
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_request(self) -> bool:
+        """
+        Raise ``CircuitOpenError`` if the request must not be sent.
+
+        Returns:
+            True if the request is the half-open trial request
+        """
+        if self.failure_threshold <= 0 or self.state == self.CLOSED:
+            return False
+
+        if self.state == self.OPEN:
+            remaining = self.opened_at + self.recovery_timeout - self.clock()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, remaining)
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        # Half-open: allow exactly one trial request at a time
+        if self._trial_in_flight:
+            self.rejected += 1
+            raise CircuitOpenError(self.host, self.recovery_timeout)
+        self._trial_in_flight = True
+        return True
+
+    def release_trial(self) -> None:
+        """Allow a new trial request if the current one ended without an outcome (e.g. was cancelled)."""
+        if self.state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy upstream."""
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Record a request that failed because the upstream is unhealthy."""
+        if self.failure_threshold <= 0:
+            return
+
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class HedgePolicy:
+    """
+    Adaptive delay and budget for hedged (duplicated) idempotent GETs.
+
+    The hedge delay tracks a percentile of recent upstream latencies, clamped
+    to ``[min_delay, max_delay]``. Every eligible request earns ``budget``
+    credits (capped at ``max_credits``) and every hedge spends one, so in the
+    long run at most a ``budget`` fraction of requests is duplicated.
+    """
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 budget: float = 0.05,
+                 min_delay: float = 0.005,
+                 max_delay: float = 1.0,
+                 window: int = 1000,
+                 min_samples: int = 50,
+                 max_credits: float = 10.0):
+        """
+        Initialize the hedge policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            budget: Maximum fraction of requests that may be hedged
+            min_delay: Lower bound for the hedge delay in seconds
+            max_delay: Upper bound for the hedge delay in seconds
+            window: Number of recent latencies the percentile is computed over
+            min_samples: Latencies required before hedging starts
+            max_credits: Maximum number of hedges that can be sent in a burst
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.max_credits = max_credits
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._threshold: Optional[float] = None
+        self._stale = 0
+        self._credits = 0.0
+        self.hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "skipped": 0}
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of a completed attempt."""
+        self._latencies.append(seconds)
+        self._stale += 1
+
+    def delay(self) -> Optional[float]:
+        """
+        Start tracking an eligible request and return its hedge delay.
+
+        Returns:
+            Seconds to wait before hedging, or None while too few latencies are known
+        """
+        self.hedge_stats["requests"] += 1
+        self._credits = min(self.max_credits, self._credits + self.budget)
+        if len(self._latencies) < self.min_samples:
+            return None
+        # Sorting the window is cheap but not free, so refresh the threshold periodically
+        if self._threshold is None or self._stale >= 16:
+            ordered = sorted(self._latencies)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            self._threshold = min(self.max_delay, max(self.min_delay, ordered[index]))
+            self._stale = 0
+        return self._threshold
+
+    def try_hedge(self) -> bool:
+        """Spend budget for a hedge; return False (and count a skip) if the budget is exhausted."""
+        if self._credits < 1.0:
+            self.hedge_stats["skipped"] += 1
+            return False
+        self._credits -= 1.0
+        self.hedge_stats["hedged"] += 1
+        return True
+
+    def record_win(self, hedge: bool) -> None:
+        """Record which attempt of a hedged request answered first."""
+        if hedge:
+            self.hedge_stats["hedge_wins"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters, rates and the current delay."""
+        requests, hedged = self.hedge_stats["requests"], self.hedge_stats["hedged"]
+        return {
+            **self.hedge_stats,
+            "hedge_rate": round(hedged / requests, 4) if requests else 0.0,
+            "win_rate": round(self.hedge_stats["hedge_wins"] / hedged, 4) if hedged else 0.0,
+            "delay_ms": round(self._threshold * 1000, 3) if self._threshold is not None else None,
+        }
+
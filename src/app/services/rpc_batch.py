@@ -0,0 +1,116 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Sends a JSON-RPC batch (list of request objects) and returns the list of response objects
+BatchSender = Callable[[List[Dict[str, Any]]], Awaitable[Any]]
+
+
+class RPCBatcher:
+    """
+    Collects JSON-RPC calls issued within a short window into one batch request.
+
+    The first call of a batch starts a ``flush_delay`` timer; every call
+    issued before it fires joins the same batch, which is sent as soon as the
+    timer fires or ``max_batch_size`` calls are queued. Each caller receives
+    the response object carrying its own ``id``. Identical calls queued for
+    the same batch are sent once and share the response.
+    """
+
+    def __init__(self, send: BatchSender, max_batch_size: int = 20, flush_delay: float = 0.002):
+        """
+        Initialize the batcher.
+
+        Args:
+            send: Coroutine function posting a batch and returning the decoded response array
+            max_batch_size: Maximum number of calls per batch
+            flush_delay: Seconds to wait for more calls after the first call of a batch
+        """
+        self.send = send
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_delay = flush_delay
+        self._queue: Dict[Hashable, Tuple[str, Dict[str, Any], asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._dispatching = set()
+        self.batch_stats = {"batches": 0, "calls": 0, "collapsed": 0}
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a call and wait for its JSON-RPC response object.
+
+        Returns:
+            The response object (with either ``result`` or ``error``)
+
+        Raises:
+            Exception: Whatever ``send`` raised for the whole batch
+        """
+        key = (method, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+        queued = self._queue.get(key)
+        if queued is not None:
+            self.batch_stats["collapsed"] += 1
+            future = queued[2]
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            # Mark the exception as retrieved even if every caller was cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._queue[key] = (method, params, future)
+            self.batch_stats["calls"] += 1
+            if len(self._queue) >= self.max_batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.flush_delay, self.flush)
+
+        # Shield the shared future so one cancelled caller does not fail the others
+        return await asyncio.shield(future)
+
+    def flush(self) -> None:
+        """Send every queued call now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._queue:
+            return
+
+        calls = list(self._queue.values())
+        self._queue = {}
+        task = asyncio.ensure_future(self._dispatch(calls))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, calls: List[Tuple[str, Dict[str, Any], asyncio.Future]]) -> None:
+        """Send one batch and resolve the future of every call in it."""
+        self.batch_stats["batches"] += 1
+        payload = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            for request_id, (method, params, _) in enumerate(calls)
+        ]
+        try:
+            responses = await self.send(payload)
+        except BaseException as e:
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+
+        by_id = {}
+        if isinstance(responses, list):
+            by_id = {response.get("id"): response for response in responses if isinstance(response, dict)}
+        for request_id, (method, _, future) in enumerate(calls):
+            if future.done():
+                continue
+            response = by_id.get(request_id)
+            if response is None:
+                response = {"id": request_id, "error": {"code": -32603, "message": f"No response for '{method}'"}}
+            future.set_result(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batching counters."""
+        batches = self.batch_stats["batches"]
+        return {
+            **self.batch_stats,
+            "max_batch_size": self.max_batch_size,
+            "flush_delay": self.flush_delay,
+            "mean_batch_size": round(self.batch_stats["calls"] / batches, 2) if batches else 0.0,
+        }
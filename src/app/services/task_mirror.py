@@ -0,0 +1,327 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
+
+from src.app.services import json_codec
+from src.app.services.leantime_client import Page, offset_cursor, parse_offset_cursor
+
+if TYPE_CHECKING:
+    from src.app.services.leantime_client import LeantimeClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    projectId INTEGER,
+    status TEXT,
+    priority TEXT,
+    assignedTo INTEGER,
+    dueDate TEXT,
+    -- YYYY-MM-DD part of dueDate, so date range filters can use an index
+    dueDay TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_project ON tasks (projectId);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (projectId, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (projectId, priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_assigned ON tasks (assignedTo);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_day ON tasks (dueDay);
+
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id INTEGER NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags (tag);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+# Bumped whenever _SCHEMA changes; an older mirror is dropped and re-synced
+_SCHEMA_VERSION = 2
+
+_DROP_SCHEMA = """
+DROP TABLE IF EXISTS task_tags;
+DROP TABLE IF EXISTS tasks;
+DROP TABLE IF EXISTS sync_state;
+"""
+
+_ALL_SCOPE = "all"
+
+
+def _scope(project_id: Optional[int]) -> str:
+    return f"project:{project_id}" if project_id else _ALL_SCOPE
+
+
+def _row_hash(task: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(task, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class TaskMirror:
+    """
+    Local SQLite mirror of Leantime tickets for fast filtered queries.
+
+    Each project (or the full ticket list) is synced from
+    ``LeantimeClient.get_tasks`` when its copy is older than ``max_age``.
+    Syncs are incremental: only changed rows are rewritten and tickets that
+    disappeared upstream are removed.
+    """
+
+    def __init__(self,
+                 path: str = ":memory:",
+                 max_age: float = 60.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the mirror.
+
+        Args:
+            path: SQLite database file (``:memory:`` for a process-local mirror)
+            max_age: Seconds before a synced project is considered stale
+            clock: Wall clock used to record sync times (overridable for tests)
+        """
+        self.path = path
+        self.max_age = max_age
+        self.clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            # The mirror is only a cache of Leantime, so rebuild it instead of migrating
+            self._conn.executescript(_DROP_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run a blocking database call in a worker thread."""
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn: Callable, *args) -> Any:
+        with self._db_lock:
+            return fn(*args)
+
+    # Sync state
+    def _synced_at(self, scope: str) -> Optional[float]:
+        row = self._conn.execute("SELECT synced_at FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, project_id: Optional[int] = None) -> bool:
+        """Return whether the mirror holds a copy of the project newer than ``max_age``."""
+        now = self.clock()
+        with self._db_lock:
+            for scope in {_scope(project_id), _ALL_SCOPE}:
+                synced_at = self._synced_at(scope)
+                if synced_at is not None and now - synced_at < self.max_age:
+                    return True
+        return False
+
+    async def sync(self,
+                   client: "LeantimeClient",
+                   project_id: Optional[int] = None,
+                   if_stale: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Sync tickets for a project (or all tickets) from Leantime.
+
+        Args:
+            client: Leantime client used to fetch tickets
+            project_id: Project to sync, or None for every ticket
+            if_stale: Skip the sync if the project is fresh once the sync lock
+                is held, e.g. because a concurrent query just synced it
+
+        Returns:
+            Counts of upserted, deleted and unchanged tickets, or None if skipped
+        """
+        scope = _scope(project_id)
+        lock = self._sync_locks.setdefault(scope, asyncio.Lock())
+        async with lock:
+            if if_stale and self.is_fresh(project_id):
+                return None
+            tasks = await client.get_tasks(project_id)
+            return await self._run(self._apply_sync, scope, project_id, tasks or [])
+
+    def _apply_sync(self, scope: str, project_id: Optional[int], tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+        if project_id:
+            existing = dict(self._conn.execute("SELECT id, hash FROM tasks WHERE projectId = ?", (project_id,)))
+        else:
+            existing = dict(self._conn.execute("SELECT id, hash FROM tasks"))
+
+        changed = []
+        seen = set()
+        for task in tasks:
+            task_id = task.get("id")
+            if task_id is None:
+                continue
+            seen.add(task_id)
+            digest = _row_hash(task)
+            if existing.get(task_id) != digest:
+                changed.append((task, digest))
+
+        removed = [task_id for task_id in existing if task_id not in seen]
+
+        with self._conn:
+            self._upsert_rows(changed)
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in removed])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (scope, synced_at) VALUES (?, ?)",
+                (scope, self.clock())
+            )
+
+        return {
+            "upserted": len(changed),
+            "deleted": len(removed),
+            "unchanged": len(seen) - len(changed),
+        }
+
+    def _upsert_rows(self, rows: Iterable) -> None:
+        rows = list(rows)
+        self._conn.executemany("DELETE FROM task_tags WHERE task_id = ?", [(task["id"],) for task, _ in rows])
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO tasks (id, projectId, status, priority, assignedTo, dueDate, dueDay, hash, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    task["id"],
+                    task.get("projectId"),
+                    task.get("status"),
+                    task.get("priority"),
+                    task.get("assignedTo"),
+                    task.get("dueDate"),
+                    str(task["dueDate"])[:10] if task.get("dueDate") else None,
+                    digest,
+                    json_codec.dumps(task, default=str),
+                )
+                for task, digest in rows
+            ]
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO task_tags (task_id, tag) VALUES (?, ?)",
+            [(task["id"], tag) for task, _ in rows for tag in (task.get("tags") or [])]
+        )
+
+    # Write invalidation
+    async def delete(self, task_id: int) -> None:
+        """Remove a single ticket after it was deleted upstream."""
+        await self._run(self._delete_one, task_id)
+
+    def _delete_one(self, task_id: int) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    async def invalidate(self, task_id: Optional[int] = None, project_id: Optional[int] = None) -> None:
+        """
+        Mark the projects affected by a write as stale.
+
+        The ticket's own project (if it is mirrored) and ``project_id`` are
+        re-synced from Leantime on their next query.
+
+        Args:
+            task_id: ID of a ticket that was created or updated
+            project_id: ID of a project the write touched
+        """
+        await self._run(self._invalidate, task_id, project_id)
+
+    def _invalidate(self, task_id: Optional[int], project_id: Optional[int]) -> None:
+        scopes = {_ALL_SCOPE}
+        if project_id:
+            scopes.add(_scope(project_id))
+        if task_id is not None:
+            row = self._conn.execute("SELECT projectId FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row and row[0]:
+                scopes.add(_scope(row[0]))
+        with self._conn:
+            self._conn.executemany("DELETE FROM sync_state WHERE scope = ?", [(scope,) for scope in scopes])
+
+    # Queries
+    async def query(self,
+                    client: "LeantimeClient",
+                    project_id: Optional[int] = None,
+                    status: Optional[List[str]] = None,
+                    priority: Optional[List[str]] = None,
+                    assigned_to: Optional[int] = None,
+                    tag: Optional[str] = None,
+                    due_after: Optional[date] = None,
+                    due_before: Optional[date] = None,
+                    limit: Optional[int] = None,
+                    cursor: Optional[str] = None,
+                    refresh: bool = False) -> Page:
+        """
+        Answer a filtered task query from the mirror, syncing first if stale.
+
+        Args:
+            client: Leantime client used to sync stale data
+            project_id: Optional project ID to filter tasks
+            status: Only include tasks with one of these statuses
+            priority: Only include tasks with one of these priorities
+            assigned_to: Only include tasks assigned to this user ID
+            tag: Only include tasks carrying this tag
+            due_after: Only include tasks due on or after this date (YYYY-MM-DD)
+            due_before: Only include tasks due on or before this date (YYYY-MM-DD)
+            limit: Maximum number of tasks to return
+            cursor: Cursor from a previous page
+            refresh: Force a sync from Leantime before answering
+
+        Returns:
+            The page of matching tasks and the cursor for the next page, if any
+        """
+        if refresh or not self.is_fresh(project_id):
+            await self.sync(client, project_id, if_stale=not refresh)
+
+        clauses = []
+        params: List[Any] = []
+        if project_id:
+            clauses.append("projectId = ?")
+            params.append(project_id)
+        if status:
+            clauses.append(f"status IN ({', '.join('?' for _ in status)})")
+            params.extend(status)
+        if priority:
+            clauses.append(f"priority IN ({', '.join('?' for _ in priority)})")
+            params.extend(priority)
+        if assigned_to is not None:
+            clauses.append("assignedTo = ?")
+            params.append(assigned_to)
+        if tag:
+            clauses.append("id IN (SELECT task_id FROM task_tags WHERE tag = ?)")
+            params.append(tag)
+        if due_after:
+            clauses.append("dueDay >= ?")
+            params.append(str(due_after))
+        if due_before:
+            clauses.append("dueDay <= ?")
+            params.append(str(due_before))
+
+        sql = "SELECT data FROM tasks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+
+        offset = parse_offset_cursor(cursor)[0] if cursor else 0
+        if limit:
+            # Fetch one extra row to know whether another page exists
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit + 1, offset])
+        elif offset:
+            # Without a limit, a cursor returns every remaining row
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(offset)
+
+        rows = await self._run(lambda: self._conn.execute(sql, params).fetchall())
+        items = [json_codec.loads(row[0]) for row in rows]
+
+        if limit and len(items) > limit:
+            return Page(items=items[:limit], next_cursor=offset_cursor(offset + limit))
+        return Page(items=items)
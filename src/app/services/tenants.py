@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.app.services.leantime_client import LeantimeClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """A Leantime instance and the credentials used to access it."""
+    name: str
+    url: str
+    api_key: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    # Bearer token MCP clients present to select (and authorize) this tenant
+    token: Optional[str] = None
+    # Connection limit of this tenant's client (None uses the global setting)
+    max_connections: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str]:
+        """
+        Pool key: every tenant gets its own client.
+
+        Clients carry per-tenant state (metrics label, mirror and journal files,
+        connection limit), so tenants are never merged, even when they share
+        an instance and credentials.
+        """
+        return (self.name,)
+
+
+def load_tenants(spec: str) -> Dict[str, Tenant]:
+    """
+    Parse tenant definitions.
+
+    Args:
+        spec: A JSON object (or the path of a file containing one) mapping
+            tenant names to ``url``, ``api_key``/``username``/``password``,
+            and optionally ``token`` and ``max_connections``
+
+    Returns:
+        Tenants by name
+
+    Raises:
+        ValueError: If a definition is invalid, uses the reserved default
+            tenant name, or two tenants share a token
+    """
+    if not spec.strip():
+        return {}
+    if not spec.lstrip().startswith("{"):
+        with open(spec) as f:
+            spec = f.read()
+
+    tenants = {}
+    tokens = set()
+    for name, options in json.loads(spec).items():
+        if name == DEFAULT_TENANT:
+            raise ValueError(f"Tenant name '{DEFAULT_TENANT}' is reserved for the LEANTIME_URL instance")
+        if not isinstance(options, dict) or not options.get("url"):
+            raise ValueError(f"Tenant '{name}' must define a 'url'")
+        unknown = set(options) - {"url", "api_key", "username", "password", "token", "max_connections"}
+        if unknown:
+            raise ValueError(f"Tenant '{name}' has unknown options: {', '.join(sorted(unknown))}")
+        tenant = Tenant(name=name, **options)
+        if tenant.token:
+            if tenant.token in tokens:
+                raise ValueError(f"Tenant '{name}' reuses the token of another tenant")
+            tokens.add(tenant.token)
+        tenants[name] = tenant
+    return tenants
+
+
+class ClientPool:
+    """
+    Long-lived ``LeantimeClient`` instances, one per tenant.
+
+    Clients are opened on first use. When more than ``max_clients`` are open,
+    the least recently used idle ones (no leases and no requests in flight)
+    are closed. Pinned clients are never evicted.
+    """
+
+    def __init__(self,
+                 factory: Callable[[Tenant], LeantimeClient],
+                 max_clients: int = 32,
+                 close: Optional[Callable[[LeantimeClient], Awaitable[None]]] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Builds an unopened client for a tenant
+            max_clients: Maximum number of open clients before idle ones are evicted
+            close: Coroutine function closing an evicted client (defaults to ``aclose``)
+        """
+        self.factory = factory
+        self.max_clients = max_clients
+        self.close = close or (lambda client: client.aclose())
+        self._clients: "OrderedDict[tuple, LeantimeClient]" = OrderedDict()
+        self._tenants: Dict[tuple, Tenant] = {}
+        self._leases: Dict[tuple, int] = {}
+        self._last_used: Dict[tuple, float] = {}
+        self._pinned = set()
+        self._lock = asyncio.Lock()
+        self._closing = set()
+        self.evictions = 0
+
+    def pin(self, tenant: Tenant, client: LeantimeClient) -> None:
+        """Add an already opened client that is never evicted."""
+        self._clients[tenant.key] = client
+        self._tenants[tenant.key] = tenant
+        self._last_used[tenant.key] = time.monotonic()
+        self._pinned.add(tenant.key)
+
+    async def acquire(self, tenant: Tenant) -> LeantimeClient:
+        """Return the open client of ``tenant``, leased until ``release`` is called."""
+        key = tenant.key
+        client = self._clients.get(key)
+        if client is None:
+            async with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.factory(tenant)
+                    await client.open()
+                    self._clients[key] = client
+                    self._tenants[key] = tenant
+
+        self._clients.move_to_end(key)
+        self._leases[key] = self._leases.get(key, 0) + 1
+        self._last_used[key] = time.monotonic()
+        self._evict_idle()
+        return client
+
+    def release(self, tenant: Tenant) -> None:
+        """End a lease taken by ``acquire``."""
+        key = tenant.key
+        if self._leases.get(key, 0) > 1:
+            self._leases[key] -= 1
+        else:
+            self._leases.pop(key, None)
+
+    def _evict_idle(self) -> None:
+        """Close least recently used idle clients while the pool is over its limit."""
+        for key in list(self._clients):
+            if len(self._clients) <= self.max_clients:
+                return
+            client = self._clients[key]
+            if key in self._pinned or self._leases.get(key) or client.in_flight:
+                continue
+            del self._clients[key]
+            tenant = self._tenants.pop(key)
+            self._last_used.pop(key, None)
+            self.evictions += 1
+            logger.info("Evicting idle Leantime client of tenant '%s'", tenant.name)
+            task = asyncio.ensure_future(self.close(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close every client, including pinned ones."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._tenants.clear()
+        self._leases.clear()
+        self._pinned.clear()
+        await asyncio.gather(*(self.close(client) for client in clients), *self._closing, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the open clients (without credentials) and eviction counters."""
+        now = time.monotonic()
+        tenants: List[Dict[str, Any]] = [
+            {
+                "tenant": self._tenants[key].name,
+                "url": self._tenants[key].url,
+                "pinned": key in self._pinned,
+                "leases": self._leases.get(key, 0),
+                "in_flight": client.in_flight,
+                "idle_seconds": round(now - self._last_used.get(key, now), 3),
+            }
+            for key, client in self._clients.items()
+        ]
+        return {"clients": len(tenants), "max_clients": self.max_clients, "evictions": self.evictions, "tenants": tenants}
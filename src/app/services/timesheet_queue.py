@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.app.services import json_codec
+from src.app.services.leantime_client import LeantimeAPIError
+
+if TYPE_CHECKING:
+    from src.app.services.leantime_client import LeantimeClient
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    timesheet TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_due ON entries (state, next_attempt_at);
+"""
+
+# Prefix of the IDs handed out before an entry reaches Leantime
+PROVISIONAL_PREFIX = "pending-"
+
+QUEUED = "queued"
+DELIVERED = "delivered"
+FAILED = "failed"
+
+# Client errors that will not succeed on retry
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 409, 425, 429})
+
+
+def is_permanent(error: BaseException) -> bool:
+    """Return whether a delivery error should not be retried."""
+    return (isinstance(error, LeantimeAPIError) and 400 <= error.status_code < 500
+            and error.status_code not in _RETRYABLE_CLIENT_ERRORS)
+
+
+class TimesheetQueue:
+    """
+    Durable write-behind journal for timesheet entries.
+
+    Entries are committed to a local SQLite journal (WAL, fully synced) and
+    acknowledged with a provisional ID. A background worker delivers them to
+    Leantime in batches, retrying transient failures with exponential
+    backoff. Delivery is at-least-once: an entry whose upstream create
+    succeeded just before a crash is sent again on restart.
+    """
+
+    def __init__(self,
+                 path: str = ":memory:",
+                 batch_size: int = 20,
+                 flush_interval: float = 1.0,
+                 max_attempts: int = 8,
+                 retry_base_delay: float = 1.0,
+                 retry_max_delay: float = 300.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the queue.
+
+        Args:
+            path: SQLite journal file (``:memory:`` keeps it in process memory, losing durability)
+            batch_size: Maximum number of entries delivered per flush
+            flush_interval: Seconds between flushes while fewer than ``batch_size`` entries are queued
+            max_attempts: Delivery attempts before an entry is marked failed
+            retry_base_delay: Delay before the first retry, doubled on every retry
+            retry_max_delay: Upper bound for the retry delay
+            clock: Wall clock used for scheduling (overridable for tests)
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            # Acknowledged entries must survive a power loss
+            self._conn.execute("PRAGMA synchronous = FULL")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._queued = self._count(QUEUED)
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._worker: Optional[asyncio.Task] = None
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        """Run a blocking database call in a worker thread."""
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn: Callable, *args) -> Any:
+        with self._db_lock:
+            return fn(*args)
+
+    def _count(self, state: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM entries WHERE state = ?", (state,)).fetchone()[0]
+
+    # Journal
+    def _insert(self, provisional_id: str, data: str, now: float) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO entries (id, data, state, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                (provisional_id, data, QUEUED, now, now),
+            )
+
+    def _due(self, now: float, limit: int) -> List[Tuple[str, str, int]]:
+        return self._conn.execute(
+            "SELECT id, data, attempts FROM entries WHERE state = ? AND next_attempt_at <= ? "
+            "ORDER BY next_attempt_at, created_at LIMIT ?",
+            (QUEUED, now, limit),
+        ).fetchall()
+
+    def _record(self, updates: Iterable[Tuple[str, int, float, Optional[float], Optional[str], Optional[str], str]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE entries SET attempts = ?, next_attempt_at = ?, delivered_at = ?, timesheet = ?, "
+                "last_error = ?, state = ? WHERE id = ?",
+                [(attempts, next_at, delivered_at, timesheet, error, state, provisional_id)
+                 for provisional_id, attempts, next_at, delivered_at, timesheet, error, state in updates],
+            )
+
+    def _rows(self, ids: List[str]) -> List[Tuple]:
+        placeholders = ",".join("?" * len(ids))
+        return self._conn.execute(
+            "SELECT id, state, attempts, created_at, delivered_at, timesheet, last_error "
+            f"FROM entries WHERE id IN ({placeholders})",
+            ids,
+        ).fetchall()
+
+    async def enqueue(self, entry: Dict[str, Any]) -> str:
+        """
+        Journal a validated timesheet entry for delivery.
+
+        Returns:
+            The provisional ID, usable with ``status`` until and after delivery
+        """
+        provisional_id = f"{PROVISIONAL_PREFIX}{uuid.uuid4().hex}"
+        await self._run(self._insert, provisional_id, json_codec.dumps(entry).decode(), self.clock())
+        self._queued += 1
+        if self._queued >= self.batch_size:
+            self._wake.set()
+        return provisional_id
+
+    async def status(self, provisional_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the delivery state of journaled entries.
+
+        Returns:
+            Entries by provisional ID (unknown IDs are omitted) with their
+            ``state``, ``attempts``, timestamps, the created ``timesheet``
+            once delivered and the ``last_error`` of a failed attempt
+        """
+        if not provisional_ids:
+            return {}
+        rows = await self._run(self._rows, list(provisional_ids))
+        return {
+            row[0]: {
+                "provisional_id": row[0],
+                "state": row[1],
+                "attempts": row[2],
+                "created_at": row[3],
+                "delivered_at": row[4],
+                "timesheet": json_codec.loads(row[5]) if row[5] else None,
+                "last_error": row[6],
+            }
+            for row in rows
+        }
+
+    def _retry_delay(self, attempts: int) -> float:
+        return min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempts - 1)))
+
+    async def flush(self, client: "LeantimeClient") -> Dict[str, int]:
+        """
+        Deliver one batch of due entries concurrently.
+
+        Entries are sent as individual REST creates, not through the client's
+        JSON-RPC batcher: the batcher merges identical calls, which would
+        deliver two identical entries once, and one failed batch request would
+        leave the outcome of every entry in it unknown.
+
+        Returns:
+            Number of entries sent, delivered, rescheduled and failed
+        """
+        now = self.clock()
+        due = await self._run(self._due, now, self.batch_size)
+        if not due:
+            return {"sent": 0, "delivered": 0, "retried": 0, "failed": 0}
+
+        results = await asyncio.gather(
+            *(client.create_timesheet(json_codec.loads(data)) for _, data, _ in due),
+            return_exceptions=True,
+        )
+
+        counts = {"sent": len(due), "delivered": 0, "retried": 0, "failed": 0}
+        updates = []
+        now = self.clock()
+        for (provisional_id, _, attempts), result in zip(due, results):
+            attempts += 1
+            if not isinstance(result, BaseException):
+                counts["delivered"] += 1
+                updates.append((provisional_id, attempts, now, now, json_codec.dumps(result).decode(), None, DELIVERED))
+            elif is_permanent(result) or attempts >= self.max_attempts:
+                counts["failed"] += 1
+                updates.append((provisional_id, attempts, now, None, None, str(result), FAILED))
+            else:
+                counts["retried"] += 1
+                updates.append((provisional_id, attempts, now + self._retry_delay(attempts), None, None, str(result), QUEUED))
+        await self._run(self._record, updates)
+        self._queued -= counts["delivered"] + counts["failed"]
+        return counts
+
+    async def _work(self, client: "LeantimeClient") -> None:
+        """Flush whenever a full batch is queued or ``flush_interval`` elapses, until stopped."""
+        while not self._stopping:
+            try:
+                # Keep going while full batches are due, so a backlog drains quickly
+                while (await self.flush(client))["sent"] == self.batch_size and not self._stopping:
+                    pass
+            except Exception:
+                logger.exception("Flushing the timesheet queue failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self, client: "LeantimeClient") -> None:
+        """Start the background worker delivering through ``client``, resuming any journaled entries."""
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._stopping = False
+            self._worker = asyncio.ensure_future(self._work(client))
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background worker; undelivered entries stay journaled.
+        
+        A flush in progress is allowed to finish and record its outcomes, so
+        entries Leantime already accepted are not sent again on restart. If it
+        takes longer than ``timeout`` seconds the worker is cancelled, and its
+        entries are delivered again on restart.
+        
+        Args:
+            timeout: Seconds to wait for the current flush, or None to wait for it to finish
+        """
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(worker), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping the timesheet queue with a flush still in progress")
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+    def _state_counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT state, COUNT(*) FROM entries GROUP BY state").fetchall())
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return the number of entries per state."""
+        counts = await self._run(self._state_counts)
+        return {
+            "queued": counts.get(QUEUED, 0),
+            "delivered": counts.get(DELIVERED, 0),
+            "failed": counts.get(FAILED, 0),
+            "running": self._worker is not None and not self._worker.done(),
+        }
@@ -1,30 +1,28 @@
-from typing import Dict, List, Type
 from src.app.tools.base import BaseTool
+from src.app.tools.registry import ToolRegistry
 
-# Import tool implementations
-from src.app.tools.projects import ListProjectsTool, GetProjectTool, CreateProjectTool
-from src.app.tools.tasks import ListTasksTool, GetTaskTool, CreateTaskTool, UpdateTaskTool
-from src.app.tools.users import ListUsersTool, GetUserTool
-from src.app.tools.timesheets import ListTimesheetsTool, CreateTimesheetTool
-
-# Register all available tools
-AVAILABLE_TOOLS: Dict[str, Type[BaseTool]] = {
+# Register all available tools; each module is imported on first use
+AVAILABLE_TOOLS = ToolRegistry({
     # Projects
-    "list_projects": ListProjectsTool,
-    "get_project": GetProjectTool,
-    "create_project": CreateProjectTool,
+    "list_projects": "src.app.tools.projects:ListProjectsTool",
+    "get_project": "src.app.tools.projects:GetProjectTool",
+    "create_project": "src.app.tools.projects:CreateProjectTool",
     
     # Tasks
-    "list_tasks": ListTasksTool,
-    "get_task": GetTaskTool,
-    "create_task": CreateTaskTool,
-    "update_task": UpdateTaskTool,
+    "list_tasks": "src.app.tools.tasks:ListTasksTool",
+    "get_task": "src.app.tools.tasks:GetTaskTool",
+    "create_task": "src.app.tools.tasks:CreateTaskTool",
+    "update_task": "src.app.tools.tasks:UpdateTaskTool",
+    "bulk_create_tasks": "src.app.tools.tasks:BulkCreateTasksTool",
     
     # Users
-    "list_users": ListUsersTool,
-    "get_user": GetUserTool,
+    "list_users": "src.app.tools.users:ListUsersTool",
+    "get_user": "src.app.tools.users:GetUserTool",
     
     # Timesheets
-    "list_timesheets": ListTimesheetsTool,
-    "create_timesheet": CreateTimesheetTool,
-}
\ No newline at end of file
+    "list_timesheets": "src.app.tools.timesheets:ListTimesheetsTool",
+    "create_timesheet": "src.app.tools.timesheets:CreateTimesheetTool",
+    "get_timesheet_status": "src.app.tools.timesheets:GetTimesheetStatusTool",
+    "bulk_create_timesheets": "src.app.tools.timesheets:BulkCreateTimesheetsTool",
+    "summarize_timesheets": "src.app.tools.timesheets:SummarizeTimesheetsTool",
+})
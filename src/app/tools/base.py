@@ -1,6 +1,23 @@
+import asyncio
+import random
 from abc import ABC, abstractmethod
-from typing import Dict, Any, ClassVar, Type
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import (
+    Dict, Any, AsyncIterator, Awaitable, Callable, ClassVar, Iterable, List, Literal, Optional, Tuple, Type, Union
+)
+from pydantic import BaseModel, Field, TypeAdapter, create_model
+
+from src.app.services import profiling
+from src.app.services.leantime_client import Page
+
+# Output re-validation modes: validate every call, a random sample of calls, or none
+OUTPUT_VALIDATION_MODES = ("full", "sampled", "off")
+
+# Response layouts of list tools: one dict per item, or one array per field
+ListFormat = Literal["rows", "columnar"]
+
+# Tool inputs that change the shape of the output (field projection and list layout)
+OUTPUT_SHAPING_FIELDS = frozenset({"fields", "format"})
 
 
 class ToolInput(BaseModel):
@@ -13,6 +30,243 @@ class ToolOutput(BaseModel):
     pass
 
 
+def validate_fields(model: Type[BaseModel], fields: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Check a field projection against a data model.
+    
+    Args:
+        model: Data model the fields are selected from
+        fields: Requested field names, or None for all fields
+        
+    Returns:
+        The requested fields with duplicates removed, or None
+    """
+    if not fields:
+        return None
+    
+    unknown = [name for name in fields if name not in model.model_fields]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available fields: {', '.join(model.model_fields)}"
+        )
+    return list(dict.fromkeys(fields))
+
+
+def project_items(items: Iterable[Dict[str, Any]], fields: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """Return copies of raw items containing only the requested fields."""
+    if not fields:
+        return list(items)
+    return [{name: item[name] for name in fields if name in item} for item in items]
+
+
+@lru_cache(maxsize=512)
+def type_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Return a (cached) compiled TypeAdapter for ``model``."""
+    return TypeAdapter(model)
+
+
+@lru_cache(maxsize=256)
+def projected_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Build (and cache) a model containing only the given fields of ``model``."""
+    definitions = {}
+    for name in fields:
+        info = model.model_fields[name]
+        definitions[name] = (info.annotation, ... if info.is_required() else info.default)
+    
+    return create_model(f"{model.__name__}Projection", **definitions)
+
+
+@lru_cache(maxsize=256)
+def projected_list_output(output_model: Type[ToolOutput],
+                          list_field: str,
+                          item_model: Type[BaseModel],
+                          fields: Tuple[str, ...]) -> Type[ToolOutput]:
+    """Build (and cache) a list output model whose items only contain the given fields."""
+    return create_model(
+        f"{output_model.__name__}Projection",
+        __base__=output_model,
+        **{list_field: (List[projected_model(item_model, fields)], ...)}
+    )
+
+
+@lru_cache(maxsize=256)
+def columnar_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Build (and cache) a model holding one array per field of ``model``."""
+    definitions = {name: (List[model.model_fields[name].annotation], ...) for name in fields}
+    return create_model(f"{model.__name__}Columns", **definitions)
+
+
+@lru_cache(maxsize=256)
+def columnar_list_output(output_model: Type[ToolOutput],
+                         list_field: str,
+                         item_model: Type[BaseModel],
+                         fields: Tuple[str, ...]) -> Type[ToolOutput]:
+    """Build (and cache) a list output model whose items are returned as columns."""
+    return create_model(
+        f"{output_model.__name__}Columnar",
+        __base__=output_model,
+        count=(int, Field(..., description="Number of items (length of every column)")),
+        **{list_field: (columnar_model(item_model, fields), ...)}
+    )
+
+
+def list_output_model(output_model: Type[ToolOutput],
+                      list_field: str,
+                      item_model: Type[BaseModel],
+                      fields: Optional[List[str]],
+                      list_format: str = "rows") -> Type[ToolOutput]:
+    """Return the output model of a list tool for the requested fields and format."""
+    if list_format == "columnar":
+        return columnar_list_output(output_model, list_field, item_model, tuple(fields or item_model.model_fields))
+    if fields:
+        return projected_list_output(output_model, list_field, item_model, tuple(fields))
+    return output_model
+
+
+def to_columns(model: Type[BaseModel],
+               items: Iterable[Dict[str, Any]],
+               fields: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+    """
+    Transpose raw items into one array per field.
+    
+    Missing values are filled with the field's default (None for required
+    fields, which then fail validation as they would in row format).
+    
+    Args:
+        model: Data model the items follow
+        items: Raw items
+        fields: Fields to include, or None for all fields of ``model``
+        
+    Returns:
+        Mapping of field name to the list of its values, in item order
+    """
+    items = items if isinstance(items, list) else list(items)
+    columns = {}
+    for name in fields or model.model_fields:
+        info = model.model_fields[name]
+        default = None if info.is_required() else info.default
+        columns[name] = [item.get(name, default) for item in items]
+    return columns
+
+
+def list_payload(list_field: str,
+                 items: Iterable[Dict[str, Any]],
+                 item_model: Type[BaseModel],
+                 fields: Optional[List[str]] = None,
+                 list_format: str = "rows") -> Dict[str, Any]:
+    """
+    Build the item part of a list tool's output in the requested format.
+    
+    Args:
+        list_field: Name of the output field holding the items
+        items: Raw items
+        item_model: Data model the items follow
+        fields: Requested field projection, or None for all fields
+        list_format: ``rows`` for a list of dicts, ``columnar`` for one array per field
+        
+    Returns:
+        Output fields to merge into the tool result
+    """
+    if list_format == "columnar":
+        items = list(items)
+        return {list_field: to_columns(item_model, items, fields), "count": len(items)}
+    return {list_field: project_items(items, fields)}
+
+
+async def fill_page(fetch_page: Callable[[Optional[int], Optional[str]], Awaitable[Page]],
+                    limit: Optional[int],
+                    cursor: Optional[str],
+                    matches: Callable[[Dict[str, Any]], bool]) -> Page:
+    """
+    Fetch upstream pages until ``limit`` matching items are collected.
+    
+    Each request asks only for the items still missing, so the page never
+    overshoots and the returned cursor resumes exactly after the last item
+    looked at. Without a limit a single upstream page is filtered.
+    
+    Args:
+        fetch_page: Coroutine function fetching one page for a limit and cursor
+        limit: Number of matching items wanted, or None for one upstream page
+        cursor: Cursor to start from, or None for the first page
+        matches: Predicate selecting the items to keep
+        
+    Returns:
+        The matching items and the cursor for the next page, if any
+    """
+    items: List[Dict[str, Any]] = []
+    previous = None
+    while True:
+        page = await fetch_page(limit - len(items) if limit else None, cursor)
+        if previous is not None and page.items and page.items == previous:
+            # The endpoint ignores paging and served the same items again
+            return Page(items=items)
+        items.extend(item for item in page.items if matches(item))
+        cursor = page.next_cursor
+        if cursor is None or not limit or len(items) >= limit:
+            return Page(items=items, next_cursor=cursor)
+        previous = page.items
+
+
+class BulkRowResult(BaseModel):
+    """Model for the outcome of one row of a bulk operation."""
+    index: int
+    success: bool
+    error: Optional[str] = None
+    warning: Optional[str] = None
+
+
+async def run_bulk(rows: List[Dict[str, Any]],
+                   row_model: Type[ToolInput],
+                   result_model: Type[BaseModel],
+                   create: Callable[[Dict[str, Any]], Awaitable[Any]],
+                   concurrency: int) -> List[Dict[str, Any]]:
+    """
+    Validate rows up front, then create the valid ones concurrently.
+    
+    A row that fails validation or creation is reported with its error and
+    never aborts the other rows. A row created upstream whose result does not
+    match ``result_model`` is still reported as created, with a warning in
+    place of the result, so that retrying the failures does not duplicate it.
+    
+    Args:
+        rows: Raw input rows
+        row_model: Input model every row is validated against
+        result_model: Model the upstream result of each row is validated against
+        create: Coroutine function creating a single validated row upstream
+        concurrency: Maximum number of rows created at the same time
+        
+    Returns:
+        One result per row, in input order, with ``result`` set on success
+    """
+    results: List[Dict[str, Any]] = []
+    pending = []
+    for index, row in enumerate(rows):
+        try:
+            pending.append((index, row_model(**row).model_dump()))
+            results.append({"index": index, "success": False})
+        except Exception as e:
+            results.append({"index": index, "success": False, "error": str(e)})
+    
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def create_row(index: int, data: Dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                created = await create(data)
+            except Exception as e:
+                results[index]["error"] = str(e)
+                return
+            results[index]["success"] = True
+            try:
+                results[index]["result"] = result_model.model_validate(created).model_dump()
+            except Exception as e:
+                results[index]["warning"] = f"Created, but the upstream result could not be read: {e}"
+    
+    await asyncio.gather(*(create_row(index, data) for index, data in pending))
+    return results
+
+
 class BaseTool(ABC):
     """Base class for all MCP tools."""
     
@@ -20,24 +274,77 @@ class BaseTool(ABC):
     description: ClassVar[str]
     input_model: ClassVar[Type[ToolInput]]
     output_model: ClassVar[Type[ToolOutput]]
+    # Model for individual items, set by list tools that support streaming
+    item_model: ClassVar[Optional[Type[BaseModel]]] = None
+    # How tool results are re-validated against the output model, see OUTPUT_VALIDATION_MODES
+    output_validation: ClassVar[str] = "full"
+    # Fraction of calls validated in "sampled" mode
+    output_sample_rate: ClassVar[float] = 0.1
+    # Whether the tool only reads from Leantime; its responses then carry an ETag
+    read_only: ClassVar[bool] = False
+    # Whether the result of the current call is re-validated, decided once per call by ``run``
+    _validate_output: bool = True
+    
+    @classmethod
+    def configure_output_validation(cls, mode: str, sample_rate: float = 0.1) -> None:
+        """
+        Set the output validation mode for this tool class and its subclasses.
+        
+        Args:
+            mode: One of ``full``, ``sampled`` or ``off``
+            sample_rate: Fraction of calls validated in ``sampled`` mode
+        """
+        if mode not in OUTPUT_VALIDATION_MODES:
+            raise ValueError(
+                f"Unknown output validation mode '{mode}'. "
+                f"Available modes: {', '.join(OUTPUT_VALIDATION_MODES)}"
+            )
+        cls.output_validation = mode
+        cls.output_sample_rate = min(1.0, max(0.0, sample_rate))
     
     @abstractmethod
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: ToolInput) -> Union[ToolOutput, Dict[str, Any]]:
         """
         Execute the tool with the provided input.
         
         Args:
-            input_data: Dictionary containing the tool input parameters
+            input_data: Validated instance of the tool's input model
             
         Returns:
-            Dictionary containing the tool output
+            The tool output, normally built with ``output``
         """
         pass
     
+    def output(self, validated_input: ToolInput, **fields: Any) -> Union[ToolOutput, Dict[str, Any]]:
+        """
+        Build the result of the current call.
+        
+        The fields are validated into the call's output model once. When
+        ``output_validation`` skips the call, they are returned as a plain
+        dict instead, which ``run`` passes through untouched.
+        
+        Args:
+            validated_input: Input of the current call
+            **fields: Output fields, typically holding raw upstream data
+            
+        Returns:
+            The validated output model, or the unvalidated fields
+        """
+        if not self._validate_output:
+            return fields
+        with profiling.phase("output"):
+            return type_adapter(self.get_output_model(validated_input)).validate_python(fields)
+    
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Run the tool with validation.
         
+        The input is always validated and handed to ``execute`` as a model.
+        Whether the result is re-validated against the output model is decided
+        once per call from ``output_validation``. An output model returned by
+        ``execute`` is dumped without further validation; a plain dict is
+        validated if the call is sampled and returned as-is otherwise.
+        
         Args:
             input_data: Dictionary containing the tool input parameters
             
@@ -45,12 +352,96 @@ class BaseTool(ABC):
             Dictionary containing the tool output
         """
         # Validate input using the input model
-        validated_input = self.input_model(**input_data)
+        with profiling.phase("input"):
+            validated_input = type_adapter(self.input_model).validate_python(input_data)
         
         # Execute the tool
-        result = await self.execute(validated_input.model_dump())
+        self._validate_output = self.should_validate_output()
+        result = await self.execute(validated_input)
+        
+        if isinstance(result, BaseModel):
+            with profiling.phase("output"):
+                return result.model_dump()
+        if not self._validate_output:
+            return result
         
         # Validate output using the output model
-        validated_output = self.output_model(**result)
+        with profiling.phase("output"):
+            adapter = type_adapter(self.get_output_model(validated_input))
+            return adapter.dump_python(adapter.validate_python(result))
+    
+    def should_validate_output(self) -> bool:
+        """Return whether the result of the current call is re-validated."""
+        if self.output_validation == "full":
+            return True
+        if self.output_validation == "sampled":
+            return random.random() < self.output_sample_rate
+        return False
+    
+    def get_output_model(self, validated_input: ToolInput) -> Type[ToolOutput]:
+        """
+        Return the output model for a call.
+        
+        Tools that support field projection override this to return a model
+        containing only the requested fields.
+        """
+        return self.output_model
+    
+    def get_item_model(self, validated_input: ToolInput) -> Type[BaseModel]:
+        """Return the model streamed items are validated against for a call."""
+        return self.item_model
+    
+    @classmethod
+    def has_fixed_output(cls) -> bool:
+        """
+        Return whether every result has the shape of ``output_model``.
+        
+        Results of tools taking ``fields`` or ``format`` are projected or
+        columnar, so ``output_model`` does not describe them.
+        """
+        return not OUTPUT_SHAPING_FIELDS & set(cls.input_model.model_fields)
+    
+    @classmethod
+    def supports_streaming(cls) -> bool:
+        """Return whether the tool can stream its results item by item."""
+        return cls.item_model is not None
+    
+    def execute_stream(self, input_data: ToolInput) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the tool, yielding raw result items as they arrive.
         
-        return validated_output.model_dump()
\ No newline at end of file
+        Args:
+            input_data: Validated instance of the tool's input model
+            
+        Returns:
+            Async iterator of raw result items
+        """
+        raise NotImplementedError(f"Tool '{self.name}' does not support streaming")
+    
+    def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the tool in streaming mode with validation.
+        
+        The input is validated immediately so errors surface before any output
+        is sent; each item is then validated individually as it arrives.
+        
+        Args:
+            input_data: Dictionary containing the tool input parameters
+            
+        Returns:
+            Async iterator of validated result items
+        """
+        if not self.supports_streaming():
+            raise NotImplementedError(f"Tool '{self.name}' does not support streaming")
+        
+        validated_input = type_adapter(self.input_model).validate_python(input_data)
+        item_model = self.get_item_model(validated_input)
+        return self._validate_stream(self.execute_stream(validated_input), item_model)
+    
+    async def _validate_stream(self,
+                               items: AsyncIterator[Dict[str, Any]],
+                               item_model: Type[BaseModel]) -> AsyncIterator[Dict[str, Any]]:
+        """Validate each streamed item against the item model."""
+        adapter = type_adapter(item_model)
+        async for item in items:
+            yield adapter.dump_python(adapter.validate_python(item))
\ No newline at end of file
@@ -1,15 +1,17 @@
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
-
-from src.app.tools.base import BaseTool, ToolInput, ToolOutput
+from typing import Dict, Any, List, Optional, Type, Union
+from pydantic import BaseModel, Field, field_validator
+
+from src.app.tools.base import (
+    BaseTool,
+    ToolInput,
+    ToolOutput,
+    project_items,
+    projected_list_output,
+    validate_fields,
+)
 from src.app.services.leantime_client import LeantimeClient
 
 
-class ListProjectsInput(ToolInput):
-    """Input model for listing projects."""
-    pass
-
-
 class ProjectData(BaseModel):
     """Model for project data."""
     id: int
@@ -21,6 +23,27 @@ class ProjectData(BaseModel):
     endDate: Optional[str] = None
 
 
+class ListProjectsInput(ToolInput):
+    """Input model for listing projects."""
+    fields: Optional[List[str]] = Field(None, description="Only return these project fields (e.g. ['id', 'name'])")
+    state: Optional[List[str]] = Field(None, description="Only include projects in one of these states")
+    client_id: Optional[int] = Field(None, description="Only include projects belonging to this client ID")
+    
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, fields: Optional[List[str]]) -> Optional[List[str]]:
+        return validate_fields(ProjectData, fields)
+
+
+def project_matches(project: Dict[str, Any], input_data: ListProjectsInput) -> bool:
+    """Return whether a raw project dict satisfies the given list_projects filters."""
+    if input_data.state and project.get("state") not in input_data.state:
+        return False
+    if input_data.client_id is not None and project.get("clientId") != input_data.client_id:
+        return False
+    return True
+
+
 class ListProjectsOutput(ToolOutput):
     """Output model for listing projects."""
     projects: List[ProjectData]
@@ -30,21 +53,32 @@ class ListProjectsTool(BaseTool):
     """Tool for listing all projects in Leantime."""
     
     name = "list_projects"
-    description = "Lists all available projects in Leantime"
+    description = (
+        "Lists all available projects in Leantime, optionally filtered by state or client "
+        "and projected to selected fields"
+    )
     input_model = ListProjectsInput
     output_model = ListProjectsOutput
+    read_only = True
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_output_model(self, validated_input: ListProjectsInput) -> Type[ToolOutput]:
+        """Return an output model limited to the requested fields."""
+        if validated_input.fields:
+            return projected_list_output(ListProjectsOutput, "projects", ProjectData, tuple(validated_input.fields))
+        return self.output_model
+    
+    async def execute(self, input_data: ListProjectsInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to list projects."""
         projects = await self.client.get_projects()
+        if input_data.state or input_data.client_id is not None:
+            projects = [project for project in projects if project_matches(project, input_data)]
+        projects = project_items(projects, input_data.fields)
         
         # Format the response according to the output model
-        return {
-            "projects": projects
-        }
+        return self.output(input_data, projects=projects)
 
 
 class GetProjectInput(ToolInput):
@@ -64,18 +98,17 @@ class GetProjectTool(BaseTool):
     description = "Gets details of a specific project in Leantime"
     input_model = GetProjectInput
     output_model = GetProjectOutput
+    read_only = True
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: GetProjectInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to get a project."""
-        project = await self.client.get_project(input_data["project_id"])
+        project = await self.client.get_project(input_data.project_id)
         
         # Format the response according to the output model
-        return {
-            "project": project
-        }
+        return self.output(input_data, project=project)
 
 
 class CreateProjectInput(ToolInput):
@@ -104,12 +137,9 @@ class CreateProjectTool(BaseTool):
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: CreateProjectInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to create a project."""
-        project = await self.client.create_project(input_data)
+        project = await self.client.create_project(input_data.model_dump())
         
         # Format the response according to the output model
-        return {
-            "project": project,
-            "message": "Project created successfully"
-        }
\ No newline at end of file
+        return self.output(input_data, project=project, message="Project created successfully")
\ No newline at end of file
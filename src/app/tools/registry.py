@@ -0,0 +1,123 @@
+import hashlib
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple, Type, Union
+
+from src.app.services import json_codec
+from src.app.tools.base import BaseTool
+
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party packages use to register additional tools
+ENTRY_POINT_GROUP = "leantime_mcp.tools"
+
+ToolSpec = Union[str, Type[BaseTool]]
+
+
+class ToolRegistry(Mapping[str, Type[BaseTool]]):
+    """
+    Mapping of tool names to tool classes that imports each tool on first use.
+
+    Tools are declared as ``"module:ClassName"`` specs, either in code or via
+    the ``leantime_mcp.tools`` entry point group. Membership checks and
+    iteration over names never import a tool module.
+    """
+
+    def __init__(self, specs: Mapping[str, ToolSpec], entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        """
+        Initialize the registry.
+
+        Args:
+            specs: Built-in tools as name -> ``"module:ClassName"`` (or an already imported class)
+            entry_point_group: Entry point group scanned for additional tools, or None to disable discovery
+        """
+        self._builtin = dict(specs)
+        self._entry_point_group = entry_point_group
+        self._specs: Optional[Dict[str, ToolSpec]] = None
+        self._loaded: Dict[str, Type[BaseTool]] = {}
+        self._manifest: Optional[Tuple[bytes, str]] = None
+
+    @property
+    def specs(self) -> Dict[str, ToolSpec]:
+        """Return every tool spec, discovering entry points on first access."""
+        if self._specs is None:
+            specs = {}
+            if self._entry_point_group:
+                for entry_point in entry_points(group=self._entry_point_group):
+                    specs[entry_point.name] = entry_point.value
+            # Built-in tools take precedence over plugins with the same name
+            specs.update(self._builtin)
+            self._specs = specs
+        return self._specs
+
+    def register(self, name: str, spec: ToolSpec) -> None:
+        """Register (or replace) a tool and invalidate the cached manifest."""
+        self.specs[name] = spec
+        self._loaded.pop(name, None)
+        self._manifest = None
+
+    def __getitem__(self, name: str) -> Type[BaseTool]:
+        tool_class = self._loaded.get(name)
+        if tool_class is not None:
+            return tool_class
+
+        spec = self.specs[name]
+        if isinstance(spec, str):
+            module_name, _, class_name = spec.partition(":")
+            tool_class = getattr(importlib.import_module(module_name), class_name)
+        else:
+            tool_class = spec
+
+        if not (isinstance(tool_class, type) and issubclass(tool_class, BaseTool)):
+            raise TypeError(f"Tool '{name}' ({spec}) is not a BaseTool subclass")
+        self._loaded[name] = tool_class
+        return tool_class
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def is_loaded(self, name: str) -> bool:
+        """Return whether a tool's module has been imported."""
+        return name in self._loaded
+
+    def describe(self, name: str) -> Dict[str, Any]:
+        """
+        Return the manifest entry of a tool, including its input/output JSON schemas.
+
+        As in MCP ``tools/list``, ``output_schema`` is omitted for tools whose
+        output can be projected or returned in columns.
+        """
+        tool_class = self[name]
+        entry = {
+            "name": name,
+            "description": tool_class.description,
+            "streaming": tool_class.supports_streaming(),
+            "read_only": tool_class.read_only,
+            "input_schema": tool_class.input_model.model_json_schema(),
+        }
+        if tool_class.has_fixed_output():
+            entry["output_schema"] = tool_class.output_model.model_json_schema()
+        return entry
+
+    def manifest(self) -> Tuple[bytes, str]:
+        """
+        Return the rendered tool manifest and its ETag.
+
+        The manifest is built (importing every tool) on first call and cached
+        until a tool is registered.
+
+        Returns:
+            The JSON-encoded manifest and its quoted ETag
+        """
+        if self._manifest is None:
+            body = json_codec.dumps({"tools": [self.describe(name) for name in self]})
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            self._manifest = (body, etag)
+        return self._manifest
@@ -1,7 +1,20 @@
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
+from datetime import date
+from typing import Dict, Any, AsyncIterator, List, Optional, Type, Union
+from pydantic import BaseModel, Field, field_validator
 
-from src.app.tools.base import BaseTool, ToolInput, ToolOutput
+from src.app.tools.base import (
+    BaseTool,
+    BulkRowResult,
+    ListFormat,
+    ToolInput,
+    ToolOutput,
+    fill_page,
+    run_bulk,
+    list_output_model,
+    list_payload,
+    projected_model,
+    validate_fields,
+)
 from src.app.services.leantime_client import LeantimeClient
 
 
@@ -23,32 +36,130 @@ class TaskData(BaseModel):
 class ListTasksInput(ToolInput):
     """Input model for listing tasks."""
     project_id: Optional[int] = Field(None, description="ID of the project to filter tasks by")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of tasks to return; enables paging")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous call's next_cursor to continue paging")
+    fields: Optional[List[str]] = Field(None, description="Only return these task fields (e.g. ['id', 'title', 'status'])")
+    status: Optional[List[str]] = Field(None, description="Only include tasks with one of these statuses")
+    priority: Optional[List[str]] = Field(None, description="Only include tasks with one of these priorities")
+    assigned_to: Optional[int] = Field(None, description="Only include tasks assigned to this user ID")
+    tag: Optional[str] = Field(None, description="Only include tasks carrying this tag")
+    due_after: Optional[date] = Field(None, description="Only include tasks due on or after this date (YYYY-MM-DD)")
+    due_before: Optional[date] = Field(None, description="Only include tasks due on or before this date (YYYY-MM-DD)")
+    refresh: bool = Field(False, description="Force a refresh of the local task mirror before answering")
+    format: ListFormat = Field(
+        "rows", description="'columnar' returns one array per field instead of one object per task"
+    )
+    
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, fields: Optional[List[str]]) -> Optional[List[str]]:
+        return validate_fields(TaskData, fields)
+
+
+TASK_FILTERS = ("status", "priority", "assigned_to", "tag", "due_after", "due_before")
+
+
+def task_matches(task: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Return whether a raw task dict satisfies the given list_tasks filters."""
+    if filters.get("status") and task.get("status") not in filters["status"]:
+        return False
+    if filters.get("priority") and task.get("priority") not in filters["priority"]:
+        return False
+    if filters.get("assigned_to") is not None and task.get("assignedTo") != filters["assigned_to"]:
+        return False
+    if filters.get("tag") and filters["tag"] not in (task.get("tags") or []):
+        return False
+    due = (task.get("dueDate") or "")[:10]
+    if filters.get("due_after") and not (due and due >= str(filters["due_after"])):
+        return False
+    if filters.get("due_before") and not (due and due <= str(filters["due_before"])):
+        return False
+    return True
 
 
 class ListTasksOutput(ToolOutput):
     """Output model for listing tasks."""
     tasks: List[TaskData]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if more tasks are available")
 
 
 class ListTasksTool(BaseTool):
     """Tool for listing tasks in Leantime."""
     
     name = "list_tasks"
-    description = "Lists tasks in Leantime, optionally filtered by project"
+    description = (
+        "Lists tasks in Leantime, optionally filtered by project, status, priority, assignee, tag or due date, "
+        "and projected to selected fields"
+    )
     input_model = ListTasksInput
     output_model = ListTasksOutput
+    read_only = True
+    item_model = TaskData
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_output_model(self, validated_input: ListTasksInput) -> Type[ToolOutput]:
+        """Return an output model for the requested fields and format."""
+        return list_output_model(
+            self.output_model, "tasks", TaskData, validated_input.fields, validated_input.format
+        )
+    
+    def get_item_model(self, validated_input: ListTasksInput) -> Type[BaseModel]:
+        """Return an item model limited to the requested fields."""
+        if validated_input.fields:
+            return projected_model(TaskData, tuple(validated_input.fields))
+        return self.item_model
+    
+    async def execute(self, input_data: ListTasksInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to list tasks."""
-        tasks = await self.client.get_tasks(input_data.get("project_id"))
+        fields = input_data.fields
+        list_format = input_data.format
+        filters = input_data.model_dump(include=set(TASK_FILTERS), exclude_none=True)
+        
+        # Answer from the local mirror when one is configured
+        task_mirror = getattr(self.client, "task_mirror", None)
+        if task_mirror is not None:
+            page = await task_mirror.query(
+                self.client,
+                project_id=input_data.project_id,
+                limit=input_data.limit,
+                cursor=input_data.cursor,
+                refresh=input_data.refresh,
+                **filters
+            )
+            return self.output(
+                input_data,
+                **list_payload("tasks", page.items, TaskData, fields, list_format),
+                next_cursor=page.next_cursor
+            )
+        
+        if input_data.limit or input_data.cursor:
+            page = await fill_page(
+                lambda limit, cursor: self.client.get_tasks_page(input_data.project_id, limit=limit, cursor=cursor),
+                input_data.limit,
+                input_data.cursor,
+                lambda task: task_matches(task, filters)
+            )
+            return self.output(
+                input_data,
+                **list_payload("tasks", page.items, TaskData, fields, list_format),
+                next_cursor=page.next_cursor
+            )
+        
+        tasks = await self.client.get_tasks(input_data.project_id)
+        if filters:
+            tasks = [task for task in tasks if task_matches(task, filters)]
         
         # Format the response according to the output model
-        return {
-            "tasks": tasks
-        }
+        return self.output(input_data, **list_payload("tasks", tasks, TaskData, fields, list_format))
+    
+    async def execute_stream(self, input_data: ListTasksInput) -> AsyncIterator[Dict[str, Any]]:
+        """Stream tasks as they arrive from Leantime."""
+        filters = input_data.model_dump(include=set(TASK_FILTERS), exclude_none=True)
+        async for task in self.client.stream_tasks(input_data.project_id):
+            if task_matches(task, filters):
+                yield task
 
 
 class GetTaskInput(ToolInput):
@@ -68,18 +179,17 @@ class GetTaskTool(BaseTool):
     description = "Gets details of a specific task in Leantime"
     input_model = GetTaskInput
     output_model = GetTaskOutput
+    read_only = True
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: GetTaskInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to get a task."""
-        task = await self.client.get_task(input_data["task_id"])
+        task = await self.client.get_task(input_data.task_id)
         
         # Format the response according to the output model
-        return {
-            "task": task
-        }
+        return self.output(input_data, task=task)
 
 
 class CreateTaskInput(ToolInput):
@@ -113,15 +223,12 @@ class CreateTaskTool(BaseTool):
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: CreateTaskInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to create a task."""
-        task = await self.client.create_task(input_data)
+        task = await self.client.create_task(input_data.model_dump())
         
         # Format the response according to the output model
-        return {
-            "task": task,
-            "message": "Task created successfully"
-        }
+        return self.output(input_data, task=task, message="Task created successfully")
 
 
 class UpdateTaskInput(ToolInput):
@@ -154,13 +261,53 @@ class UpdateTaskTool(BaseTool):
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: UpdateTaskInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to update a task."""
-        task_id = input_data.pop("task_id")
-        task = await self.client.update_task(task_id, input_data)
+        task = await self.client.update_task(input_data.task_id, input_data.model_dump(exclude={"task_id"}))
+        
+        # Format the response according to the output model
+        return self.output(input_data, task=task, message="Task updated successfully")
+
+
+class BulkCreateTasksInput(ToolInput):
+    """Input model for creating many tasks at once."""
+    tasks: List[Dict[str, Any]] = Field(..., min_length=1, description="Tasks to create, each matching create_task's input")
+    concurrency: int = Field(10, ge=1, le=50, description="Maximum number of tasks created at the same time")
+
+
+class BulkTaskResult(BulkRowResult):
+    """Model for the outcome of creating one task."""
+    result: Optional[TaskData] = None
+
+
+class BulkCreateTasksOutput(ToolOutput):
+    """Output model for creating many tasks at once."""
+    results: List[BulkTaskResult]
+    created: int
+    failed: int
+
+
+class BulkCreateTasksTool(BaseTool):
+    """Tool for creating many tasks in Leantime at once."""
+    
+    name = "bulk_create_tasks"
+    description = "Creates many tasks in Leantime concurrently, reporting success or failure per task"
+    input_model = BulkCreateTasksInput
+    output_model = BulkCreateTasksOutput
+    
+    def __init__(self, leantime_client: LeantimeClient):
+        self.client = leantime_client
+    
+    async def execute(self, input_data: BulkCreateTasksInput) -> Union[ToolOutput, Dict[str, Any]]:
+        """Execute the tool to create tasks."""
+        results = await run_bulk(
+            input_data.tasks,
+            CreateTaskInput,
+            TaskData,
+            self.client.create_task,
+            input_data.concurrency
+        )
+        created = sum(1 for result in results if result["success"])
         
         # Format the response according to the output model
-        return {
-            "task": task,
-            "message": "Task updated successfully"
-        }
\ No newline at end of file
+        return self.output(input_data, results=results, created=created, failed=len(results) - created)
\ No newline at end of file
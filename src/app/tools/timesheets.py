@@ -1,8 +1,22 @@
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
-from datetime import datetime
+from typing import Dict, Any, AsyncIterator, List, Literal, Optional, Tuple, Type, Union
+from pydantic import BaseModel, Field, field_validator
+from datetime import date
 
-from src.app.tools.base import BaseTool, ToolInput, ToolOutput
+import numpy as np
+
+from src.app.tools.base import (
+    BaseTool,
+    BulkRowResult,
+    ListFormat,
+    ToolInput,
+    ToolOutput,
+    fill_page,
+    run_bulk,
+    list_output_model,
+    list_payload,
+    projected_model,
+    validate_fields,
+)
 from src.app.services.leantime_client import LeantimeClient
 
 
@@ -22,36 +36,115 @@ class ListTimesheetsInput(ToolInput):
     user_id: Optional[int] = Field(None, description="ID of the user to filter timesheets by")
     project_id: Optional[int] = Field(None, description="ID of the project to filter timesheets by")
     task_id: Optional[int] = Field(None, description="ID of the task to filter timesheets by")
+    limit: Optional[int] = Field(None, ge=1, description="Maximum number of entries to return; enables paging")
+    cursor: Optional[str] = Field(None, description="Cursor from a previous call's next_cursor to continue paging")
+    fields: Optional[List[str]] = Field(None, description="Only return these timesheet fields (e.g. ['date', 'hours'])")
+    date_after: Optional[date] = Field(None, description="Only include entries on or after this date (YYYY-MM-DD)")
+    date_before: Optional[date] = Field(None, description="Only include entries on or before this date (YYYY-MM-DD)")
+    format: ListFormat = Field(
+        "rows", description="'columnar' returns one array per field instead of one object per entry"
+    )
+    
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, fields: Optional[List[str]]) -> Optional[List[str]]:
+        return validate_fields(TimesheetData, fields)
+
+
+TIMESHEET_FILTERS = ("date_after", "date_before")
+
+
+def timesheet_matches(timesheet: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Return whether a raw timesheet dict satisfies the given list_timesheets filters."""
+    day = (timesheet.get("date") or "")[:10]
+    if filters.get("date_after") and not (day and day >= str(filters["date_after"])):
+        return False
+    if filters.get("date_before") and not (day and day <= str(filters["date_before"])):
+        return False
+    return True
 
 
 class ListTimesheetsOutput(ToolOutput):
     """Output model for listing timesheets."""
     timesheets: List[TimesheetData]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if more entries are available")
 
 
 class ListTimesheetsTool(BaseTool):
     """Tool for listing timesheet entries in Leantime."""
     
     name = "list_timesheets"
-    description = "Lists timesheet entries in Leantime, optionally filtered by user, project, or task"
+    description = (
+        "Lists timesheet entries in Leantime, optionally filtered by user, project, task or date range, "
+        "and projected to selected fields"
+    )
     input_model = ListTimesheetsInput
     output_model = ListTimesheetsOutput
+    read_only = True
+    item_model = TimesheetData
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_output_model(self, validated_input: ListTimesheetsInput) -> Type[ToolOutput]:
+        """Return an output model for the requested fields and format."""
+        return list_output_model(
+            self.output_model, "timesheets", TimesheetData, validated_input.fields, validated_input.format
+        )
+    
+    def get_item_model(self, validated_input: ListTimesheetsInput) -> Type[BaseModel]:
+        """Return an item model limited to the requested fields."""
+        if validated_input.fields:
+            return projected_model(TimesheetData, tuple(validated_input.fields))
+        return self.item_model
+    
+    async def execute(self, input_data: ListTimesheetsInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to list timesheet entries."""
+        fields = input_data.fields
+        list_format = input_data.format
+        filters = input_data.model_dump(include=set(TIMESHEET_FILTERS), exclude_none=True)
+        
+        if input_data.limit or input_data.cursor:
+            page = await fill_page(
+                lambda limit, cursor: self.client.get_timesheets_page(
+                    user_id=input_data.user_id,
+                    project_id=input_data.project_id,
+                    task_id=input_data.task_id,
+                    limit=limit,
+                    cursor=cursor
+                ),
+                input_data.limit,
+                input_data.cursor,
+                lambda timesheet: timesheet_matches(timesheet, filters)
+            )
+            return self.output(
+                input_data,
+                **list_payload("timesheets", page.items, TimesheetData, fields, list_format),
+                next_cursor=page.next_cursor
+            )
+        
         timesheets = await self.client.get_timesheets(
-            user_id=input_data.get("user_id"),
-            project_id=input_data.get("project_id"),
-            task_id=input_data.get("task_id")
+            user_id=input_data.user_id,
+            project_id=input_data.project_id,
+            task_id=input_data.task_id
         )
+        if filters:
+            timesheets = [timesheet for timesheet in timesheets if timesheet_matches(timesheet, filters)]
         
         # Format the response according to the output model
-        return {
-            "timesheets": timesheets
-        }
+        return self.output(input_data, **list_payload("timesheets", timesheets, TimesheetData, fields, list_format))
+    
+    async def execute_stream(self, input_data: ListTimesheetsInput) -> AsyncIterator[Dict[str, Any]]:
+        """Stream timesheet entries as they arrive from Leantime."""
+        filters = input_data.model_dump(include=set(TIMESHEET_FILTERS), exclude_none=True)
+        timesheets = self.client.stream_timesheets(
+            user_id=input_data.user_id,
+            project_id=input_data.project_id,
+            task_id=input_data.task_id
+        )
+        async for timesheet in timesheets:
+            if timesheet_matches(timesheet, filters):
+                yield timesheet
 
 
 class CreateTimesheetInput(ToolInput):
@@ -66,7 +159,9 @@ class CreateTimesheetInput(ToolInput):
 
 class CreateTimesheetOutput(ToolOutput):
     """Output model for creating a timesheet entry."""
-    timesheet: TimesheetData
+    timesheet: Optional[TimesheetData] = Field(None, description="Created entry (None while queued)")
+    status: Literal["created", "queued"] = Field("created", description="Whether the entry reached Leantime yet")
+    provisional_id: Optional[str] = Field(None, description="ID to check delivery with get_timesheet_status")
     message: str = Field("Timesheet entry created successfully")
 
 
@@ -81,12 +176,332 @@ class CreateTimesheetTool(BaseTool):
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute the tool to create a timesheet entry."""
-        timesheet = await self.client.create_timesheet(input_data)
+    async def execute(self, input_data: CreateTimesheetInput) -> Union[ToolOutput, Dict[str, Any]]:
+        """
+        Execute the tool to create a timesheet entry.
+        
+        With a write-behind queue the entry is journaled locally and
+        acknowledged with a provisional ID instead of waiting for Leantime.
+        """
+        queue = getattr(self.client, "timesheet_queue", None)
+        if queue is not None:
+            provisional_id = await queue.enqueue(input_data.model_dump())
+            
+            # Format the response according to the output model
+            return self.output(
+                input_data,
+                status="queued",
+                provisional_id=provisional_id,
+                message="Timesheet entry queued for delivery to Leantime"
+            )
+        
+        timesheet = await self.client.create_timesheet(input_data.model_dump())
+        
+        # Format the response according to the output model
+        return self.output(input_data, timesheet=timesheet, message="Timesheet entry created successfully")
+
+
+class GetTimesheetStatusInput(ToolInput):
+    """Input model for checking the delivery of queued timesheet entries."""
+    provisional_ids: List[str] = Field(
+        ..., min_length=1, max_length=500, description="Provisional IDs returned by create_timesheet"
+    )
+
+
+class TimesheetDelivery(BaseModel):
+    """Model for the delivery state of one queued timesheet entry."""
+    provisional_id: str
+    state: Literal["queued", "delivered", "failed", "unknown"]
+    attempts: int = 0
+    created_at: Optional[float] = None
+    delivered_at: Optional[float] = None
+    timesheet: Optional[TimesheetData] = None
+    last_error: Optional[str] = None
+
+
+class GetTimesheetStatusOutput(ToolOutput):
+    """Output model for checking the delivery of queued timesheet entries."""
+    enabled: bool
+    entries: List[TimesheetDelivery]
+
+
+class GetTimesheetStatusTool(BaseTool):
+    """Tool for checking whether queued timesheet entries were delivered to Leantime."""
+    
+    name = "get_timesheet_status"
+    description = (
+        "Checks whether timesheet entries queued by create_timesheet were delivered to Leantime, "
+        "returning the created entry once delivered"
+    )
+    input_model = GetTimesheetStatusInput
+    output_model = GetTimesheetStatusOutput
+    read_only = True
+    
+    def __init__(self, leantime_client: LeantimeClient):
+        self.client = leantime_client
+    
+    async def execute(self, input_data: GetTimesheetStatusInput) -> Union[ToolOutput, Dict[str, Any]]:
+        """Execute the tool to look up queued entries."""
+        queue = getattr(self.client, "timesheet_queue", None)
+        ids = input_data.provisional_ids
+        found = await queue.status(ids) if queue is not None else {}
+        
+        # Format the response according to the output model
+        return self.output(
+            input_data,
+            enabled=queue is not None,
+            entries=[found.get(provisional_id, {"provisional_id": provisional_id, "state": "unknown"}) for provisional_id in ids]
+        )
+
+
+class BulkCreateTimesheetsInput(ToolInput):
+    """Input model for creating many timesheet entries at once."""
+    timesheets: List[Dict[str, Any]] = Field(
+        ..., min_length=1, description="Entries to create, each matching create_timesheet's input"
+    )
+    concurrency: int = Field(10, ge=1, le=50, description="Maximum number of entries created at the same time")
+
+
+class BulkTimesheetResult(BulkRowResult):
+    """Model for the outcome of creating one timesheet entry."""
+    result: Optional[TimesheetData] = None
+
+
+class BulkCreateTimesheetsOutput(ToolOutput):
+    """Output model for creating many timesheet entries at once."""
+    results: List[BulkTimesheetResult]
+    created: int
+    failed: int
+
+
+class BulkCreateTimesheetsTool(BaseTool):
+    """Tool for creating many timesheet entries in Leantime at once."""
+    
+    name = "bulk_create_timesheets"
+    description = "Creates many timesheet entries in Leantime concurrently, reporting success or failure per entry"
+    input_model = BulkCreateTimesheetsInput
+    output_model = BulkCreateTimesheetsOutput
+    
+    def __init__(self, leantime_client: LeantimeClient):
+        self.client = leantime_client
+    
+    async def execute(self, input_data: BulkCreateTimesheetsInput) -> Union[ToolOutput, Dict[str, Any]]:
+        """Execute the tool to create timesheet entries."""
+        results = await run_bulk(
+            input_data.timesheets,
+            CreateTimesheetInput,
+            TimesheetData,
+            self.client.create_timesheet,
+            input_data.concurrency
+        )
+        created = sum(1 for result in results if result["success"])
+        
+        # Format the response according to the output model
+        return self.output(input_data, results=results, created=created, failed=len(results) - created)
+
+
+class SummarizeTimesheetsInput(ToolInput):
+    """Input model for summarizing timesheet entries."""
+    group_by: Literal["user", "project", "ticket", "day", "week", "month"] = Field(
+        ..., description="Dimension to group entries by"
+    )
+    user_id: Optional[int] = Field(None, description="ID of the user to filter timesheets by")
+    project_id: Optional[int] = Field(None, description="ID of the project to filter timesheets by")
+    task_id: Optional[int] = Field(None, description="ID of the task to filter timesheets by")
+    date_after: Optional[date] = Field(None, description="Only include entries on or after this date (YYYY-MM-DD)")
+    date_before: Optional[date] = Field(None, description="Only include entries on or before this date (YYYY-MM-DD)")
+    percentiles: List[float] = Field([50, 90, 95], description="Percentiles of hours per entry to compute (0-100)")
+    
+    @field_validator("percentiles")
+    @classmethod
+    def check_percentiles(cls, percentiles: List[float]) -> List[float]:
+        if any(p < 0 or p > 100 for p in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+        return percentiles
+
+
+class TimesheetGroupSummary(BaseModel):
+    """Model for the summary of one group of timesheet entries."""
+    key: Union[int, str, None]
+    entries: int
+    total_hours: float
+    mean_hours: float
+    min_hours: float
+    max_hours: float
+    percentiles: Dict[str, float]
+
+
+class SummarizeTimesheetsOutput(ToolOutput):
+    """Output model for summarizing timesheet entries."""
+    group_by: str
+    entries: int
+    total_hours: float
+    groups: List[TimesheetGroupSummary]
+
+
+_ID_COLUMNS = {"user": "userId", "project": "projectId", "ticket": "ticketId"}
+
+
+def _parse_days(values: List[str]) -> np.ndarray:
+    """Convert date strings to a datetime64[D] column, mapping unparseable dates to NaT."""
+    days = np.array([value[:10] for value in values], dtype="U10")
+    try:
+        return days.astype("datetime64[D]")
+    except ValueError:
+        return np.array([_parse_day(value) for value in days], dtype="datetime64[D]")
+
+
+def _parse_day(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, "D")
+    except ValueError:
+        return np.datetime64("NaT", "D")
+
+
+def _group_keys(timesheets: List[Dict[str, Any]], group_by: str, days: np.ndarray) -> np.ndarray:
+    """Build the integer group-key column for the requested dimension."""
+    if group_by in _ID_COLUMNS:
+        column = _ID_COLUMNS[group_by]
+        return np.fromiter(
+            (-1 if t.get(column) is None else int(t[column]) for t in timesheets),
+            dtype=np.int64,
+            count=len(timesheets)
+        )
+    
+    day_numbers = days.astype(np.int64)
+    if group_by == "day":
+        return day_numbers
+    if group_by == "week":
+        # 1970-01-01 was a Thursday; shift every day back to its ISO week's Monday
+        return day_numbers - (day_numbers + 3) % 7
+    return days.astype("datetime64[M]").astype(np.int64)
+
+
+def _group_label(group_by: str, key: int) -> Union[int, str, None]:
+    """Convert an integer group key back into its public label."""
+    if group_by in _ID_COLUMNS:
+        return None if key == -1 else int(key)
+    if group_by == "day":
+        return str(np.datetime64(int(key), "D"))
+    if group_by == "week":
+        year, week, _ = date.fromisoformat(str(np.datetime64(int(key), "D"))).isocalendar()
+        return f"{year}-W{week:02d}"
+    return str(np.datetime64(int(key), "M"))
+
+
+def summarize_hours(keys: np.ndarray,
+                    hours: np.ndarray,
+                    percentiles: List[float]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Aggregate hours per group key using whole-column operations.
+    
+    Percentiles use linear interpolation (the same method as ``np.percentile``)
+    and are computed for every group at once from a single sort.
+    
+    Args:
+        keys: Integer group key per entry
+        hours: Hours per entry
+        percentiles: Percentiles to compute (0-100)
+        
+    Returns:
+        The sorted unique keys and a dict of per-group statistic columns
+    """
+    if keys.size == 0:
+        return keys, {}
+    
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.ravel()
+    counts = np.bincount(inverse, minlength=len(unique_keys))
+    totals = np.bincount(inverse, weights=hours, minlength=len(unique_keys))
+    
+    # Sort by group, then by hours, so each group is a contiguous sorted run
+    sorted_hours = hours[np.lexsort((hours, inverse))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ends = starts + counts - 1
+    
+    stats = {
+        "entries": counts,
+        "total_hours": totals,
+        "mean_hours": totals / counts,
+        "min_hours": sorted_hours[starts],
+        "max_hours": sorted_hours[ends],
+    }
+    
+    if percentiles:
+        q = np.asarray(percentiles, dtype=np.float64) / 100
+        positions = starts[:, None] + (counts[:, None] - 1) * q[None, :]
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.ceil(positions).astype(np.int64)
+        fraction = positions - lower
+        values = sorted_hours[lower] + (sorted_hours[upper] - sorted_hours[lower]) * fraction
+        for i, p in enumerate(percentiles):
+            stats[f"p{p:g}"] = values[:, i]
+    
+    return unique_keys, stats
+
+
+class SummarizeTimesheetsTool(BaseTool):
+    """Tool for aggregating timesheet hours in Leantime."""
+    
+    name = "summarize_timesheets"
+    description = (
+        "Summarizes timesheet hours grouped by user, project, ticket, day, week or month, "
+        "with totals, means and percentiles, optionally over a date range"
+    )
+    input_model = SummarizeTimesheetsInput
+    output_model = SummarizeTimesheetsOutput
+    read_only = True
+    
+    def __init__(self, leantime_client: LeantimeClient):
+        self.client = leantime_client
+    
+    async def execute(self, input_data: SummarizeTimesheetsInput) -> Union[ToolOutput, Dict[str, Any]]:
+        """Execute the tool to summarize timesheet entries."""
+        timesheets = await self.client.get_timesheets(
+            user_id=input_data.user_id,
+            project_id=input_data.project_id,
+            task_id=input_data.task_id
+        ) or []
+        group_by = input_data.group_by
+        
+        # Build columns once, then filter and aggregate on whole arrays
+        hours = np.fromiter(
+            (float(t.get("hours") or 0) for t in timesheets), dtype=np.float64, count=len(timesheets)
+        )
+        days = _parse_days([t.get("date") or "" for t in timesheets])
+        keys = _group_keys(timesheets, group_by, days)
+        
+        mask = np.ones(len(timesheets), dtype=bool)
+        if group_by not in _ID_COLUMNS or input_data.date_after or input_data.date_before:
+            mask &= ~np.isnat(days)
+        if input_data.date_after:
+            mask &= days >= np.datetime64(input_data.date_after, "D")
+        if input_data.date_before:
+            mask &= days <= np.datetime64(input_data.date_before, "D")
+        
+        hours = hours[mask]
+        unique_keys, stats = summarize_hours(keys[mask], hours, input_data.percentiles)
+        
+        percentile_names = [f"p{p:g}" for p in input_data.percentiles]
+        columns = {name: values.tolist() for name, values in stats.items()}
+        groups = [
+            {
+                "key": _group_label(group_by, key),
+                "entries": columns["entries"][i],
+                "total_hours": columns["total_hours"][i],
+                "mean_hours": columns["mean_hours"][i],
+                "min_hours": columns["min_hours"][i],
+                "max_hours": columns["max_hours"][i],
+                "percentiles": {name: columns[name][i] for name in percentile_names},
+            }
+            for i, key in enumerate(unique_keys.tolist())
+        ]
         
         # Format the response according to the output model
-        return {
-            "timesheet": timesheet,
-            "message": "Timesheet entry created successfully"
-        }
\ No newline at end of file
+        return self.output(
+            input_data,
+            group_by=group_by,
+            entries=int(hours.size),
+            total_hours=float(hours.sum()),
+            groups=groups
+        )
\ No newline at end of file
@@ -1,7 +1,7 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Type, Union
 from pydantic import BaseModel, Field
 
-from src.app.tools.base import BaseTool, ToolInput, ToolOutput
+from src.app.tools.base import BaseTool, ListFormat, ToolInput, ToolOutput, list_output_model, list_payload
 from src.app.services.leantime_client import LeantimeClient
 
 
@@ -18,7 +18,9 @@ class UserData(BaseModel):
 
 class ListUsersInput(ToolInput):
     """Input model for listing users."""
-    pass
+    format: ListFormat = Field(
+        "rows", description="'columnar' returns one array per field instead of one object per user"
+    )
 
 
 class ListUsersOutput(ToolOutput):
@@ -33,18 +35,21 @@ class ListUsersTool(BaseTool):
     description = "Lists all users in Leantime"
     input_model = ListUsersInput
     output_model = ListUsersOutput
+    read_only = True
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def get_output_model(self, validated_input: ListUsersInput) -> Type[ToolOutput]:
+        """Return an output model for the requested format."""
+        return list_output_model(self.output_model, "users", UserData, None, validated_input.format)
+    
+    async def execute(self, input_data: ListUsersInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to list users."""
         users = await self.client.get_users()
         
         # Format the response according to the output model
-        return {
-            "users": users
-        }
+        return self.output(input_data, **list_payload("users", users, UserData, list_format=input_data.format))
 
 
 class GetUserInput(ToolInput):
@@ -64,15 +69,14 @@ class GetUserTool(BaseTool):
     description = "Gets details of a specific user in Leantime"
     input_model = GetUserInput
     output_model = GetUserOutput
+    read_only = True
     
     def __init__(self, leantime_client: LeantimeClient):
         self.client = leantime_client
     
-    async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute(self, input_data: GetUserInput) -> Union[ToolOutput, Dict[str, Any]]:
         """Execute the tool to get a user."""
-        user = await self.client.get_user(input_data["user_id"])
+        user = await self.client.get_user(input_data.user_id)
         
         # Format the response according to the output model
-        return {
-            "user": user
-        }
\ No newline at end of file
+        return self.output(input_data, user=user)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks import load, transport
+from benchmarks.stub_server import LeantimeStub
+from src.app.services.leantime_client import LeantimeClient
+
+
+def test_load_generator_covers_every_tool_without_errors():
+    """Test that every tool and /batch run cleanly against the stub."""
+    args = load.parse_args([
+        "--quiet", "--requests", "2", "--concurrency", "2", "--warmup", "0",
+        "--projects", "3", "--tasks", "20", "--users", "4", "--timesheets", "30",
+    ])
+    results = asyncio.run(load.run(args))
+
+    assert set(results["scenarios"]) == set(load.AVAILABLE_TOOLS) | {"batch"}
+    for name, metrics in results["scenarios"].items():
+        assert metrics["errors"] == 0, name
+        assert metrics["throughput_rps"] > 0
+        assert metrics["p50_ms"] <= metrics["p95_ms"] <= metrics["p99_ms"]
+        assert metrics["peak_alloc_mb"] > 0
+    assert results["meta"]["process_peak_rss_mb"] > 0
+
+
+def test_transport_benchmark_runs_every_transport():
+    """Test that REST, MCP HTTP and MCP stdio all complete their calls."""
+    results = asyncio.run(transport.run(transport.parse_args(["--calls", "5", "--concurrency", "2"])))
+
+    assert set(results) == {"rest", "mcp_http", "mcp_stdio"}
+    assert all(metrics["calls_per_s"] > 0 for metrics in results.values())
+
+
+def test_compare_reports_regressions_beyond_tolerance():
+    """Test that throughput drops and latency increases are flagged."""
+    baseline = {"scenarios": {"list_tasks": {"throughput_rps": 100, "p95_ms": 10, "p99_ms": 20}}}
+    current = {"scenarios": {"list_tasks": {"throughput_rps": 70, "p95_ms": 11, "p99_ms": 30}}}
+
+    regressions = load.compare(current, baseline, tolerance=0.2)
+
+    assert [regression.split(" ")[1] for regression in regressions] == ["throughput_rps", "p99_ms"]
+
+
+@pytest.mark.asyncio
+async def test_stub_pages_filters_and_injects_errors():
+    """Test that the stub supports paging, filters and error injection."""
+    stub = LeantimeStub(projects=2, tasks=10, users=2, timesheets=0, error_rate=0.5, seed=1)
+    transport = httpx.ASGITransport(app=stub)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://stub") as http:
+        statuses = [(await http.get("/api/tickets", params={"projectId": 1})).status_code for _ in range(20)]
+    assert {200, 503} <= set(statuses)
+
+    stub.error_rate = 0.0
+    async with LeantimeClient("http://stub", transport=transport) as client:
+        page = await client.get_tasks_page(1, limit=3)
+        tasks = await client.get_tasks(2)
+
+    assert [task["id"] for task in page.items] == [2, 4, 6]
+    assert page.next_cursor == "offset:3:2"
+    assert {task["projectId"] for task in tasks} == {2}
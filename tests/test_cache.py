@@ -0,0 +1,113 @@
+import httpx
+import pytest
+
+from src.app.services.cache import LeantimeCache, MISSING, TTLCache
+from src.app.services.leantime_client import LeantimeAPIError, LeantimeClient
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries expire after their TTL."""
+    clock = FakeClock()
+    cache = TTLCache(clock=clock)
+    cache.set("key", "value", ttl=10)
+
+    assert cache.get("key") == "value"
+    clock.now = 10
+    assert cache.get("key") is MISSING
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.fixture
+def upstream():
+    """Record upstream calls and serve canned task/project responses."""
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        if request.url.path == "/api/tickets/404":
+            return httpx.Response(404, json={"error": "not found"})
+        if request.url.path.startswith("/api/tickets"):
+            return httpx.Response(200, json={"id": 1, "title": "Task 1", "projectId": 1})
+        if request.url.path == "/api/projects":
+            return httpx.Response(200, json=[{"id": 1, "name": "Project 1"}])
+        return httpx.Response(200, json={"id": 1, "name": "Project 1"})
+
+    return calls, httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeated_lookups_from_cache(upstream):
+    """Test that repeated lookups only hit Leantime once."""
+    calls, transport = upstream
+    async with LeantimeClient("https://leantime.test", transport=transport, cache=LeantimeCache()) as client:
+        await client.get_project(1)
+        await client.get_project(1)
+        await client.get_projects()
+        await client.get_projects()
+
+    assert calls == [("GET", "/api/projects/1"), ("GET", "/api/projects")]
+    assert client.cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_caches_not_found_negatively(upstream):
+    """Test that 404s are cached and re-raised without an upstream call."""
+    calls, transport = upstream
+    async with LeantimeClient("https://leantime.test", transport=transport, cache=LeantimeCache()) as client:
+        for _ in range(2):
+            with pytest.raises(LeantimeAPIError) as exc_info:
+                await client.get_task(404)
+            assert exc_info.value.status_code == 404
+
+    assert calls == [("GET", "/api/tickets/404")]
+
+
+@pytest.mark.asyncio
+async def test_client_writes_invalidate_affected_keys(upstream):
+    """Test that writes invalidate only the affected cache entries."""
+    calls, transport = upstream
+    async with LeantimeClient("https://leantime.test", transport=transport, cache=LeantimeCache()) as client:
+        await client.get_task(1)
+        await client.get_task(2)
+        await client.update_task(1, {"title": "Updated"})
+        await client.get_task(1)
+        await client.get_task(2)
+
+        await client.get_projects()
+        await client.update_project(1, {"name": "Renamed"})
+        await client.get_projects()
+
+    assert calls == [
+        ("GET", "/api/tickets/1"),
+        ("GET", "/api/tickets/2"),
+        ("PUT", "/api/tickets/1"),
+        ("GET", "/api/tickets/1"),
+        ("GET", "/api/projects"),
+        ("PUT", "/api/projects/1"),
+        ("GET", "/api/projects"),
+    ]
@@ -0,0 +1,51 @@
+import pytest
+
+from src.app.services import json_codec
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    """Restore the active backend after each test."""
+    backend = json_codec.get_backend()
+    yield
+    json_codec._backend = backend
+
+
+@pytest.mark.parametrize("name", sorted(json_codec.BACKENDS))
+def test_backends_round_trip(name):
+    """Test that every installed backend parses and renders the same documents."""
+    json_codec.set_backend(name)
+    document = {"tasks": [{"id": 1, "title": "Ünïcode", "hours": 1.5, "tags": None}], "count": 1}
+
+    assert json_codec.loads(json_codec.dumps(document)) == document
+    assert json_codec.loads(json_codec.dumps(document).decode()) == document
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(b"<html>")
+
+
+def test_stdlib_backend_never_renders_invalid_json():
+    """Test that the stdlib backend refuses NaN and Infinity instead of emitting invalid JSON."""
+    json_codec.set_backend("stdlib")
+
+    for value in (float("nan"), float("inf")):
+        with pytest.raises(ValueError):
+            json_codec.dumps({"hours": value})
+
+
+def test_missing_backend_falls_back_to_stdlib(monkeypatch):
+    """Test that requesting an uninstalled backend falls back to the standard library."""
+    monkeypatch.setattr(json_codec, "BACKENDS", {"stdlib": json_codec.BACKENDS["stdlib"]})
+
+    assert json_codec.set_backend("orjson").name == "stdlib"
+    assert json_codec.set_backend("auto").name == "stdlib"
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        json_codec.set_backend("simdjson")
+
+
+@pytest.mark.skipif("orjson" not in json_codec.BACKENDS, reason="orjson is not installed")
+def test_orjson_falls_back_for_unsupported_values():
+    """Test that values orjson cannot encode are rendered by the standard library."""
+    json_codec.set_backend("orjson")
+
+    assert json_codec.dumps({"id": 2 ** 70}) == b'{"id":1180591620717411303424}'
+    assert json_codec.dumps({1: "a"}) == b'{"1":"a"}'
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from src.app.services.json_stream import iter_json_array
+
+
+async def chunked(text, size):
+    """Yield ``text`` in fixed-size chunks."""
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+async def collect(chunks):
+    return [item async for item in iter_json_array(chunks)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+async def test_iter_json_array_handles_any_chunking(size):
+    """Test that items are parsed correctly regardless of chunk boundaries."""
+    items = [
+        {"id": 1, "title": "Task, with [brackets]", "tags": ["a", "b"]},
+        {"id": 2, "title": "Escaped \"quote\"", "storyPoints": 123},
+        123456,
+        "plain",
+        None,
+    ]
+    assert await collect(chunked(json.dumps(items, indent=2), size)) == items
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunks, expected", [
+    (["[1.", "5]"], [1.5]),
+    (["[1.5e", "3]"], [1500.0]),
+    (["[12", "3, tr", "ue, -", "4]"], [123, True, -4]),
+    (['["a\\', '"b"]'], ['a"b']),
+])
+async def test_iter_json_array_handles_values_split_across_chunks(chunks, expected):
+    """Test that scalars and escapes split at a chunk boundary are not cut short."""
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    assert await collect(source()) == expected
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_handles_empty_array():
+    """Test that an empty array yields nothing."""
+    assert await collect(chunked(" [ ] ", 1)) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_rejects_truncated_body():
+    """Test that a truncated body raises instead of silently dropping items."""
+    with pytest.raises(json.JSONDecodeError):
+        await collect(chunked('[{"id": 1}, {"id": 2', 4))
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_rejects_non_array():
+    """Test that a non-array body is reported."""
+    with pytest.raises(ValueError):
+        await collect(chunked('{"tasks": []}', 4))
@@ -0,0 +1,265 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.app.services.cache import ConditionalCache
+from src.app.services.leantime_client import InvalidCursorError, LeantimeAPIError, LeantimeClient
+
+
+def make_client(handler, **kwargs):
+    """Create a Leantime client backed by a mock transport."""
+    return LeantimeClient(
+        base_url="https://leantime.test",
+        api_key="secret",
+        transport=httpx.MockTransport(handler),
+        **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_single_session():
+    """Test that an opened client keeps one pooled session across calls."""
+    def handler(request):
+        return httpx.Response(200, json={"id": 1, "name": "Project 1"})
+
+    client = make_client(handler, max_connections=5, keepalive_expiry=30.0)
+    await client.open()
+    session = client.session
+
+    await client.get_project(1)
+    await client.get_project(1)
+
+    assert client.session is session
+    assert client.limits.max_connections == 5
+    assert client.limits.keepalive_expiry == 30.0
+
+    await client.aclose()
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_client_http2_falls_back_without_h2(monkeypatch):
+    """Test that HTTP/2 is disabled when the h2 package is unavailable."""
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    client = LeantimeClient(base_url="https://leantime.test", http2=True)
+    assert client.http2 is False
+
+
+@pytest.mark.asyncio
+async def test_client_drains_in_flight_requests_on_close():
+    """Test that aclose waits for in-flight requests before closing the pool."""
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"id": 1, "name": "Project 1"})
+
+    client = make_client(handler)
+    await client.open()
+
+    pending = asyncio.create_task(client.get_project(1))
+    await asyncio.sleep(0)
+    closing = asyncio.create_task(client.aclose(drain_timeout=1.0))
+    await asyncio.sleep(0)
+    assert not closing.done()
+
+    release.set()
+    assert (await pending)["id"] == 1
+    await closing
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_identical_concurrent_gets():
+    """Test that identical concurrent GETs share one upstream request."""
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"id": 1, "title": "Task 1", "projectId": 7}])
+
+    async with make_client(handler) as client:
+        results = await asyncio.gather(*(client.get_tasks(7) for _ in range(5)))
+        await client.get_tasks(8)
+
+    assert len(calls) == 2
+    assert all(result == results[0] for result in results)
+    assert (await client.stats())["single_flight"] == {"upstream": 2, "collapsed": 4}
+
+
+@pytest.mark.asyncio
+async def test_client_shares_errors_with_coalesced_waiters():
+    """Test that every coalesced waiter receives the upstream error."""
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(500, json={"error": "boom"})
+
+    async with make_client(handler) as client:
+        results = await asyncio.gather(*(client.get_tasks(7) for _ in range(3)), return_exceptions=True)
+
+    assert len(calls) == 1
+    assert all(isinstance(result, LeantimeAPIError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_client_does_not_coalesce_writes():
+    """Test that non-GET requests are always sent individually."""
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(200, json={"id": 1, "title": "Task 1", "projectId": 7})
+
+    async with make_client(handler) as client:
+        await asyncio.gather(*(client.create_task({"title": "Task 1", "projectId": 7}) for _ in range(3)))
+
+    assert calls == ["POST", "POST", "POST"]
+
+
+def paged_tasks_handler(total, calls):
+    """Serve ``total`` tasks using offset/limit pagination."""
+    def handler(request):
+        limit = int(request.url.params["limit"])
+        offset = int(request.url.params["offset"])
+        calls.append(offset)
+        items = [{"id": i, "title": f"Task {i}", "projectId": 1} for i in range(offset, min(offset + limit, total))]
+        return httpx.Response(200, json=items)
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_iter_tasks_walks_all_offset_pages():
+    """Test that iter_tasks follows offset pages until a short page."""
+    calls = []
+    async with make_client(paged_tasks_handler(25, calls), page_size=10) as client:
+        ids = [task["id"] async for task in client.iter_tasks(project_id=1)]
+
+    assert ids == list(range(25))
+    assert calls == [0, 10, 20]
+
+
+@pytest.mark.asyncio
+async def test_iter_pages_prefetches_next_page():
+    """Test that the next page is requested before the current one is consumed."""
+    calls = []
+    async with make_client(paged_tasks_handler(30, calls), page_size=10) as client:
+        pages = client._iter_pages("/api/tickets", {"projectId": 1})
+        first = await pages.__anext__()
+        await asyncio.sleep(0.01)
+        assert len(first.items) == 10
+        assert calls == [0, 10]
+        await pages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_iter_tasks_follows_upstream_cursor():
+    """Test that cursor-style responses are followed via their next cursor."""
+    pages = {
+        None: {"items": [{"id": 1}, {"id": 2}], "nextCursor": "abc"},
+        "abc": {"items": [{"id": 3}], "nextCursor": None},
+    }
+
+    def handler(request):
+        return httpx.Response(200, json=pages[request.url.params.get("cursor")])
+
+    async with make_client(handler) as client:
+        ids = [task["id"] async for task in client.iter_tasks()]
+
+    assert ids == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_page_returns_next_cursor():
+    """Test that a full page returns a cursor and the last page does not."""
+    calls = []
+    async with make_client(paged_tasks_handler(15, calls)) as client:
+        first = await client.get_tasks_page(1, limit=10)
+        second = await client.get_tasks_page(1, limit=10, cursor=first.next_cursor)
+
+    assert len(first.items) == 10 and first.next_cursor is not None
+    assert len(second.items) == 5 and second.next_cursor is None
+
+
+def unpaged_tasks_handler(total, calls):
+    """Serve all ``total`` tasks on every request, ignoring limit/offset."""
+    def handler(request):
+        calls.append(request.url.params.get("offset"))
+        return httpx.Response(200, json=[{"id": i, "title": f"Task {i}", "projectId": 1} for i in range(total)])
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_iter_tasks_stops_when_an_unpaged_list_fills_a_page():
+    """Test that a repeated page ends iteration instead of looping forever."""
+    calls = []
+    async with make_client(unpaged_tasks_handler(10, calls), page_size=10) as client:
+        ids = [task["id"] async for task in client.iter_tasks(project_id=1)]
+
+    assert ids == list(range(10))
+    assert len(calls) <= 3
+
+
+@pytest.mark.asyncio
+async def test_unpaged_lists_are_windowed_to_the_limit():
+    """Test that an endpoint returning everything is sliced to the page limit."""
+    calls = []
+    async with make_client(unpaged_tasks_handler(25, calls), page_size=10) as client:
+        first = await client.get_tasks_page(1, limit=10)
+        second = await client.get_tasks_page(1, limit=10, cursor=first.next_cursor)
+        third = await client.get_tasks_page(1, limit=10, cursor=second.next_cursor)
+        ids = [task["id"] async for task in client.iter_tasks(project_id=1)]
+
+    assert [task["id"] for task in first.items + second.items + third.items] == list(range(25))
+    assert third.next_cursor is None
+    assert ids == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_unpaged_list_filling_one_page_ends_after_it():
+    """Test that paging an unpaged list of exactly ``limit`` items neither loops nor repeats items."""
+    calls = []
+    async with make_client(unpaged_tasks_handler(5, calls)) as client:
+        first = await client.get_tasks_page(1, limit=5)
+        second = await client.get_tasks_page(1, limit=5, cursor=first.next_cursor)
+
+    assert [task["id"] for task in first.items] == list(range(5))
+    assert second.items == [] and second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_malformed_offset_cursor_is_rejected():
+    """Test that a cursor this server did not issue raises InvalidCursorError."""
+    async with make_client(unpaged_tasks_handler(5, [])) as client:
+        with pytest.raises(InvalidCursorError):
+            await client.get_tasks_page(1, limit=5, cursor="offset:abc")
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_reuses_body_on_304():
+    """Test that validators are sent back and a 304 is answered with the remembered body."""
+    seen = []
+
+    def handler(request):
+        seen.append((request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since")))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            json={"id": 1, "name": "Project 1"},
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        )
+
+    client = make_client(handler, conditional_cache=ConditionalCache(max_entries=8))
+    async with client:
+        first = await client.get_project(1)
+        second = await client.get_project(1)
+
+    assert first == second == {"id": 1, "name": "Project 1"}
+    assert seen == [(None, None), ('"v1"', "Mon, 01 Jan 2024 00:00:00 GMT")]
+    assert (await client.stats())["conditional"]["not_modified"] == 1
+
@@ -1,6 +1,13 @@
+import asyncio
+import json
+import time
+import httpx
 import pytest
+from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
-from src.app.main import app
+from src.app.main import app, get_leantime_client
+from src.app.services.leantime_client import LeantimeClient
+from src.app.tools import AVAILABLE_TOOLS
 
 client = TestClient(app)
 
@@ -17,4 +24,292 @@ def test_tools_endpoint():
     assert "tools" in response_data
     assert isinstance(response_data["tools"], list)
     # Verify that at least one tool is included
-    assert len(response_data["tools"]) > 0
\ No newline at end of file
+    assert len(response_data["tools"]) > 0
+
+def test_tools_manifest_has_schemas_and_etag():
+    """Test that /tools serves input/output schemas and honors If-None-Match."""
+    response = client.get("/tools")
+    get_user = next(tool for tool in response.json()["tools"] if tool["name"] == "get_user")
+    assert "user_id" in get_user["input_schema"]["properties"]
+    assert "user" in get_user["output_schema"]["properties"]
+    list_tasks = next(tool for tool in response.json()["tools"] if tool["name"] == "list_tasks")
+    assert "output_schema" not in list_tasks
+
+    etag = response.headers["ETag"]
+    cached = client.get("/tools", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    listed = client.get("/tools", headers={"If-None-Match": f'"stale", {etag}'})
+    assert listed.status_code == 304
+    assert client.get("/tools", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_read_only_tool_honors_if_none_match():
+    """Test that read-only tools emit an ETag and answer a matching If-None-Match with 304."""
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "jdoe@example.com"}
+    mock_client.create_task.return_value = {"id": 7}
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        body = {"name": "get_user", "input": {"user_id": 1}}
+        first = client.post("/tools/get_user", json=body)
+        etag = first.headers["ETag"]
+
+        cached = client.post("/tools/get_user", json=body, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+
+        mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "new@example.com"}
+        changed = client.post("/tools/get_user", json=body, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+        created = client.post("/tools/create_task", json={"name": "create_task", "input": {"title": "T", "projectId": 1}})
+        assert "ETag" not in created.headers
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_malformed_cursor_is_a_bad_request():
+    """Test that a cursor this server did not issue is answered with 400."""
+    leantime = LeantimeClient("https://leantime.test", transport=httpx.MockTransport(lambda request: httpx.Response(200, json=[])))
+    app.dependency_overrides[get_leantime_client] = lambda: leantime
+    try:
+        response = client.post("/tools/list_tasks", json={"name": "list_tasks", "input": {"limit": 5, "cursor": "offset:abc"}})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+
+
+def test_invalid_tool_input_is_unprocessable():
+    """Test that tool input failing validation is answered with 422, not 500."""
+    mock_client = AsyncMock(spec=LeantimeClient)
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        response = client.post("/tools/list_tasks", json={"name": "list_tasks", "input": {"due_after": "tomorrow"}})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["due_after"]
+    mock_client.get_tasks.assert_not_called()
+
+
+def test_lifespan_shares_leantime_client():
+    """Test that the lifespan hook opens one client that is closed on shutdown."""
+    AVAILABLE_TOOLS._manifest = None
+    with TestClient(app) as lifespan_client:
+        # The manifest is rendered in the background, without a /tools request
+        for _ in range(200):
+            if AVAILABLE_TOOLS._manifest is not None:
+                break
+            time.sleep(0.01)
+        assert AVAILABLE_TOOLS._manifest is not None
+        shared = app.state.leantime_client
+        assert shared.session is not None
+        lifespan_client.get("/")
+        assert app.state.leantime_client is shared
+    assert shared.session is None
+
+
+def test_batch_reports_unknown_tool_per_item():
+    """Test that an unknown tool becomes a per-item error instead of a 404."""
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "jdoe@example.com"}
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        response = client.post("/batch", json=[
+            {"name": "does_not_exist", "input": {}},
+            {"name": "get_user", "input": {"user_id": 1}},
+        ])
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["tool"] == "does_not_exist"
+    assert "not found" in results[0]["error"]
+    assert results[1]["output"]["user"]["username"] == "jdoe"
+    assert all("duration_ms" in result for result in results)
+
+
+@pytest.mark.parametrize("sequential", [False, True])
+def test_batch_preserves_request_order(sequential):
+    """Test that batch results come back in request order in both modes."""
+    async def get_user(user_id):
+        # Later items finish first when run concurrently
+        await asyncio.sleep(0.01 * (5 - user_id))
+        return {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com"}
+
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.side_effect = get_user
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        response = client.post(
+            "/batch",
+            params={"sequential": sequential},
+            json=[{"name": "get_user", "input": {"user_id": i}} for i in range(1, 5)],
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    ids = [result["output"]["user"]["id"] for result in response.json()["results"]]
+    assert ids == [1, 2, 3, 4]
+
+
+def test_stream_tool_emits_ndjson():
+    """Test that list_tasks can be streamed as NDJSON."""
+    tasks = [{"id": i, "title": f"Task {i}", "projectId": 1} for i in range(1, 4)]
+
+    async def body():
+        text = json.dumps(tasks)
+        for i in range(0, len(text), 5):
+            yield text[i:i + 5].encode()
+
+    def handler(request):
+        assert request.url.params["projectId"] == "1"
+        return httpx.Response(200, content=body())
+
+    stream_client = LeantimeClient("https://leantime.test", transport=httpx.MockTransport(handler))
+    asyncio.run(stream_client.open())
+
+    app.dependency_overrides[get_leantime_client] = lambda: stream_client
+    try:
+        response = client.post("/tools/list_tasks/stream", json={"name": "list_tasks", "input": {"project_id": 1}})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [1, 2, 3]
+    assert lines[0]["description"] is None
+
+
+def test_stream_tool_rejects_non_list_tools():
+    """Test that tools without streaming support are rejected."""
+    mock_client = AsyncMock(spec=LeantimeClient)
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        response = client.post("/tools/get_task/stream", json={"name": "get_task", "input": {"task_id": 1}})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 400
+    assert "does not support streaming" in response.json()["detail"]
+    mock_client.get_task.assert_not_called()
+
+
+def test_metrics_endpoint_reports_tool_calls_and_batch_sizes():
+    """Test that tool outcomes and batch sizes show up at /metrics."""
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "jdoe@example.com"}
+    mock_client.get_task.side_effect = RuntimeError("boom")
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        client.post("/tools/get_user", json={"name": "get_user", "input": {"user_id": 1}})
+        client.post("/batch", json=[
+            {"name": "get_user", "input": {"user_id": 1}},
+            {"name": "get_task", "input": {"task_id": 1}},
+        ])
+    finally:
+        app.dependency_overrides.clear()
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    lines = response.text.splitlines()
+    assert any(line.startswith('mcp_tool_requests_total{tenant="default",tool="get_user",status="ok"}') for line in lines)
+    assert any(line.startswith('mcp_tool_errors_total{tenant="default",tool="get_task",error="RuntimeError"}') for line in lines)
+    assert any(line.startswith('mcp_tool_duration_seconds_bucket{tenant="default",tool="get_user",le="0.005"}') for line in lines)
+    assert 'mcp_tool_in_flight{tenant="default",tool="get_user"} 0' in lines
+    assert any(line.startswith('mcp_batch_size_bucket{le="2"}') for line in lines)
+
+
+def test_tool_response_has_server_timing_phases():
+    """Test that tool and batch responses break their time down by phase."""
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "jdoe@example.com"}
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        response = client.post("/tools/get_user", json={"name": "get_user", "input": {"user_id": 1}})
+        batch_response = client.post("/batch", json=[{"name": "get_user", "input": {"user_id": 1}}])
+    finally:
+        app.dependency_overrides.clear()
+
+    for timed in (response, batch_response):
+        phases = [entry.split(";")[0] for entry in timed.headers["Server-Timing"].split(", ")]
+        assert phases == ["input", "output", "serialize", "total"]
+    assert "X-MCP-Profile-Id" not in response.headers
+
+
+def test_profile_header_captures_and_stores_a_profile(monkeypatch):
+    """Test that an authorized debug header stores a cProfile capture for retrieval."""
+    monkeypatch.setattr("src.app.main.MCP_PROFILE_TOKEN", "secret")
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "jdoe@example.com"}
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    try:
+        unauthorized = client.post(
+            "/tools/get_user", json={"name": "get_user", "input": {"user_id": 1}}, headers={"X-MCP-Profile": "wrong"}
+        )
+        response = client.post(
+            "/tools/get_user", json={"name": "get_user", "input": {"user_id": 1}}, headers={"X-MCP-Profile": "secret"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert "X-MCP-Profile-Id" not in unauthorized.headers
+    profile_id = response.headers["X-MCP-Profile-Id"]
+    assert response.headers["X-MCP-Profile-Concurrent"] == "0"
+
+    assert client.get("/debug/profiles").status_code == 403
+    listed = client.get("/debug/profiles", headers={"X-MCP-Profile": "secret"}).json()["profiles"]
+    assert listed[0]["id"] == profile_id
+    assert listed[0]["label"] == "get_user"
+
+    report = client.get(f"/debug/profiles/{profile_id}?sort=tottime", headers={"X-MCP-Profile": "secret"})
+    assert report.status_code == 200
+    assert "function calls" in report.text
+    assert report.text.startswith("Captured while 0 other request(s) ran on the event loop")
+    assert client.get("/debug/profiles/missing", headers={"X-MCP-Profile": "secret"}).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_reports_requests_that_ran_during_the_capture(monkeypatch):
+    """Test that requests overlapping a capture are counted, since cProfile records their work too."""
+    monkeypatch.setattr("src.app.main.MCP_PROFILE_TOKEN", "secret")
+    release = asyncio.Event()
+
+    async def get_user(user_id):
+        await release.wait()
+        return {"id": user_id, "username": "jdoe", "email": "jdoe@example.com"}
+
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.side_effect = get_user
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    body = {"name": "get_user", "input": {"user_id": 1}}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            profiled = asyncio.create_task(http.post("/tools/get_user", json=body, headers={"X-MCP-Profile": "secret"}))
+            others = [asyncio.create_task(http.post("/tools/get_user", json=body)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            release.set()
+            response = await profiled
+            await asyncio.gather(*others)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.headers["X-MCP-Profile-Concurrent"] == "2"
+    listed = client.get("/debug/profiles", headers={"X-MCP-Profile": "secret"}).json()["profiles"]
+    assert listed[0]["concurrent_requests"] == 2
+
+
+def test_profiles_are_hidden_when_profiling_is_disabled():
+    """Test that the debug endpoints do not exist without a configured token."""
+    assert client.get("/debug/profiles", headers={"X-MCP-Profile": ""}).status_code == 404
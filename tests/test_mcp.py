@@ -0,0 +1,186 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import mcp
+from src.app.main import app, get_leantime_client, mcp_server
+from src.app.services.leantime_client import LeantimeClient
+
+client = TestClient(app)
+
+
+def rpc(request_id, method, params=None):
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return message
+
+
+@pytest.fixture
+def leantime():
+    mock_client = AsyncMock(spec=LeantimeClient)
+    mock_client.get_user.return_value = {"id": 1, "username": "jdoe", "email": "jdoe@example.com"}
+    app.dependency_overrides[get_leantime_client] = lambda: mock_client
+    yield mock_client
+    app.dependency_overrides.clear()
+
+
+def test_http_initialize_list_and_call(leantime):
+    """Test the MCP handshake, tool listing and a tool call over streamable HTTP."""
+    init = client.post("/mcp", json=rpc(1, "initialize", {"protocolVersion": "2025-03-26"})).json()
+    assert init["result"]["protocolVersion"] == "2025-03-26"
+    assert "tools" in init["result"]["capabilities"]
+
+    assert client.post("/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"}).status_code == 202
+
+    tools = client.post("/mcp", json=rpc(2, "tools/list")).json()["result"]["tools"]
+    get_user = next(tool for tool in tools if tool["name"] == "get_user")
+    assert "user_id" in get_user["inputSchema"]["properties"]
+    assert get_user["annotations"]["readOnlyHint"] is True
+    assert "user" in get_user["outputSchema"]["properties"]
+    # Projected and columnar results would not match a fixed schema
+    assert "outputSchema" not in next(tool for tool in tools if tool["name"] == "list_tasks")
+
+    result = client.post("/mcp", json=rpc(3, "tools/call", {"name": "get_user", "arguments": {"user_id": 1}})).json()
+    assert result["result"]["isError"] is False
+    assert result["result"]["structuredContent"]["user"]["username"] == "jdoe"
+    assert json.loads(result["result"]["content"][0]["text"]) == result["result"]["structuredContent"]
+
+
+def test_http_errors(leantime):
+    """Test protocol errors and tool failures."""
+    assert client.post("/mcp", content=b"{not json").json()["error"]["code"] == mcp.PARSE_ERROR
+    assert client.post("/mcp", json=rpc(1, "nope")).json()["error"]["code"] == mcp.METHOD_NOT_FOUND
+    unknown = client.post("/mcp", json=rpc(2, "tools/call", {"name": "missing"})).json()
+    assert unknown["error"]["code"] == mcp.INVALID_PARAMS
+
+    leantime.get_user.side_effect = Exception("Leantime is down")
+    failed = client.post("/mcp", json=rpc(3, "tools/call", {"name": "get_user", "arguments": {"user_id": 1}})).json()
+    assert failed["result"]["isError"] is True
+    assert "Leantime is down" in failed["result"]["content"][0]["text"]
+
+
+def test_http_batch_streams_sse(leantime):
+    """Test that a batch accepting SSE is answered with one event per response."""
+    batch = [rpc(i, "tools/call", {"name": "get_user", "arguments": {"user_id": 1}}) for i in range(3)]
+    response = client.post("/mcp", json=batch, headers={"Accept": "application/json, text/event-stream"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert sorted(event["id"] for event in events) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stdio_pipelines_and_cancels():
+    """Test that stdio requests run concurrently and can be cancelled."""
+    release = asyncio.Event()
+    leantime = AsyncMock(spec=LeantimeClient)
+
+    async def get_user(user_id):
+        if user_id == 2:
+            await release.wait()
+        return {"id": user_id, "username": f"user{user_id}", "email": "user@example.com"}
+
+    leantime.get_user.side_effect = get_user
+
+    reader = asyncio.StreamReader()
+    lines = []
+    session = asyncio.create_task(mcp.serve_stdio(mcp_server, leantime, reader, lines.append))
+    for request_id, user_id in ((1, 2), (2, 3), (3, 2)):
+        reader.feed_data(json.dumps(rpc(request_id, "tools/call", {"name": "get_user", "arguments": {"user_id": user_id}})).encode() + b"\n")
+    await asyncio.sleep(0.05)
+
+    # Request 2 overtakes the blocked request 1
+    assert [json.loads(line)["id"] for line in lines] == [2]
+
+    reader.feed_data(json.dumps({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 3}}).encode() + b"\n")
+    await asyncio.sleep(0.01)
+    release.set()
+    reader.feed_eof()
+    await session
+
+    assert [json.loads(line)["id"] for line in lines] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_bounded_and_cancelled_when_abandoned():
+    """Test that batch messages run with bounded concurrency and stop when the consumer goes away."""
+    running, peak, cancelled = 0, 0, []
+
+    async def run_tool(name, arguments, leantime_client):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            await asyncio.sleep(0.01 if arguments["user_id"] == 0 else 1)
+        except asyncio.CancelledError:
+            cancelled.append(arguments["user_id"])
+            raise
+        finally:
+            running -= 1
+        return {"user": {"id": arguments["user_id"]}}
+
+    server = mcp.MCPServer(run_tool, {"get_user": mcp_server.tools["get_user"]}, batch_concurrency=2)
+    batch = [rpc(i, "tools/call", {"name": "get_user", "arguments": {"user_id": i}}) for i in range(5)]
+
+    responses = server.handle_as_completed(batch, None)
+    assert (await responses.__anext__())["id"] == 0
+    await responses.aclose()
+    await asyncio.sleep(0)
+
+    assert peak == 2
+    assert sorted(cancelled) == [1, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("malformed", [
+    {"jsonrpc": "2.0", "id": [1], "method": "ping"},
+    {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": [1]},
+    {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": [1]}},
+])
+async def test_stdio_survives_malformed_ids_and_cancellations(malformed):
+    """Test that an unhashable id or malformed cancellation does not end the session."""
+    reader = asyncio.StreamReader()
+    lines = []
+    session = asyncio.create_task(mcp.serve_stdio(mcp_server, AsyncMock(spec=LeantimeClient), reader, lines.append))
+    reader.feed_data(json.dumps(malformed).encode() + b"\n")
+    reader.feed_data(json.dumps(rpc(2, "ping")).encode() + b"\n")
+    reader.feed_eof()
+    await session
+
+    responses = {json.loads(line)["id"]: json.loads(line) for line in lines}
+    assert "result" in responses[2]
+    if "id" in malformed:
+        assert responses[None]["error"]["code"] == mcp.INVALID_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_stdio_cancels_the_latest_request_reusing_an_id():
+    """Test that a finished request does not unregister a newer request with the same ID."""
+    release = asyncio.Event()
+    leantime = AsyncMock(spec=LeantimeClient)
+
+    async def get_user(user_id):
+        if user_id == 2:
+            await release.wait()
+        return {"id": user_id, "username": f"user{user_id}", "email": "user@example.com"}
+
+    leantime.get_user.side_effect = get_user
+
+    reader = asyncio.StreamReader()
+    lines = []
+    session = asyncio.create_task(mcp.serve_stdio(mcp_server, leantime, reader, lines.append))
+    for user_id in (3, 2):
+        reader.feed_data(json.dumps(rpc(1, "tools/call", {"name": "get_user", "arguments": {"user_id": user_id}})).encode() + b"\n")
+    await asyncio.sleep(0.05)
+
+    reader.feed_data(json.dumps({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1}}).encode() + b"\n")
+    await asyncio.sleep(0.01)
+    release.set()
+    reader.feed_eof()
+    await session
+
+    assert [json.loads(line)["result"]["structuredContent"]["user"]["id"] for line in lines] == [3]
@@ -0,0 +1,68 @@
+import httpx
+import pytest
+
+from src.app.services.leantime_client import LeantimeClient
+from src.app.services.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+    UPSTREAM_DURATION,
+    UPSTREAM_IN_FLIGHT,
+    endpoint_label,
+)
+
+
+def test_registry_renders_prometheus_text_format():
+    """Test the exposition of counters, gauges and histograms."""
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ("tool",)))
+    in_flight = registry.register(Gauge("in_flight", "In flight"))
+    latency = registry.register(Histogram("latency_seconds", "Latency", ("tool",), buckets=(0.1, 1)))
+
+    requests.inc('say "hi"')
+    requests.inc('say "hi"', amount=2)
+    in_flight.inc()
+    latency.observe(0.1, "a")
+    latency.observe(0.5, "a")
+    latency.observe(3, "a")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{tool="say \\"hi\\""} 3' in lines
+    assert "in_flight 1" in lines
+    assert 'latency_seconds_bucket{tool="a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{tool="a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{tool="a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{tool="a"} 3.6' in lines
+    assert 'latency_seconds_count{tool="a"} 3' in lines
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(Counter("requests_total", "Duplicate"))
+
+
+def test_endpoint_label_collapses_ids():
+    """Test that numeric path segments do not create one series per entity."""
+    assert endpoint_label("/api/tickets/42") == "/api/tickets/{id}"
+    assert endpoint_label("/api/projects/7/tickets/9") == "/api/projects/{id}/tickets/{id}"
+    assert endpoint_label("/api/v2/users") == "/api/v2/users"
+
+
+@pytest.mark.asyncio
+async def test_client_records_upstream_latency_by_endpoint_and_status():
+    """Test that every upstream attempt is observed with its status."""
+    def handler(request):
+        return httpx.Response(404 if request.url.path.endswith("/9") else 200, json={"id": 1})
+
+    before_ok = UPSTREAM_DURATION.count("default", "GET", "/api/tickets/{id}", "200")
+    before_missing = UPSTREAM_DURATION.count("default", "GET", "/api/tickets/{id}", "404")
+
+    async with LeantimeClient("https://leantime.test", transport=httpx.MockTransport(handler)) as client:
+        await client.get_task(1)
+        with pytest.raises(Exception):
+            await client.get_task(9)
+
+    assert UPSTREAM_DURATION.count("default", "GET", "/api/tickets/{id}", "200") == before_ok + 1
+    assert UPSTREAM_DURATION.count("default", "GET", "/api/tickets/{id}", "404") == before_missing + 1
+    assert UPSTREAM_IN_FLIGHT.value("default") == 0
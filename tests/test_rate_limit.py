@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.app.services.leantime_client import LeantimeClient
+from src.app.services.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Clock advanced by the patched asyncio.sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make asyncio.sleep in the limiter advance a fake clock instead of waiting."""
+    fake = FakeClock()
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        fake.now += delay
+        await real_sleep(0)
+
+    monkeypatch.setattr("src.app.services.rate_limit.asyncio.sleep", fake_sleep)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_bucket_queues_callers_at_configured_rate(clock):
+    """Test that callers beyond the burst are queued, not rejected."""
+    bucket = TokenBucket(rate=10, burst=2, clock=clock)
+
+    await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+
+    # Two requests fit in the burst, the remaining four are spaced 0.1s apart
+    assert clock.now == pytest.approx(0.4)
+    assert bucket.stats()["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bucket_halves_rate_on_throttle_and_recovers(clock):
+    """Test AIMD adaptation of the refill rate."""
+    bucket = TokenBucket(rate=10, burst=1, increase=1, clock=clock)
+
+    bucket.on_throttled(retry_after=3)
+    assert bucket.rate == 5
+    await bucket.acquire()
+    assert clock.now >= 3
+
+    bucket.on_success()
+    bucket.on_success()
+    assert bucket.rate == 7
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == 10
+
+
+@pytest.mark.asyncio
+async def test_waiting_callers_follow_later_rate_changes_and_pauses(clock):
+    """Test that a caller already waiting picks up a recovered rate or a new pause."""
+    bucket = TokenBucket(rate=10, burst=1, min_rate=0.1, clock=clock)
+    bucket.tokens = 0.0
+    bucket.rate = 0.1
+
+    waiter = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    bucket.rate = 10
+    await waiter
+    assert clock.now < 1
+
+    bucket.tokens = 0.0
+    waiter = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    bucket.block_for(5)
+    await waiter
+    assert clock.now >= 5
+    assert bucket.stats()["waited_seconds"] == pytest.approx(clock.now)
+
+
+def test_limiter_separates_read_and_write_budgets(clock):
+    """Test that reads and writes draw from different buckets."""
+    limiter = RateLimiter(read_rate=10, write_rate=2, clock=clock)
+
+    limiter.observe("POST", httpx.Response(429))
+    assert limiter.write.rate == 1
+    assert limiter.read.rate == 10
+
+
+def test_limiter_pauses_when_remaining_budget_is_zero(clock):
+    """Test that a zero RateLimit-Remaining pauses until the reset."""
+    limiter = RateLimiter(read_rate=10, write_rate=2, clock=clock)
+
+    limiter.observe("GET", httpx.Response(200, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"}))
+
+    assert limiter.read.blocked_until == pytest.approx(5)
+
+
+def test_limiter_caps_long_pauses(clock):
+    """Test that a huge Retry-After or reset only pauses the bucket up to max_block."""
+    limiter = RateLimiter(read_rate=10, write_rate=2, max_block=30, clock=clock)
+
+    limiter.observe("POST", httpx.Response(429, headers={"Retry-After": "86400"}))
+    limiter.observe("GET", httpx.Response(200, headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "3600"}))
+
+    assert limiter.write.blocked_until == pytest.approx(30)
+    assert limiter.read.blocked_until == pytest.approx(30)
+
+
+@pytest.mark.asyncio
+async def test_client_acquires_tokens_per_request(clock):
+    """Test that the client draws a token for every upstream request."""
+    limiter = RateLimiter(read_rate=1, write_rate=1, clock=clock)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+
+    async with LeantimeClient("https://leantime.test", transport=transport,
+                              rate_limiter=limiter, single_flight=False) as client:
+        await asyncio.gather(*(client.get_users() for _ in range(3)))
+
+    assert clock.now == pytest.approx(2)
+    assert (await client.stats())["rate_limit"]["read"]["waited_seconds"] == pytest.approx(2)
@@ -0,0 +1,73 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.tools.registry import ToolRegistry
+from src.app.tools.users import GetUserTool
+
+PLUGIN_SOURCE = '''
+from src.app.tools.users import GetUserTool
+
+
+class PluginTool(GetUserTool):
+    name = "plugin_tool"
+    description = "Plugin tool"
+'''
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch):
+    """Write a tool module to a temporary path that has not been imported yet."""
+    (tmp_path / "lazy_plugin_tools.py").write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_plugin_tools"
+    sys.modules.pop("lazy_plugin_tools", None)
+
+
+def test_registry_imports_tools_on_first_use(plugin_module):
+    """Test that membership and iteration do not import tool modules."""
+    registry = ToolRegistry({"plugin_tool": f"{plugin_module}:PluginTool"}, entry_point_group=None)
+
+    assert "plugin_tool" in registry
+    assert "missing" not in registry
+    assert list(registry) == ["plugin_tool"]
+    assert plugin_module not in sys.modules
+
+    assert registry["plugin_tool"].description == "Plugin tool"
+    assert registry.is_loaded("plugin_tool")
+    with pytest.raises(KeyError):
+        registry["missing"]
+
+
+def test_registry_discovers_entry_points(monkeypatch, plugin_module):
+    """Test that tools registered through entry points are added, without overriding built-ins."""
+    def fake_entry_points(group):
+        assert group == "leantime_mcp.tools"
+        return [
+            SimpleNamespace(name="plugin_tool", value=f"{plugin_module}:PluginTool"),
+            SimpleNamespace(name="get_user", value=f"{plugin_module}:PluginTool"),
+        ]
+
+    monkeypatch.setattr("src.app.tools.registry.entry_points", fake_entry_points)
+    registry = ToolRegistry({"get_user": GetUserTool})
+
+    assert set(registry) == {"plugin_tool", "get_user"}
+    assert registry["get_user"] is GetUserTool
+    assert registry["plugin_tool"].name == "plugin_tool"
+
+
+def test_manifest_includes_schemas_and_changes_etag_on_register():
+    """Test the cached manifest and its ETag."""
+    registry = ToolRegistry({"get_user": GetUserTool}, entry_point_group=None)
+
+    body, etag = registry.manifest()
+    assert registry.manifest() == (body, etag)
+    assert b'"input_schema"' in body and b'"user_id"' in body and b'"output_schema"' in body
+
+    registry.register("get_user_again", "src.app.tools.users:GetUserTool")
+    assert registry.manifest()[1] != etag
+
+    registry.register("broken", "src.app.tools.users:UserData")
+    with pytest.raises(TypeError, match="not a BaseTool subclass"):
+        registry["broken"]
@@ -0,0 +1,239 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.app.services.leantime_client import LeantimeAPIError, LeantimeClient
+from src.app.services.resilience import CircuitBreaker, CircuitOpenError, HedgePolicy, RetryPolicy, parse_retry_after
+
+
+class FakeClock:
+    """Manually advanced clock for breaker tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def scripted_transport(responses, calls):
+    """Return the scripted responses (or raise scripted errors) in order."""
+    def handler(request):
+        calls.append(request.method)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Record retry delays instead of sleeping."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("src.app.services.leantime_client.asyncio.sleep", fake_sleep)
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_get_retries_transient_errors(no_sleep):
+    """Test that GETs are retried on 5xx and connection errors."""
+    calls = []
+    transport = scripted_transport([
+        httpx.Response(503),
+        httpx.ConnectError("reset"),
+        httpx.Response(200, json={"id": 1}),
+    ], calls)
+
+    async with LeantimeClient("https://leantime.test", transport=transport, retry_policy=RetryPolicy()) as client:
+        assert await client.get_project(1) == {"id": 1}
+
+    assert calls == ["GET", "GET", "GET"]
+    assert len(no_sleep) == 2
+    assert (await client.stats())["retries"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_honors_retry_after(no_sleep):
+    """Test that Retry-After overrides the computed backoff."""
+    calls = []
+    transport = scripted_transport([
+        httpx.Response(429, headers={"Retry-After": "2"}),
+        httpx.Response(200, json={"id": 1}),
+    ], calls)
+
+    async with LeantimeClient("https://leantime.test", transport=transport, retry_policy=RetryPolicy()) as client:
+        await client.get_project(1)
+
+    assert no_sleep == [2.0]
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried_after_server_error(no_sleep):
+    """Test that non-idempotent requests are not retried once they may have reached Leantime."""
+    calls = []
+    transport = scripted_transport([httpx.Response(500), httpx.Response(200, json={"id": 1})], calls)
+
+    async with LeantimeClient("https://leantime.test", transport=transport, retry_policy=RetryPolicy()) as client:
+        with pytest.raises(LeantimeAPIError):
+            await client.create_task({"title": "Task", "projectId": 1})
+
+    assert calls == ["POST"]
+    assert no_sleep == []
+
+
+@pytest.mark.asyncio
+async def test_retries_give_up_after_max_attempts(no_sleep):
+    """Test that the last error is raised once retries are exhausted."""
+    calls = []
+    transport = scripted_transport([httpx.Response(502) for _ in range(3)], calls)
+    policy = RetryPolicy(max_retries=2)
+
+    async with LeantimeClient("https://leantime.test", transport=transport, retry_policy=policy) as client:
+        with pytest.raises(LeantimeAPIError) as exc_info:
+            await client.get_users()
+
+    assert exc_info.value.status_code == 502
+    assert len(calls) == 3
+    assert (await client.stats())["retries"]["gave_up"] == 1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    """Test the closed -> open -> half-open -> closed cycle."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("leantime.test", failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    breaker.before_request()
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now = 10
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["trips"] == 1
+    assert breaker.stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_fails_fast_while_breaker_is_open():
+    """Test that an open breaker rejects requests without calling Leantime."""
+    calls = []
+    transport = scripted_transport([httpx.Response(500), httpx.Response(500)], calls)
+
+    async with LeantimeClient("https://leantime.test", transport=transport, breaker_failure_threshold=2) as client:
+        for _ in range(2):
+            with pytest.raises(LeantimeAPIError):
+                await client.get_users()
+        with pytest.raises(CircuitOpenError):
+            await client.get_users()
+
+    assert len(calls) == 2
+    assert (await client.stats())["circuit_breaker"]["state"] == "open"
+
+
+def test_parse_retry_after():
+    """Test parsing Retry-After in seconds and as an HTTP date."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_hedge_policy_tracks_percentile_and_budget():
+    """Test that the hedge delay follows the latency percentile and hedges stay within budget."""
+    policy = HedgePolicy(percentile=90, budget=0.25, min_delay=0.001, max_delay=0.5, min_samples=10)
+    assert policy.delay() is None
+
+    for i in range(1, 11):
+        policy.observe(i / 100)
+    assert policy.delay() == 0.1
+    # The threshold is refreshed every 16 observations and clamped to max_delay
+    for _ in range(16):
+        policy.observe(5.0)
+    assert policy.delay() == 0.5
+
+    hedged = sum(policy.try_hedge() for _ in range(2) if policy.delay() is not None)
+    assert hedged == 1
+    assert policy.stats()["hedge_rate"] == 0.2 and policy.stats()["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_get_returns_first_response_and_cancels_loser():
+    """Test that a GET slower than the hedge delay is duplicated and the faster attempt wins."""
+    calls = []
+    cancelled = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return httpx.Response(200, json={"id": 1, "name": f"attempt {len(calls)}"})
+
+    policy = HedgePolicy(budget=1.0, min_delay=0.01, min_samples=1)
+    policy.observe(0.001)
+    client = LeantimeClient("http://test", api_key="k", transport=httpx.MockTransport(handler), hedge_policy=policy)
+
+    async with client:
+        project = await client.get_project(1)
+        await asyncio.sleep(0)
+
+    assert project["name"] == "attempt 2"
+    assert cancelled == [True]
+    assert calls.count("/api/projects/1") == 2
+    assert (await client.stats())["hedging"]["hedge_wins"] == 1
+    # The cancelled primary still counts, as a lower bound of at least the hedge delay
+    assert len(policy._latencies) == 3
+    assert max(policy._latencies) >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_interrupted_trial_requests_release_the_half_open_breaker():
+    """Test that a cancelled trial stream or a non-transport error does not jam the breaker."""
+    async def handler(request):
+        if request.url.path == "/api/redirect":
+            raise httpx.TooManyRedirects("loop", request=request)
+        if request.url.path == "/api/slow":
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=[{"id": 1}, {"id": 2}])
+
+    client = LeantimeClient("https://leantime.test", transport=httpx.MockTransport(handler), breaker_failure_threshold=1)
+    breaker = client.circuit_breaker
+
+    def reopen():
+        breaker.state = CircuitBreaker.OPEN
+        breaker.opened_at = breaker.clock() - breaker.recovery_timeout
+
+    async with client:
+        reopen()
+        # The consumer disconnects before the trial stream gets its response
+        consumer = asyncio.ensure_future(client._stream_list("/api/slow").__anext__())
+        await asyncio.sleep(0.01)
+        consumer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await consumer
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        with pytest.raises(httpx.TooManyRedirects):
+            await client._request("GET", "/api/redirect")
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        await client.get_users()
+
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.stub_server import LeantimeStub
+from src.app.services.leantime_client import LeantimeAPIError, LeantimeClient
+from src.app.services.rpc_batch import RPCBatcher
+
+
+@pytest.mark.asyncio
+async def test_batcher_collects_calls_and_routes_results():
+    """Test that calls within the window share one batch and get their own response."""
+    batches = []
+
+    async def send(payload):
+        batches.append(payload)
+        # Answer out of order and drop the last call
+        return [{"jsonrpc": "2.0", "id": call["id"], "result": call["params"]["id"] * 10} for call in reversed(payload[:-1])]
+
+    batcher = RPCBatcher(send, max_batch_size=3, flush_delay=0.01)
+    responses = await asyncio.gather(*(batcher.call("get", {"id": i}) for i in (1, 2, 2, 3, 4)))
+
+    # Max size flushes 1, 2, 3 immediately; the duplicate 2 is shared; 4 waits for the timer
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert [response.get("result") for response in responses] == [10, 20, 20, None, None]
+    assert "error" in responses[3] and "error" in responses[4]
+    assert batcher.stats()["collapsed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_fails_every_caller_when_the_batch_fails():
+    """Test that a failed batch request is raised to each of its callers."""
+    async def send(payload):
+        raise httpx.ConnectError("down")
+
+    batcher = RPCBatcher(send, flush_delay=0)
+    results = await asyncio.gather(batcher.call("a", {}), batcher.call("b", {}), return_exceptions=True)
+
+    assert all(isinstance(result, httpx.ConnectError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_client_batches_lookups_through_json_rpc():
+    """Test that concurrent lookups become one JSON-RPC request, with 404s per caller."""
+    stub = LeantimeStub(projects=2, tasks=5, users=2, timesheets=0)
+    client = LeantimeClient("http://stub", transport=httpx.ASGITransport(app=stub), rpc_batch_size=10)
+
+    async with client:
+        results = await asyncio.gather(
+            client.get_task(1), client.get_task(2), client.get_project(1), client.get_user(2), client.get_task(99),
+            return_exceptions=True,
+        )
+
+    assert stub.requests == 1
+    assert [result["id"] for result in results[:4]] == [1, 2, 1, 2]
+    assert isinstance(results[4], LeantimeAPIError) and results[4].status_code == 404
+    assert (await client.stats())["rpc_batch"]["batches"] == 1
@@ -0,0 +1,163 @@
+import asyncio
+from datetime import date
+
+import httpx
+
+import pytest
+from unittest.mock import AsyncMock
+
+from src.app.services.leantime_client import LeantimeAPIError, LeantimeClient
+from src.app.services.task_mirror import TaskMirror
+from src.app.tools.tasks import ListTasksTool
+
+
+class FakeClock:
+    """Manually advanced clock for staleness tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+TASKS = [
+    {"id": 1, "title": "Write spec", "projectId": 1, "status": "new", "assignedTo": 5,
+     "dueDate": "2024-03-01 00:00:00", "tags": ["docs"]},
+    {"id": 2, "title": "Build API", "projectId": 1, "status": "inprogress", "assignedTo": 6,
+     "dueDate": "2024-03-15", "tags": ["backend"]},
+    {"id": 3, "title": "Ship it", "projectId": 1, "status": "done", "assignedTo": 5,
+     "dueDate": "2024-04-01", "tags": ["backend", "release"]},
+]
+
+
+@pytest.fixture
+def mock_leantime_client():
+    client = AsyncMock(spec=LeantimeClient)
+    client.get_tasks.return_value = [dict(task) for task in TASKS]
+    return client
+
+
+@pytest.mark.asyncio
+async def test_mirror_answers_filtered_queries(mock_leantime_client):
+    """Test that filters are answered from the mirror after one sync."""
+    mirror = TaskMirror()
+
+    page = await mirror.query(mock_leantime_client, project_id=1, status=["new", "done"], assigned_to=5)
+    assert [task["id"] for task in page.items] == [1, 3]
+
+    page = await mirror.query(mock_leantime_client, project_id=1, tag="backend", due_before=date(2024, 3, 31))
+    assert [task["id"] for task in page.items] == [2]
+
+    page = await mirror.query(mock_leantime_client, project_id=1, due_after=date(2024, 3, 15))
+    assert [task["id"] for task in page.items] == [2, 3]
+
+    mock_leantime_client.get_tasks.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_mirror_resyncs_incrementally_when_stale(mock_leantime_client):
+    """Test that stale projects are re-synced and only changed rows rewritten."""
+    clock = FakeClock()
+    mirror = TaskMirror(max_age=60, clock=clock)
+    await mirror.query(mock_leantime_client, project_id=1)
+
+    updated = [dict(task) for task in TASKS[:2]]
+    updated[0]["status"] = "done"
+    mock_leantime_client.get_tasks.return_value = updated
+
+    clock.now += 30
+    await mirror.query(mock_leantime_client, project_id=1, status=["done"])
+    assert mock_leantime_client.get_tasks.call_count == 1
+
+    clock.now += 60
+    result = await mirror.sync(mock_leantime_client, project_id=1)
+    assert result == {"upserted": 1, "deleted": 1, "unchanged": 1}
+
+    page = await mirror.query(mock_leantime_client, project_id=1, status=["done"])
+    assert [task["id"] for task in page.items] == [1]
+
+
+@pytest.mark.asyncio
+async def test_mirror_pages_results(mock_leantime_client):
+    """Test that limit/cursor page through mirrored results."""
+    mirror = TaskMirror()
+
+    first = await mirror.query(mock_leantime_client, project_id=1, limit=2)
+    second = await mirror.query(mock_leantime_client, project_id=1, limit=2, cursor=first.next_cursor)
+
+    assert [task["id"] for task in first.items] == [1, 2]
+    assert [task["id"] for task in second.items] == [3]
+    assert second.next_cursor is None
+
+    rest = await mirror.query(mock_leantime_client, project_id=1, cursor=first.next_cursor)
+    assert [task["id"] for task in rest.items] == [3]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_uses_mirror(mock_leantime_client):
+    """Test that ListTasksTool answers filtered queries from the mirror."""
+    mock_leantime_client.task_mirror = TaskMirror()
+
+    tool = ListTasksTool(mock_leantime_client)
+    result = await tool.run({"project_id": 1, "status": ["inprogress"]})
+    assert [task["id"] for task in result["tasks"]] == [2]
+
+    await tool.run({"project_id": 1, "refresh": True})
+    assert mock_leantime_client.get_tasks.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_filters_without_mirror(mock_leantime_client):
+    """Test that filters are applied to the downloaded list without a mirror."""
+    tool = ListTasksTool(mock_leantime_client)
+    result = await tool.run({"project_id": 1, "assigned_to": 5, "tag": "release"})
+
+    assert [task["id"] for task in result["tasks"]] == [3]
+
+
+def test_mirror_due_date_filters_use_an_index():
+    """Test that due date ranges are answered through the due-day index."""
+    mirror = TaskMirror()
+    plan = mirror._conn.execute("EXPLAIN QUERY PLAN SELECT data FROM tasks WHERE dueDay >= ? AND dueDay <= ?", ("a", "b"))
+    assert "idx_tasks_due_day" in " ".join(row[-1] for row in plan)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stale_queries_sync_once(mock_leantime_client):
+    """Test that queries waiting for a sync reuse it instead of downloading again."""
+    async def get_tasks(project_id):
+        await asyncio.sleep(0.01)
+        return [dict(task) for task in TASKS]
+
+    mock_leantime_client.get_tasks.side_effect = get_tasks
+    mirror = TaskMirror()
+
+    pages = await asyncio.gather(*(mirror.query(mock_leantime_client, project_id=1) for _ in range(5)))
+
+    assert all(len(page.items) == len(pages[0].items) for page in pages)
+    mock_leantime_client.get_tasks.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_failed_delete_keeps_the_mirrored_task_and_invalidates():
+    """Test that a failed upstream delete marks the project stale instead of dropping the row."""
+    statuses = [500, 200]
+
+    def handler(request):
+        if request.method == "DELETE":
+            return httpx.Response(statuses.pop(0), json={})
+        return httpx.Response(200, json=[dict(task) for task in TASKS])
+
+    mirror = TaskMirror()
+    client = LeantimeClient("https://leantime.test", transport=httpx.MockTransport(handler), task_mirror=mirror)
+
+    async with client:
+        await mirror.sync(client, 1)
+        with pytest.raises(LeantimeAPIError):
+            await client.delete_task(1)
+        assert not mirror.is_fresh(1)
+        assert [task["id"] for task in (await mirror.query(client, project_id=1)).items] == [1, 2, 3]
+
+        await client.delete_task(1)
+        assert [task["id"] for task in (await mirror.query(client, project_id=1)).items] == [2, 3]
@@ -0,0 +1,122 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app import main
+from src.app.main import app
+from src.app.services.leantime_client import LeantimeClient
+from src.app.services.tenants import ClientPool, Tenant, load_tenants
+
+
+def make_factory(created):
+    """Build a pool factory whose clients answer get_user with their tenant's URL."""
+    def factory(tenant):
+        def handler(request):
+            return httpx.Response(200, json={"id": 1, "username": tenant.name, "email": f"u@{request.url.host}"})
+
+        client = LeantimeClient(tenant.url, api_key=tenant.api_key, transport=httpx.MockTransport(handler), tenant=tenant.name)
+        created.append(client)
+        return client
+    return factory
+
+
+def test_load_tenants_validates_definitions():
+    """Test that tenants are parsed and invalid definitions are rejected."""
+    tenants = load_tenants('{"a": {"url": "https://a.test", "api_key": "k", "token": "t", "max_connections": 5}}')
+    assert tenants["a"].max_connections == 5
+    assert load_tenants("") == {}
+
+    with pytest.raises(ValueError):
+        load_tenants('{"a": {"api_key": "k"}}')
+    with pytest.raises(ValueError):
+        load_tenants('{"a": {"url": "https://a.test", "token": "t"}, "b": {"url": "https://b.test", "token": "t"}}')
+    with pytest.raises(ValueError, match="reserved"):
+        load_tenants('{"default": {"url": "https://a.test"}}')
+
+
+@pytest.mark.asyncio
+async def test_pool_separates_tenants_and_evicts_idle_ones():
+    """Test that tenants never share a client, even with the same credentials, and idle ones are evicted LRU."""
+    created = []
+    pool = ClientPool(make_factory(created), max_clients=3)
+    a, a_alias, b, c = (
+        Tenant("a", "https://a.test", api_key="k"),
+        Tenant("a2", "https://a.test/", api_key="k"),
+        Tenant("b", "https://b.test", api_key="k"),
+        Tenant("c", "https://c.test", api_key="k"),
+    )
+
+    client_a = await pool.acquire(a)
+    client_a_alias = await pool.acquire(a_alias)
+    assert client_a_alias is not client_a and client_a_alias.tenant == "a2"
+    pool.release(a)
+
+    client_b = await pool.acquire(b)
+    # a is idle and least recently used; a2 and b are leased
+    await pool.acquire(c)
+
+    assert [tenant["tenant"] for tenant in pool.stats()["tenants"]] == ["a2", "b", "c"]
+    assert pool.evictions == 1
+    assert client_b.session is not None
+
+    await pool.aclose()
+    assert client_a.session is None and all(client.session is None for client in created)
+
+
+def test_requests_select_tenant_by_header_or_token(monkeypatch):
+    """Test per-request tenant selection, token checks and isolated clients."""
+    tenants = {
+        "a": Tenant("a", "https://a.test", api_key="ka"),
+        "b": Tenant("b", "https://b.test", api_key="kb", token="secret-b"),
+    }
+    monkeypatch.setattr(main, "tenants", tenants)
+    monkeypatch.setattr(main, "tenants_by_token", {"secret-b": tenants["b"]})
+    created = []
+    app.state.client_pool = ClientPool(make_factory(created))
+    client = TestClient(app)
+    body = {"name": "get_user", "input": {"user_id": 1}}
+    try:
+        by_header = client.post("/tools/get_user", json=body, headers={"X-Leantime-Tenant": "a"})
+        by_token = client.post("/tools/get_user", json=body, headers={"Authorization": "Bearer secret-b"})
+
+        assert by_header.json()["output"]["user"]["email"] == "u@a.test"
+        assert by_token.json()["output"]["user"]["email"] == "u@b.test"
+        assert [c.tenant for c in created] == ["a", "b"]
+
+        assert client.post("/tools/get_user", json=body, headers={"X-Leantime-Tenant": "b"}).status_code == 401
+        assert client.post("/tools/get_user", json=body, headers={"X-Leantime-Tenant": "x"}).status_code == 404
+        assert client.post("/tools/get_user", json=body, headers={"Authorization": "Bearer nope"}).status_code == 401
+        # Token-protected tenants are only listed to their own callers
+        assert [entry["tenant"] for entry in client.get("/tenants").json()["tenants"]] == ["a"]
+        assert client.get("/tenants", headers={"Authorization": "Bearer secret-b"}).json()["clients"] == 2
+        assert client.get("/tenants", headers={"Authorization": "Bearer nope"}).status_code == 401
+        assert client.get("/tenants", headers={"X-Leantime-Tenant": "b"}).status_code == 401
+    finally:
+        del app.state.client_pool
+
+
+def test_streaming_responses_keep_the_client_leased(monkeypatch):
+    """Test that a pooled client stays leased while a streaming response body uses it."""
+    tenant = Tenant("a", "https://a.test", api_key="ka")
+    monkeypatch.setattr(main, "tenants", {"a": tenant})
+    leases = []
+
+    def factory(tenant):
+        def handler(request):
+            leases.append(pool.stats()["tenants"][0]["leases"])
+            return httpx.Response(200, json=[{"id": 1, "title": "Task", "projectId": 1}])
+
+        return LeantimeClient(tenant.url, api_key=tenant.api_key, transport=httpx.MockTransport(handler), tenant=tenant.name)
+
+    pool = app.state.client_pool = ClientPool(factory)
+    client = TestClient(app)
+    try:
+        response = client.post(
+            "/tools/list_tasks/stream", json={"name": "list_tasks", "input": {}}, headers={"X-Leantime-Tenant": "a"}
+        )
+
+        assert response.text.strip() and "error" not in response.text
+        assert leases == [1]
+        assert pool.stats()["tenants"][0]["leases"] == 0
+    finally:
+        del app.state.client_pool
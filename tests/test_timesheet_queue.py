@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.app.services.leantime_client import LeantimeClient
+from src.app.services.timesheet_queue import TimesheetQueue
+from src.app.tools.timesheets import CreateTimesheetTool, GetTimesheetStatusTool
+
+ENTRY = {"userId": 1, "projectId": 2, "hours": 1.5, "date": "2024-03-01"}
+
+
+def make_client(handler, queue):
+    return LeantimeClient("https://leantime.test", transport=httpx.MockTransport(handler), timesheet_queue=queue)
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_restart_and_are_delivered(tmp_path):
+    """Test that journaled entries persist across a restart and are flushed by the worker."""
+    path = str(tmp_path / "timesheets.db")
+    queue = TimesheetQueue(path)
+    provisional_id = await queue.enqueue(ENTRY)
+    queue.close()
+
+    created = []
+
+    def handler(request):
+        created.append(request)
+        return httpx.Response(200, json={"id": 41, **ENTRY})
+
+    queue = TimesheetQueue(path, flush_interval=0.01)
+    async with make_client(handler, queue) as client:
+        for _ in range(100):
+            if (await queue.status([provisional_id]))[provisional_id]["state"] == "delivered":
+                break
+            await asyncio.sleep(0.01)
+        output = await GetTimesheetStatusTool(client).run({"provisional_ids": [provisional_id, "pending-x"]})
+
+    assert len(created) == 1
+    assert output["enabled"] is True
+    assert output["entries"][0]["timesheet"]["id"] == 41
+    assert output["entries"][1]["state"] == "unknown"
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_stop_lets_the_current_flush_record_its_deliveries(tmp_path):
+    """Test that closing the client mid-flush does not resend accepted entries later."""
+    path = str(tmp_path / "timesheets.db")
+    created = []
+    sending = asyncio.Event()
+
+    async def handler(request):
+        created.append(request)
+        sending.set()
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"id": 41, **ENTRY})
+
+    queue = TimesheetQueue(path, batch_size=1, flush_interval=60)
+    async with make_client(handler, queue):
+        provisional_id = await queue.enqueue(ENTRY)
+        await sending.wait()
+
+    assert (await queue.status([provisional_id]))[provisional_id]["state"] == "delivered"
+    queue.close()
+
+    queue = TimesheetQueue(path)
+    assert await queue.flush(make_client(handler, None)) == {"sent": 0, "delivered": 0, "retried": 0, "failed": 0}
+    assert len(created) == 1
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_close_gives_up_on_a_slow_flush_after_the_drain_timeout(tmp_path):
+    """Test that shutdown does not hang on a flush and leaves its entries journaled."""
+    path = str(tmp_path / "timesheets.db")
+    sending = asyncio.Event()
+
+    async def handler(request):
+        sending.set()
+        await asyncio.sleep(60)
+
+    queue = TimesheetQueue(path, batch_size=1, flush_interval=60)
+    client = make_client(handler, queue)
+    await client.open()
+    provisional_id = await queue.enqueue(ENTRY)
+    await sending.wait()
+
+    started = asyncio.get_running_loop().time()
+    await client.aclose(drain_timeout=0.05)
+
+    assert asyncio.get_running_loop().time() - started < 1
+    assert (await queue.status([provisional_id]))[provisional_id]["state"] == "queued"
+    assert (await queue.stats())["running"] is False
+    queue.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_retries_transient_errors_and_fails_permanent_ones():
+    """Test backoff on 503 until max attempts, and immediate failure on 400."""
+    now = [1000.0]
+    queue = TimesheetQueue(max_attempts=2, retry_base_delay=10, clock=lambda: now[0])
+
+    def handler(request):
+        return httpx.Response(400 if json.loads(request.content)["hours"] == 0 else 503, json={"error": "no"})
+
+    client = make_client(handler, None)
+    await client.open()
+    transient = await queue.enqueue(ENTRY)
+    invalid = await queue.enqueue({**ENTRY, "hours": 0})
+
+    assert await queue.flush(client) == {"sent": 2, "delivered": 0, "retried": 1, "failed": 1}
+    assert await queue.flush(client) == {"sent": 0, "delivered": 0, "retried": 0, "failed": 0}
+
+    now[0] += 10
+    assert (await queue.flush(client))["failed"] == 1
+    states = await queue.status([transient, invalid])
+    assert {states[transient]["state"], states[invalid]["state"]} == {"failed"}
+    assert states[transient]["attempts"] == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_create_timesheet_acknowledges_with_provisional_id():
+    """Test that create_timesheet queues the entry instead of calling Leantime."""
+    def handler(request):
+        raise AssertionError("Leantime must not be called synchronously")
+
+    queue = TimesheetQueue(flush_interval=60)
+    output = await CreateTimesheetTool(make_client(handler, queue)).run(ENTRY)
+
+    assert output["status"] == "queued"
+    assert output["provisional_id"].startswith("pending-")
+    assert (await queue.stats())["queued"] == 1
@@ -1,8 +1,18 @@
+import asyncio
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from src.app.tools.projects import ListProjectsTool, GetProjectTool, CreateProjectTool
-from src.app.tools.tasks import ListTasksTool, GetTaskTool, CreateTaskTool, UpdateTaskTool
-from src.app.services.leantime_client import LeantimeClient
+from src.app.tools.tasks import ListTasksTool, GetTaskInput, GetTaskTool, CreateTaskTool, UpdateTaskTool, BulkCreateTasksTool
+from src.app.tools.users import ListUsersTool
+from src.app.tools.timesheets import (
+    ListTimesheetsTool,
+    BulkCreateTimesheetsTool,
+    SummarizeTimesheetsTool,
+    summarize_hours,
+)
+from src.app.services.leantime_client import LeantimeClient, Page
 
 
 @pytest.fixture
@@ -276,4 +286,307 @@ async def test_update_task_tool(mock_leantime_client):
     assert task["description"] == mock_task["description"]
     assert "message" in result
     # Check that it was called with the right task_id, but not checking other arguments
-    mock_leantime_client.update_task.assert_called_once_with(1, mock_leantime_client.update_task.call_args[0][1])
\ No newline at end of file
+    mock_leantime_client.update_task.assert_called_once_with(1, mock_leantime_client.update_task.call_args[0][1])
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_with_limit_uses_pages(mock_leantime_client):
+    """Test that ListTasksTool pages through tasks when a limit is given."""
+    mock_leantime_client.get_tasks_page.return_value = Page(
+        items=[{"id": 1, "title": "Task 1", "projectId": 1}],
+        next_cursor="offset:1"
+    )
+
+    tool = ListTasksTool(mock_leantime_client)
+    result = await tool.run({"project_id": 1, "limit": 1})
+
+    assert [task["id"] for task in result["tasks"]] == [1]
+    assert result["next_cursor"] == "offset:1"
+    mock_leantime_client.get_tasks_page.assert_called_once_with(1, limit=1, cursor=None)
+    mock_leantime_client.get_tasks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_fills_filtered_pages(mock_leantime_client):
+    """Test that filtered pages keep fetching until the limit is reached."""
+    tasks = [{"id": i, "title": f"Task {i}", "projectId": 1, "status": "done" if i % 3 else "new"} for i in range(9)]
+
+    async def get_tasks_page(project_id, limit, cursor):
+        offset = int(cursor.split(":")[1]) if cursor else 0
+        end = min(offset + limit, len(tasks))
+        return Page(items=tasks[offset:end], next_cursor=f"offset:{end}" if end < len(tasks) else None)
+
+    mock_leantime_client.get_tasks_page.side_effect = get_tasks_page
+
+    tool = ListTasksTool(mock_leantime_client)
+    first = await tool.run({"project_id": 1, "limit": 2, "status": ["new"]})
+    second = await tool.run({"project_id": 1, "limit": 2, "status": ["new"], "cursor": first["next_cursor"]})
+
+    assert [task["id"] for task in first["tasks"]] == [0, 3]
+    assert [task["id"] for task in second["tasks"]] == [6]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_projects_fields(mock_leantime_client):
+    """Test that list_tasks only returns the requested fields."""
+    mock_leantime_client.get_tasks.return_value = [
+        {"id": 1, "title": "Task 1", "projectId": 1, "description": "Long text", "status": "new", "priority": "high"},
+        {"id": 2, "title": "Task 2", "projectId": 1, "description": "Long text", "status": "done", "priority": "low"},
+    ]
+
+    tool = ListTasksTool(mock_leantime_client)
+    result = await tool.run({"project_id": 1, "fields": ["id", "status"], "priority": ["high"]})
+
+    assert result["tasks"] == [{"id": 1, "status": "new"}]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_rejects_unknown_fields(mock_leantime_client):
+    """Test that unknown projection fields are rejected before calling Leantime."""
+    tool = ListTasksTool(mock_leantime_client)
+    with pytest.raises(ValueError, match="Unknown fields: owner"):
+        await tool.run({"fields": ["id", "owner"]})
+    mock_leantime_client.get_tasks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_tool_columnar_format(mock_leantime_client):
+    """Test that list_tasks can return one array per field."""
+    mock_leantime_client.get_tasks.return_value = [
+        {"id": 1, "title": "Task 1", "projectId": 1, "status": "new"},
+        {"id": "2", "title": "Task 2", "projectId": 1},
+    ]
+
+    tool = ListTasksTool(mock_leantime_client)
+    result = await tool.run({"fields": ["id", "status"], "format": "columnar"})
+
+    assert result == {"tasks": {"id": [1, 2], "status": ["new", None]}, "count": 2, "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_list_users_tool_columnar_format_validates_columns(mock_leantime_client):
+    """Test that columnar output is validated per column and includes every field."""
+    mock_leantime_client.get_users.return_value = [{"id": 1, "username": "ada", "email": "ada@example.com"}]
+
+    tool = ListUsersTool(mock_leantime_client)
+    result = await tool.run({"format": "columnar"})
+    assert result["users"]["username"] == ["ada"]
+    assert result["users"]["role"] == [None]
+    assert result["count"] == 1
+
+    mock_leantime_client.get_users.return_value = [{"id": 2, "username": "bob"}]
+    with pytest.raises(ValueError, match="email"):
+        await tool.run({"format": "columnar"})
+
+
+@pytest.mark.asyncio
+async def test_tool_output_validation_modes(mock_leantime_client):
+    """Test that output re-validation can be sampled or turned off for trusted data."""
+    mock_leantime_client.get_task.return_value = {"id": "1", "title": "Task 1", "projectId": 1, "extra": True}
+    tool = GetTaskTool(mock_leantime_client)
+
+    result = await tool.run({"task_id": 1})
+    assert result["task"]["id"] == 1
+    assert "extra" not in result["task"]
+
+    tool.output_validation = "off"
+    result = await tool.run({"task_id": 1})
+    assert result["task"] is mock_leantime_client.get_task.return_value
+
+    tool.output_validation = "sampled"
+    with patch("src.app.tools.base.random.random", side_effect=[0.05, 0.5]):
+        assert (await tool.run({"task_id": 1}))["task"]["id"] == 1
+        assert (await tool.run({"task_id": 1}))["task"]["id"] == "1"
+
+    with pytest.raises(ValueError, match="Unknown output validation mode"):
+        GetTaskTool.configure_output_validation("sometimes")
+
+
+@pytest.mark.asyncio
+async def test_tool_execute_receives_the_validated_input_model(mock_leantime_client):
+    """Test that execute gets the input model and plain dict results are still validated."""
+    class DictGetTaskTool(GetTaskTool):
+        async def execute(self, input_data):
+            assert isinstance(input_data, GetTaskInput)
+            return {"task": {"id": str(input_data.task_id), "title": "Task", "projectId": 1}}
+
+    assert (await DictGetTaskTool(mock_leantime_client).run({"task_id": "7"}))["task"]["id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_tool_input_is_validated_when_output_validation_is_off(mock_leantime_client):
+    """Test that skipping output validation never skips input validation."""
+    tool = GetTaskTool(mock_leantime_client)
+    tool.output_validation = "off"
+
+    with pytest.raises(ValueError):
+        await tool.run({"task_id": "not a number"})
+    mock_leantime_client.get_task.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_timesheets_tool_filters_and_projects(mock_leantime_client):
+    """Test that list_timesheets applies date filters and projection."""
+    mock_leantime_client.get_timesheets.return_value = [
+        {"id": 1, "userId": 1, "projectId": 1, "hours": 2.0, "date": "2024-01-31"},
+        {"id": 2, "userId": 1, "projectId": 1, "hours": 3.5, "date": "2024-02-01 09:00:00"},
+    ]
+
+    tool = ListTimesheetsTool(mock_leantime_client)
+    result = await tool.run({"date_after": "2024-02-01", "fields": ["date", "hours"]})
+
+    assert result["timesheets"] == [{"date": "2024-02-01 09:00:00", "hours": 3.5}]
+
+
+@pytest.mark.asyncio
+async def test_list_projects_tool_filters_and_projects(mock_leantime_client):
+    """Test that list_projects applies state filters and projection."""
+    mock_leantime_client.get_projects.return_value = [
+        {"id": 1, "name": "Project 1", "state": "open"},
+        {"id": 2, "name": "Project 2", "state": "closed"},
+    ]
+
+    tool = ListProjectsTool(mock_leantime_client)
+    result = await tool.run({"state": ["open"], "fields": ["name"]})
+
+    assert result["projects"] == [{"name": "Project 1"}]
+
+
+@pytest.mark.asyncio
+async def test_summarize_timesheets_tool_groups_by_user(mock_leantime_client):
+    """Test that summarize_timesheets aggregates hours per user."""
+    mock_leantime_client.get_timesheets.return_value = [
+        {"id": 1, "userId": 1, "projectId": 1, "hours": 1.0, "date": "2024-01-01"},
+        {"id": 2, "userId": 1, "projectId": 1, "hours": "3.0", "date": "2024-01-02"},
+        {"id": 3, "userId": 2, "projectId": 1, "hours": 4.0, "date": "2024-01-02"},
+        {"id": 4, "userId": 1, "projectId": 1, "hours": 2.0, "date": "2024-01-03"},
+    ]
+
+    tool = SummarizeTimesheetsTool(mock_leantime_client)
+    result = await tool.run({"group_by": "user", "percentiles": [50, 100]})
+
+    assert result["entries"] == 4
+    assert result["total_hours"] == 10.0
+    user_1, user_2 = result["groups"]
+    assert user_1["key"] == 1
+    assert user_1["entries"] == 3
+    assert user_1["total_hours"] == 6.0
+    assert user_1["mean_hours"] == 2.0
+    assert user_1["percentiles"] == {"p50": 2.0, "p100": 3.0}
+    assert user_2["key"] == 2
+    assert user_2["percentiles"] == {"p50": 4.0, "p100": 4.0}
+
+
+@pytest.mark.asyncio
+async def test_summarize_timesheets_tool_groups_by_week_in_range(mock_leantime_client):
+    """Test that date grouping uses ISO weeks and honours the date range."""
+    mock_leantime_client.get_timesheets.return_value = [
+        {"id": 1, "userId": 1, "projectId": 1, "hours": 1.0, "date": "2024-01-07"},
+        {"id": 2, "userId": 1, "projectId": 1, "hours": 2.0, "date": "2024-01-08 09:00:00"},
+        {"id": 3, "userId": 1, "projectId": 1, "hours": 3.0, "date": "2024-01-14"},
+        {"id": 4, "userId": 1, "projectId": 1, "hours": 5.0, "date": "2024-01-15"},
+        {"id": 5, "userId": 1, "projectId": 1, "hours": 8.0, "date": "0000-00-00"},
+    ]
+
+    tool = SummarizeTimesheetsTool(mock_leantime_client)
+    result = await tool.run({"group_by": "week", "date_before": "2024-01-15"})
+
+    assert [(group["key"], group["total_hours"]) for group in result["groups"]] == [
+        ("2024-W01", 1.0),
+        ("2024-W02", 5.0),
+        ("2024-W03", 5.0),
+    ]
+    assert result["entries"] == 4
+
+
+@pytest.mark.asyncio
+async def test_date_filters_reject_invalid_dates(mock_leantime_client):
+    """Test that malformed date filters fail input validation before Leantime is called."""
+    with pytest.raises(ValueError, match="date_after"):
+        await SummarizeTimesheetsTool(mock_leantime_client).run({"date_after": "last week"})
+    with pytest.raises(ValueError, match="date_before"):
+        await ListTimesheetsTool(mock_leantime_client).run({"date_before": "2024-13-01"})
+    with pytest.raises(ValueError, match="due_after"):
+        await ListTasksTool(mock_leantime_client).run({"due_after": "soon"})
+    mock_leantime_client.get_timesheets.assert_not_called()
+    mock_leantime_client.get_tasks.assert_not_called()
+
+
+def test_summarize_hours_matches_numpy_percentile():
+    """Test that the vectorized percentiles agree with np.percentile."""
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, 20, size=5000)
+    hours = rng.random(5000) * 8
+
+    unique_keys, stats = summarize_hours(keys, hours, [10, 50, 99.5])
+
+    for i, key in enumerate(unique_keys):
+        group = hours[keys == key]
+        assert stats["total_hours"][i] == pytest.approx(group.sum())
+        assert stats["p99.5"][i] == pytest.approx(np.percentile(group, 99.5))
+        assert stats["p10"][i] == pytest.approx(np.percentile(group, 10))
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tasks_tool_reports_per_row(mock_leantime_client):
+    """Test that invalid or failing rows do not abort the rest of the bulk create."""
+    async def create_task(task_data):
+        if task_data["title"] == "Boom":
+            raise Exception("Leantime API error: 500 - boom")
+        return {"id": 10, **task_data}
+
+    mock_leantime_client.create_task.side_effect = create_task
+
+    tool = BulkCreateTasksTool(mock_leantime_client)
+    result = await tool.run({"tasks": [
+        {"title": "Task A", "projectId": 1},
+        {"projectId": 1},
+        {"title": "Boom", "projectId": 1},
+    ]})
+
+    assert result["created"] == 1
+    assert result["failed"] == 2
+    ok, invalid, failed = result["results"]
+    assert ok["success"] and ok["result"]["title"] == "Task A"
+    assert not invalid["success"] and "title" in invalid["error"]
+    assert not failed["success"] and "boom" in failed["error"]
+    assert mock_leantime_client.create_task.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_created_rows_with_unreadable_results(mock_leantime_client):
+    """Test that a row created upstream is not reported as failed when its result is malformed."""
+    mock_leantime_client.create_task.return_value = {"id": "not-a-number"}
+
+    tool = BulkCreateTasksTool(mock_leantime_client)
+    result = await tool.run({"tasks": [{"title": "Task A", "projectId": 1}]})
+
+    assert result["created"] == 1
+    assert result["failed"] == 0
+    row = result["results"][0]
+    assert row["success"] and row["result"] is None and "Created" in row["warning"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_timesheets_tool_respects_concurrency(mock_leantime_client):
+    """Test that bulk timesheet creation never exceeds the concurrency cap."""
+    active = 0
+    peak = 0
+
+    async def create_timesheet(timesheet_data):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+        return {"id": 1, **timesheet_data}
+
+    mock_leantime_client.create_timesheet.side_effect = create_timesheet
+    rows = [{"userId": 1, "projectId": 1, "hours": 1.5, "date": "2024-01-01"} for _ in range(12)]
+
+    tool = BulkCreateTimesheetsTool(mock_leantime_client)
+    result = await tool.run({"timesheets": rows, "concurrency": 3})
+
+    assert result["created"] == 12
+    assert [row["index"] for row in result["results"]] == list(range(12))
+    assert peak == 3